@@ -1,12 +1,19 @@
+import hashlib
+import json
 import logging
-from typing import AsyncGenerator
+import time
+from typing import AsyncGenerator, Awaitable, Callable, List, Optional, Sequence
 
-from fastapi import HTTPException, status
+from fastapi import Depends, Header, HTTPException, Query, Request, Response, status
 from fastapi.exceptions import RequestValidationError
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pydantic import ValidationError
 
 from app.config.database import get_database as get_db_connection
+from app.config.settings import settings
+from app.core.cache import write_versions
+from app.services.base import CountMode
+from app.services.employee_loader import EmployeeLoader
 
 logger = logging.getLogger(__name__)
 
@@ -49,3 +56,126 @@ async def get_database_dependency() -> AsyncGenerator[AsyncIOMotorDatabase, None
         )
 
 
+async def get_employee_loader(
+    db: AsyncIOMotorDatabase = Depends(get_database_dependency),
+) -> EmployeeLoader:
+    """
+    Request-scoped EmployeeLoader: FastAPI caches dependencies per request, so every handler
+    and sub-dependency asking for it shares one instance (and its batches) for the request.
+    """
+    return EmployeeLoader(db)
+
+
+def sparse_fields(
+    allowed: Sequence[str], default: Sequence[str]
+) -> Callable[..., List[str]]:
+    """
+    Build a dependency for a `fields=a,b,c` query parameter (sparse fieldsets).
+
+    Resolves to the requested field names (always including "id"), or `default` when the
+    parameter is absent; unknown names are a 400 listing the allowed ones.
+    """
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None, description=f"Comma-separated subset of: {', '.join(allowed)}"
+        ),
+    ) -> List[str]:
+        if not fields:
+            return list(default)
+        requested = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = sorted(set(requested) - set(allowed))
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}",
+            )
+        return ["id"] + [f for f in dict.fromkeys(requested) if f != "id"]
+
+    return dependency
+
+
+def projection_for(fields: Sequence[str]) -> dict:
+    """MongoDB projection for API field names ("id" is _id, which MongoDB returns anyway)."""
+    return {f: 1 for f in fields if f != "id"} or {"_id": 1}
+
+
+def count_mode(
+    count: Optional[CountMode] = Query(
+        None,
+        description="Total for offset pages: exact (page and count in one $facet round trip), "
+        "estimated (metadata or maintained counters where the filter allows), "
+        "cached (memoised until a write), none (has_more only). Default: LIST_COUNT_DEFAULT",
+    ),
+) -> CountMode:
+    """Dependency resolving the `count=` strategy of list endpoints."""
+    return count or settings.LIST_COUNT_DEFAULT
+
+
+def _etag(request: Request, collections: Sequence[str]) -> str:
+    """Strong ETag over write versions, the ETAG_TTL_SECONDS window, path and query string."""
+    window = (
+        int(time.time() // settings.ETAG_TTL_SECONDS)
+        if settings.ETAG_TTL_SECONDS
+        else 0
+    )
+    query = sorted(request.query_params.multi_items(), key=lambda item: item[0])
+    key = json.dumps([write_versions.tag(collections), window, request.url.path, query])
+    return f'"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison (RFC 9110): nginx marks ETags weak when it gzips the body."""
+    if not if_none_match:
+        return False
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+def conditional_get(*collections: str) -> Callable[..., Awaitable[None]]:
+    """
+    Build a dependency making a GET conditional on writes to `collections`.
+
+    A matching If-None-Match ends the request with 304 from in-process write versions (see
+    WriteVersions), before MongoDB or the response model is touched; otherwise the ETag is
+    set on the response. Use it in the route's `dependencies=` so it runs first. Responses are
+    `private, no-cache`: clients revalidate every time, and no shared cache can serve a
+    page that a write has already changed.
+    """
+
+    async def dependency(request: Request, response: Response) -> None:
+        check_etag(request, response, _etag(request, collections))
+
+    return dependency
+
+
+def version_etag(version: int) -> str:
+    """Strong ETag of a versioned document: its version, which If-Match accepts back."""
+    return f'"{version}"'
+
+
+def check_etag(request: Request, response: Response, etag: str) -> None:
+    """End with 304 when If-None-Match matches etag; otherwise set ETag and Cache-Control."""
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
+
+def if_match_version(
+    if_match: Optional[str] = Header(
+        None,
+        description='ETag from a GET of the resource (its version, e.g. "3") for optimistic concurrency',
+    ),
+) -> Optional[int]:
+    """Dependency reading If-Match as a version_etag ("3", W/"3" or 3); None when absent or *."""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    value = if_match.strip().removeprefix("W/").strip('"')
+    if not value.isdigit():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="If-Match must be the resource's ETag (its version number)",
+        )
+    return int(value)
@@ -4,15 +4,21 @@ API v1 endpoints package.
 This package contains all API v1 endpoint modules:
 - employees: Employee management endpoints
 - attendance: Attendance management endpoints
+- dashboard: Organisation summary endpoints
+- holidays: Holiday calendar administration endpoints
+- departments: Department headcount facet endpoints
 
 Each module exports a FastAPI APIRouter instance that can be included
 in the main API router.
 """
 
-from . import employees, attendance
+from . import employees, attendance, dashboard, holidays, departments
 
 # Export routers for convenient access
 __all__ = [
     "employees",
     "attendance",
+    "dashboard",
+    "holidays",
+    "departments",
 ]
@@ -1,47 +1,81 @@
-from typing import Optional
-from datetime import date, datetime
+from typing import List, Literal, Optional
+from datetime import date
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pymongo.errors import DuplicateKeyError
-from app.api.deps import get_database_dependency
-from app.services.attendance import attendance_repository
-from app.models.attendance import AttendanceCreate, AttendanceInDB
+from app.api.deps import (
+    conditional_get,
+    count_mode,
+    get_database_dependency,
+    get_employee_loader,
+    projection_for,
+    sparse_fields,
+)
+from app.services.base import CountMode
+from app.services.attendance import (
+    MATRIX_BITS_PER_DAY,
+    list_sort,
+    MATRIX_STATUS_CODES,
+    attendance_repository,
+)
+from app.services.employee_loader import EmployeeLoader
+from app.services.export import ExportFormat, export_attendance
+from app.models.attendance import AttendanceCreate, AttendanceInDB, AttendanceStatus
 from app.schemas.attendance import (
+    ATTENDANCE_LIST_DEFAULT_FIELDS,
+    ATTENDANCE_LIST_FIELDS,
+    AttendanceBulkCreate,
+    AttendanceBulkItemResult,
+    AttendanceBulkResponse,
     AttendanceListItem,
     AttendanceListResponse,
+    AttendanceMatrixResponse,
+    EmployeeAttendanceStatsBatchResponse,
+    EmployeeAttendanceStatsItem,
     EmployeeAttendanceStatsResponse,
 )
 from app.schemas.common import APIResponse
 from pydantic import ValidationError
+import base64
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/attendance", tags=["attendance"])
 
+MAX_BATCH_STATS_EMPLOYEES = 500
+
+# Collections whose writes change what the conditional GETs below return
+LIST_SOURCES = ("attendance", "employees")
+STATS_SOURCES = ("attendance", "employees", "holidays")
 
-def _date_range_filter(start_date: date, end_date: date) -> dict:
-    """MongoDB date filter for start_date..end_date inclusive."""
-    return {
-        "date": {
-            "$gte": datetime.combine(start_date, datetime.min.time()),
-            "$lte": datetime.combine(end_date, datetime.max.time()),
-        }
-    }
+
+async def _list_items(
+    loader: EmployeeLoader, docs: List[dict], fields: List[str], include: Optional[str]
+) -> List[AttendanceListItem]:
+    """Build list items from projected docs; include=employee adds one $in lookup for the page."""
+    items = [AttendanceListItem.from_document(doc, fields) for doc in docs]
+    if include == "employee":
+        profiles = await loader.profiles(doc["employee_id"] for doc in docs)
+        for item, doc in zip(items, docs):
+            item.with_employee(profiles.get(doc["employee_id"]))
+    return items
 
 
 @router.post("", response_model=APIResponse[AttendanceInDB], status_code=status.HTTP_201_CREATED)
 async def mark_attendance(
     attendance_data: AttendanceCreate,
-    db: AsyncIOMotorDatabase = Depends(get_database_dependency)
+    db: AsyncIOMotorDatabase = Depends(get_database_dependency),
+    loader: EmployeeLoader = Depends(get_employee_loader),
 ):
     try:
         if attendance_data.date > date.today():
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Attendance date cannot be in the future")
-        
-        attendance = await attendance_repository.create(db, attendance_data)
+
+        attendance = await attendance_repository.create(db, attendance_data, loader)
         return APIResponse(data=attendance, message="Attendance marked successfully")
-        
+
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except DuplicateKeyError:
@@ -61,59 +95,160 @@ async def mark_attendance(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=detail)
 
 
+@router.post("/bulk", response_model=APIResponse[AttendanceBulkResponse])
+async def mark_attendance_bulk(
+    payload: AttendanceBulkCreate,
+    db: AsyncIOMotorDatabase = Depends(get_database_dependency),
+):
+    """Mark many records at once: one employee $in lookup + one unordered insert_many."""
+    try:
+        results = await attendance_repository.create_many(db, payload.records)
+        items = [AttendanceBulkItemResult(**r) for r in results]
+        created = sum(1 for item in items if item.status == "created")
+        return APIResponse(
+            data=AttendanceBulkResponse(
+                total=len(items),
+                created=created,
+                failed=len(items) - created,
+                results=items,
+            ),
+            message=f"Marked {created} of {len(items)} attendance records",
+        )
+    except Exception as e:
+        logger.exception("Error bulk marking attendance")
+        detail = str(e) if str(e).strip() else "Failed to mark attendance"
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=detail
+        )
+
+
 @router.get(
     "",
     response_model=AttendanceListResponse,
     response_model_by_alias=False,
+    response_model_exclude_unset=True,
+    dependencies=[Depends(conditional_get(*LIST_SOURCES))],
 )
 async def get_attendance(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    employee_id: Optional[str] = Query(None),
+    employee_id: Optional[List[str]] = Query(
+        None, description="Employee code or MongoDB _id; repeat for several employees"
+    ),
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
-    status: Optional[str] = Query(None),
-    db: AsyncIOMotorDatabase = Depends(get_database_dependency)
+    status_filter: Optional[List[AttendanceStatus]] = Query(
+        None, alias="status", description="Repeat for several statuses"
+    ),
+    order: Optional[Literal["asc", "desc"]] = Query(
+        None,
+        description="Date order (ties broken by id). Default: asc when filtered by employee "
+        "or date, otherwise desc (latest first)",
+    ),
+    paginate: Literal["offset", "cursor"] = Query(
+        "offset", description="cursor: keyset pages, no count"
+    ),
+    after: Optional[str] = Query(
+        None, description="Cursor from next_cursor (implies cursor mode)"
+    ),
+    before: Optional[str] = Query(
+        None, description="Cursor from prev_cursor (implies cursor mode)"
+    ),
+    count: CountMode = Depends(count_mode),
+    fields: List[str] = Depends(
+        sparse_fields(ATTENDANCE_LIST_FIELDS, ATTENDANCE_LIST_DEFAULT_FIELDS)
+    ),
+    include: Optional[Literal["employee"]] = Query(
+        None,
+        description="employee: add employee_name/department/position (one extra query per page)",
+    ),
+    db: AsyncIOMotorDatabase = Depends(get_database_dependency),
+    loader: EmployeeLoader = Depends(get_employee_loader),
 ):
+    """List attendance; employee, date range and status filters combine freely.
+
+    Only the requested `fields` are fetched from MongoDB (default: id, date, status).
+    """
     try:
-        # Resolve employee_id (code or MongoDB _id) to ObjectId so list matches attendance collection
-        resolved_employee_oid = None
+        # Resolve employee codes / MongoDB _ids to the ObjectIds stored in attendance
+        employee_oids = None
         if employee_id:
-            try:
-                resolved_employee_oid = await attendance_repository.resolve_employee_oid(db, employee_id)
-            except ValueError:
-                # Employee not found: return empty list
-                return AttendanceListResponse(total=0, page=1, page_size=limit, total_pages=0, data=[])
-            employee_id_for_repo = str(resolved_employee_oid)
-
-        if start_date and end_date:
-            date_filter = _date_range_filter(start_date, end_date)
-            if employee_id:
-                attendance = await attendance_repository.get_by_date_range(db, start_date, end_date, employee_id_for_repo, skip, limit)
-                total = await attendance_repository.count(db, {"employee_id": resolved_employee_oid, **date_filter})
-            else:
-                attendance = await attendance_repository.get_by_date_range(db, start_date, end_date, None, skip, limit)
-                total = await attendance_repository.count(db, date_filter)
-        elif employee_id:
-            attendance = await attendance_repository.get_by_employee(db, employee_id_for_repo, skip, limit)
-            total = await attendance_repository.count(db, {"employee_id": resolved_employee_oid})
-        else:
-            filter_query = {}
-            if status:
-                filter_query["status"] = status
-            attendance = await attendance_repository.get_multi(db, skip, limit, filter_query)
-            total = await attendance_repository.count(db, filter_query)
-        
-        total_pages = (total + limit - 1) // limit
-        data = [AttendanceListItem.from_attendance(a) for a in attendance]
+            resolved = await loader.oids(employee_id)
+            if not resolved:
+                # No matching employee: return empty list
+                return AttendanceListResponse(
+                    total=0,
+                    page=1,
+                    page_size=limit,
+                    total_pages=0,
+                    has_more=False,
+                    next_cursor=None,
+                    prev_cursor=None,
+                    data=[],
+                )
+            employee_oids = list(resolved.values())
+
+        filter_query = attendance_repository.build_list_filter(
+            employee_oids, start_date, end_date, status_filter
+        )
+        projection = projection_for(fields)
+        if include == "employee":
+            # Needed for the join even when employee_id itself is not requested
+            projection["employee_id"] = 1
+
+        if order is None:
+            # Per-employee and date-range views read like a calendar; the full list shows latest first
+            order = "asc" if employee_id or start_date or end_date else "desc"
+        direction = 1 if order == "asc" else -1
+
+        if paginate == "cursor" or after or before:
+            attendance, next_cursor, prev_cursor = (
+                await attendance_repository.get_multi_keyset(
+                    db,
+                    limit=limit,
+                    filter_query=filter_query,
+                    sort_field="date",
+                    direction=direction,
+                    after=after,
+                    before=before,
+                    projection=projection,
+                )
+            )
+            return AttendanceListResponse(
+                total=None,
+                page=None,
+                page_size=limit,
+                total_pages=None,
+                has_more=next_cursor is not None,
+                next_cursor=next_cursor,
+                prev_cursor=prev_cursor,
+                data=await _list_items(loader, attendance, fields, include),
+            )
+
+        attendance, total, has_more = await attendance_repository.get_page(
+            db,
+            skip,
+            limit,
+            filter_query,
+            sort_query=list_sort(direction),
+            projection=projection,
+            count=count,
+        )
+
+        data = await _list_items(loader, attendance, fields, include)
         return AttendanceListResponse(
             total=total,
             page=skip // limit + 1,
             page_size=limit,
-            total_pages=total_pages,
+            total_pages=(total + limit - 1) // limit if total is not None else None,
+            has_more=has_more,
+            next_cursor=None,
+            prev_cursor=None,
             data=data,
         )
-        
+
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.error(f"Error getting attendance: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to retrieve attendance records")
@@ -122,12 +257,17 @@ async def get_attendance(
 @router.get(
     "/employee/{employee_id}/stats",
     response_model=APIResponse[EmployeeAttendanceStatsResponse],
+    dependencies=[Depends(conditional_get(*STATS_SOURCES))],
 )
 async def get_employee_attendance_stats(
     employee_id: str,
     start_date: date = Query(..., description="Range start (e.g. month first day)"),
     end_date: date = Query(..., description="Range end (e.g. month last day)"),
+    calendar: Optional[str] = Query(
+        None, description="Holiday calendar for working days"
+    ),
     db: AsyncIOMotorDatabase = Depends(get_database_dependency),
+    loader: EmployeeLoader = Depends(get_employee_loader),
 ):
     """Optimized: single aggregation for one employee's stats in date range."""
     try:
@@ -137,7 +277,7 @@ async def get_employee_attendance_stats(
                 detail="start_date must be before or equal to end_date",
             )
         stats = await attendance_repository.get_employee_attendance_stats(
-            db, employee_id, start_date, end_date
+            db, employee_id, start_date, end_date, calendar=calendar, loader=loader
         )
         return APIResponse(
             data=EmployeeAttendanceStatsResponse(**stats),
@@ -165,3 +305,139 @@ async def get_employee_attendance_stats(
         )
 
 
+@router.get(
+    "/stats",
+    response_model=APIResponse[EmployeeAttendanceStatsBatchResponse],
+    dependencies=[Depends(conditional_get(*STATS_SOURCES))],
+)
+async def get_attendance_stats_batch(
+    start_date: date = Query(..., description="Range start (e.g. month first day)"),
+    end_date: date = Query(..., description="Range end (e.g. month last day)"),
+    employee_ids: Optional[List[str]] = Query(
+        None, description="Employee codes or MongoDB _ids (repeat the parameter)"
+    ),
+    department: Optional[str] = Query(
+        None, description="All active employees in this department"
+    ),
+    calendar: Optional[str] = Query(
+        None, description="Holiday calendar for working days"
+    ),
+    db: AsyncIOMotorDatabase = Depends(get_database_dependency),
+):
+    """Stats for many employees in one aggregation grouped by (employee_id, status)."""
+    try:
+        if start_date > end_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="start_date must be before or equal to end_date",
+            )
+        if not employee_ids and not department:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Provide employee_ids or department",
+            )
+        if employee_ids and len(employee_ids) > MAX_BATCH_STATS_EMPLOYEES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {MAX_BATCH_STATS_EMPLOYEES} employee_ids per request",
+            )
+        batch = await attendance_repository.get_employees_attendance_stats(
+            db,
+            start_date,
+            end_date,
+            employee_ids=employee_ids,
+            department=department,
+            calendar=calendar,
+        )
+        return APIResponse(
+            data=EmployeeAttendanceStatsBatchResponse(
+                start_date=start_date,
+                end_date=end_date,
+                total_days=batch["total_days"],
+                data=[EmployeeAttendanceStatsItem(**item) for item in batch["data"]],
+                not_found=batch["not_found"],
+            ),
+            message="Attendance statistics retrieved successfully",
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting batch attendance stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve attendance statistics",
+        )
+
+
+@router.get("/export")
+async def export_attendance_file(
+    format: ExportFormat = Query("csv", description="csv or ndjson"),
+    employee_id: Optional[str] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    db: AsyncIOMotorDatabase = Depends(get_database_dependency),
+    loader: EmployeeLoader = Depends(get_employee_loader),
+):
+    """
+    Stream attendance as CSV or NDJSON straight from a MongoDB cursor (no limit cap).
+
+    Rows carry the employee code in employee_id so they join with GET /employees/export.
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be before or equal to end_date",
+        )
+    employee_oid = None
+    if employee_id:
+        try:
+            employee_oid = await attendance_repository.resolve_employee_oid(
+                db, employee_id, loader
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    filter_query = attendance_repository.build_list_filter(
+        employee_oid, start_date, end_date, status_filter
+    )
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        export_attendance(db, filter_query, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="attendance.{format}"'},
+    )
+
+
+@router.get("/matrix", response_model=APIResponse[AttendanceMatrixResponse])
+async def get_attendance_matrix(
+    month: str = Query(..., pattern=r"^\d{4}-\d{2}$", description="YYYY-MM"),
+    department: Optional[str] = Query(None),
+    db: AsyncIOMotorDatabase = Depends(get_database_dependency),
+):
+    """Month heatmap in one request: employee index plus one packed status row per employee."""
+    year, month_number = (int(part) for part in month.split("-"))
+    if not 1 <= month_number <= 12:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="month must be YYYY-MM"
+        )
+    try:
+        matrix = await attendance_repository.get_month_matrix(
+            db, year, month_number, department
+        )
+        return APIResponse(
+            data=AttendanceMatrixResponse(
+                month=month,
+                days=matrix["days"],
+                bits_per_day=MATRIX_BITS_PER_DAY,
+                codes=MATRIX_STATUS_CODES,
+                employees=matrix["employees"],
+                rows=[base64.b64encode(row).decode("ascii") for row in matrix["rows"]],
+            ),
+            message="Attendance matrix retrieved successfully",
+        )
+    except Exception as e:
+        logger.error(f"Error getting attendance matrix for {month}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve attendance matrix",
+        )
@@ -0,0 +1,35 @@
+"""Dashboard API endpoints."""
+
+import logging
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.api.deps import get_database_dependency
+from app.schemas.common import APIResponse
+from app.schemas.dashboard import DashboardSummaryResponse
+from app.services.dashboard import dashboard_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+@router.get("/summary", response_model=APIResponse[DashboardSummaryResponse])
+async def get_dashboard_summary(
+    db: AsyncIOMotorDatabase = Depends(get_database_dependency),
+):
+    """Today's headcount, status counts, per-department breakdown and unmarked employees."""
+    try:
+        summary = await dashboard_service.get_summary(db, date.today())
+        return APIResponse(
+            data=DashboardSummaryResponse(**summary),
+            message="Dashboard summary retrieved successfully",
+        )
+    except Exception as e:
+        logger.error(f"Error getting dashboard summary: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve dashboard summary",
+        )
@@ -0,0 +1,39 @@
+"""Department facet endpoints."""
+
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.api.deps import get_database_dependency
+from app.schemas.department import DepartmentCount, DepartmentListResponse
+from app.services.department import department_repository
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/departments", tags=["departments"])
+
+
+@router.get("", response_model=DepartmentListResponse)
+async def get_departments(
+    include_empty: bool = Query(
+        False, description="Also list departments with no active employees"
+    ),
+    db: AsyncIOMotorDatabase = Depends(get_database_dependency),
+):
+    """Departments with their active headcount, served from the maintained departments collection."""
+    try:
+        departments = await department_repository.get_all(
+            db, include_empty=include_empty
+        )
+        return DepartmentListResponse(
+            total=len(departments),
+            total_employees=sum(d["active_count"] for d in departments),
+            data=[DepartmentCount(**d) for d in departments],
+        )
+    except Exception as e:
+        logger.error(f"Error listing departments: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve departments",
+        )
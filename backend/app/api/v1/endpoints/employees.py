@@ -1,22 +1,70 @@
 """Employee management API endpoints."""
 
 import logging
-from typing import Optional
+from typing import Any, Dict, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pymongo.errors import DuplicateKeyError
 
-from app.api.deps import get_database_dependency
-from app.models.employee import EmployeeCreate, EmployeeInDB
+from app.api.deps import (
+    check_etag,
+    conditional_get,
+    count_mode,
+    get_database_dependency,
+    get_employee_loader,
+    if_match_version,
+    projection_for,
+    sparse_fields,
+    version_etag,
+)
+from app.core.exceptions import VersionConflictError
+from app.models.employee import EmployeeCreate, EmployeeInDB, EmployeeUpdate
 from app.schemas.common import APIResponse, SuccessResponse
-from app.schemas.employee import EmployeeListResponse
+from app.schemas.employee import (
+    EMPLOYEE_LIST_FIELDS,
+    EmployeeImportResponse,
+    EmployeeListItem,
+    EmployeeListResponse,
+    EmployeeSuggestion,
+)
+from app.services.base import CountMode
+from app.services.department import department_repository
 from app.services.employee import employee_repository
+from app.services.employee_directory import employee_directory
+from app.services.employee_loader import EmployeeLoader
+from app.services.employee_import import ImportFormat, employee_importer, iter_rows
+from app.services.export import ExportFormat, export_employees
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/employees", tags=["employees"])
 
+# Unique employee fields, as named in a duplicate-key error message
+_UNIQUE_FIELD_LABELS = {"employee_id": "ID", "email": "email"}
+
+
+def _duplicate_detail(e: DuplicateKeyError, values: Dict[str, Any]) -> str:
+    """Name the unique field a write collided on (keyPattern/keyValue, else values)."""
+    details = e.details or {}
+    key_pattern = details.get("keyPattern") or {}
+    for field, label in _UNIQUE_FIELD_LABELS.items():
+        if field in key_pattern or field in str(e):
+            value = (details.get("keyValue") or {}).get(field, values.get(field))
+            return f"Employee with {label} {value} already exists"
+    return "Employee with this ID or email already exists"
+
 
 @router.post("", response_model=APIResponse[EmployeeInDB], status_code=status.HTTP_201_CREATED)
 async def create_employee(
@@ -24,40 +72,22 @@ async def create_employee(
     db: AsyncIOMotorDatabase = Depends(get_database_dependency)
 ):
     try:
-        existing_employee = await employee_repository.get_by_employee_id(db, employee_data.employee_id)
-        if existing_employee:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Employee with ID {employee_data.employee_id} already exists"
-            )
-        
-        existing_by_email = await employee_repository.get_by_email(db, employee_data.email)
-        if existing_by_email:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Employee with email {employee_data.email} already exists"
-            )
-        
+        # Uniqueness is enforced by active_employee_id_unique_index / active_email_unique_index;
+        # one insert instead of two lookups plus an insert and a re-read
         employee = await employee_repository.create(db, employee_data)
-        
+
         return APIResponse(
             data=employee,
             message="Employee created successfully"
         )
-        
+
     except HTTPException:
         raise
     except DuplicateKeyError as e:
-        logger.warning(f"Duplicate key on create: {e}")
-        # Race condition: duplicate employee_id or email
-        detail = "Employee with this ID or email already exists."
-        if "employee_id" in str(e):
-            detail = f"Employee with ID {employee_data.employee_id} already exists."
-        elif "email" in str(e):
-            detail = f"Employee with email {employee_data.email} already exists."
+        logger.info(f"Duplicate key on create: {e}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=detail,
+            detail=_duplicate_detail(e, employee_data.model_dump()),
         )
     except ValueError as e:
         raise HTTPException(
@@ -72,35 +102,148 @@ async def create_employee(
         )
 
 
+@router.post("/import", response_model=APIResponse[EmployeeImportResponse])
+async def import_employees(
+    file: UploadFile = File(
+        ..., description="CSV (header row) or JSON/NDJSON of employees"
+    ),
+    format: Optional[ImportFormat] = Query(
+        None, description="csv, json or ndjson; default from file extension"
+    ),
+    db: AsyncIOMotorDatabase = Depends(get_database_dependency),
+):
+    """Bulk create employees with the same validation as POST /employees; per-row error report."""
+    fmt = format
+    if fmt is None:
+        extension = (file.filename or "").rsplit(".", 1)[-1].lower()
+        fmt = extension if extension in ("csv", "json", "ndjson") else "csv"
+    try:
+        report = await employee_importer.run(db, iter_rows(file.file, fmt))
+        return APIResponse(
+            data=EmployeeImportResponse(**report),
+            message=f"Imported {report['created']} of {report['total']} employees",
+        )
+    except (ValueError, UnicodeDecodeError) as e:
+        # Unreadable upload (bad encoding, malformed JSON array)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not read {fmt} upload: {e}",
+        )
+    except Exception as e:
+        logger.error(f"Error importing employees: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to import employees",
+        )
+    finally:
+        await file.close()
+
+
 @router.get(
     "",
     response_model=EmployeeListResponse,
     response_model_by_alias=False,
+    response_model_exclude_unset=True,
+    dependencies=[Depends(conditional_get("employees"))],
 )
 async def get_employees(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     department: Optional[str] = Query(None),
-    search: Optional[str] = Query(None),
-    db: AsyncIOMotorDatabase = Depends(get_database_dependency)
+    search: Optional[str] = Query(
+        None,
+        description="Words matched against ID, name, email and position; results ranked",
+    ),
+    paginate: Literal["offset", "cursor"] = Query(
+        "offset", description="cursor: keyset pages, no count"
+    ),
+    after: Optional[str] = Query(
+        None, description="Cursor from next_cursor (implies cursor mode)"
+    ),
+    before: Optional[str] = Query(
+        None, description="Cursor from prev_cursor (implies cursor mode)"
+    ),
+    count: CountMode = Depends(count_mode),
+    fields: List[str] = Depends(
+        sparse_fields(EMPLOYEE_LIST_FIELDS, EMPLOYEE_LIST_FIELDS)
+    ),
+    db: AsyncIOMotorDatabase = Depends(get_database_dependency),
 ):
+    """List employees, latest first; with `search`, best matches first (offset pages only)."""
     try:
-        # Build filter for backend: search and/or department (no client-side filtering)
-        filter_query = employee_repository.build_list_filter(search=search, department=department)
-        employees = await employee_repository.get_multi(
-            db, skip=skip, limit=limit,
+        projection = projection_for(fields)
+        if search and search.strip():
+            if paginate == "cursor" or after or before:
+                raise ValueError(
+                    "Search results are ranked; use offset pagination (skip/limit)"
+                )
+            employees, total, has_more = await employee_repository.search(
+                db,
+                search,
+                department=department,
+                skip=skip,
+                limit=limit,
+                projection=projection,
+            )
+            # total is None when the query matched too broadly to rank every candidate
+            return EmployeeListResponse(
+                total=total,
+                page=skip // limit + 1,
+                page_size=limit,
+                total_pages=(total + limit - 1) // limit if total is not None else None,
+                has_more=has_more,
+                next_cursor=None,
+                prev_cursor=None,
+                data=[EmployeeListItem.from_document(doc, fields) for doc in employees],
+            )
+        filter_query = employee_repository.build_list_filter(department=department)
+        if paginate == "cursor" or after or before:
+            employees, next_cursor, prev_cursor = (
+                await employee_repository.get_multi_keyset(
+                    db,
+                    limit=limit,
+                    filter_query=filter_query,
+                    sort_field="created_at",
+                    direction=-1,  # latest first
+                    after=after,
+                    before=before,
+                    projection=projection,
+                )
+            )
+            return EmployeeListResponse(
+                total=None,
+                page=None,
+                page_size=limit,
+                total_pages=None,
+                has_more=next_cursor is not None,
+                next_cursor=next_cursor,
+                prev_cursor=prev_cursor,
+                data=[EmployeeListItem.from_document(doc, fields) for doc in employees],
+            )
+        employees, total, has_more = await employee_repository.get_page(
+            db,
+            skip=skip,
+            limit=limit,
             filter_query=filter_query,
-            sort_query=[("created_at", -1)]  # latest first
+            sort_query=[("created_at", -1)],  # latest first
+            projection=projection,
+            count=count,
         )
-        total = await employee_repository.count(db, filter_query)
-        total_pages = (total + limit - 1) // limit if limit else 0
 
         return EmployeeListResponse(
             total=total,
             page=skip // limit + 1,
             page_size=limit,
-            total_pages=total_pages,
-            data=employees
+            total_pages=(total + limit - 1) // limit if total is not None else None,
+            has_more=has_more,
+            next_cursor=None,
+            prev_cursor=None,
+            data=[EmployeeListItem.from_document(doc, fields) for doc in employees],
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
         )
     except Exception as e:
         logger.error(f"Error getting employees: {e}")
@@ -114,25 +257,58 @@ async def get_employees(
     "/department/{department}",
     response_model=EmployeeListResponse,
     response_model_by_alias=False,
+    response_model_exclude_unset=True,
 )
 async def get_employees_by_department(
     department: str,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    db: AsyncIOMotorDatabase = Depends(get_database_dependency)
+    count: CountMode = Depends(count_mode),
+    fields: List[str] = Depends(
+        sparse_fields(EMPLOYEE_LIST_FIELDS, EMPLOYEE_LIST_FIELDS)
+    ),
+    db: AsyncIOMotorDatabase = Depends(get_database_dependency),
 ):
+    """
+    Active employees of a department; the total is the maintained headcount (omitted for
+    count=none). The headcount is derived data that a failed $inc can leave behind, so it
+    never decides which rows are returned, and a missing or zero one is re-counted.
+    """
     try:
-        employees = await employee_repository.get_by_department(db, department, skip, limit)
-        total = await employee_repository.count(db, {"department": department})
-        total_pages = (total + limit - 1) // limit
-        
+        filter_query = employee_repository.build_list_filter(department=department)
+        department_info = await department_repository.get(db, department)
+        if department_info is None and not await employee_repository.exists(
+            db, filter_query
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Department {department} not found",
+            )
+        # One row past the page tells whether another page follows
+        employees = await employee_repository.get_by_department(
+            db, department, skip, limit + 1, projection=projection_for(fields)
+        )
+        has_more = len(employees) > limit
+        employees = employees[:limit]
+        total = None
+        if count != "none":
+            if department_info and department_info["active_count"] > 0:
+                total = department_info["active_count"]
+            else:
+                total = await employee_repository.count(db, filter_query)
+
         return EmployeeListResponse(
             total=total,
             page=skip // limit + 1,
             page_size=limit,
-            total_pages=total_pages,
-            data=employees
+            total_pages=(total + limit - 1) // limit if total is not None else None,
+            has_more=has_more,
+            next_cursor=None,
+            prev_cursor=None,
+            data=[EmployeeListItem.from_document(doc, fields) for doc in employees],
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting employees by department {department}: {e}")
         raise HTTPException(
@@ -141,20 +317,75 @@ async def get_employees_by_department(
         )
 
 
+@router.get("/suggest", response_model=APIResponse[List[EmployeeSuggestion]])
+async def suggest_employees(
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=100,
+        description="Prefix of a name, email or employee ID",
+    ),
+    limit: int = Query(10, ge=1, le=20),
+    db: AsyncIOMotorDatabase = Depends(get_database_dependency),
+):
+    """Typeahead: active employees whose name words, email local part or ID start with q."""
+    try:
+        suggestions = await employee_repository.suggest(db, q, limit)
+        return APIResponse(data=[EmployeeSuggestion(**s) for s in suggestions])
+    except Exception as e:
+        logger.error(f"Error suggesting employees for {q!r}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to suggest employees",
+        )
+
+
+@router.get("/export")
+async def export_employees_file(
+    format: ExportFormat = Query("csv", description="csv or ndjson"),
+    db: AsyncIOMotorDatabase = Depends(get_database_dependency),
+):
+    """Stream all active employees as CSV or NDJSON (join attendance exports on employee_id)."""
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        export_employees(db, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="employees.{format}"'},
+    )
+
+
 @router.get("/{employee_id}", response_model=APIResponse[EmployeeInDB])
 async def get_employee_by_id(
     employee_id: str,
-    db: AsyncIOMotorDatabase = Depends(get_database_dependency)
+    request: Request,
+    response: Response,
+    loader: EmployeeLoader = Depends(get_employee_loader),
 ):
+    """
+    The ETag is the employee's version: send it back as If-Match to PATCH safely.
+
+    If-None-Match is checked against the version in the employee directory first, so a
+    revalidation is answered without reading MongoDB; PATCHes in another worker show once
+    that worker's entry expires (EMPLOYEE_DIRECTORY_TTL_SECONDS).
+    """
+    cached = employee_directory.get(employee_id)
+    if (
+        cached is not None
+        and cached["employee_id"] == employee_id.upper()
+        and cached["deleted_at"] is None
+        and cached["version"] is not None
+    ):
+        check_etag(request, response, version_etag(cached["version"]))
     try:
-        employee = await employee_repository.get_by_employee_id(db, employee_id)
-        
+        employee = await loader.employee(employee_id)
+
         if not employee:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Employee {employee_id} not found"
             )
-        
+
+        check_etag(request, response, version_etag(employee.version))
         return APIResponse(data=employee)
     except HTTPException:
         raise
@@ -166,6 +397,60 @@ async def get_employee_by_id(
         )
 
 
+@router.patch("/{employee_id}", response_model=APIResponse[EmployeeInDB])
+async def update_employee(
+    employee_id: str,
+    employee_data: EmployeeUpdate,
+    response: Response,
+    if_match: Optional[int] = Depends(if_match_version),
+    db: AsyncIOMotorDatabase = Depends(get_database_dependency),
+):
+    """
+    Partial update; only the fields sent are validated and written, in one update.
+
+    Send the ETag from GET /employees/{id} (the employee's `version`) as If-Match, or the
+    version in the body, to update only if nobody else has since; a stale version is 412
+    Precondition Failed. The response's ETag is the new version.
+    """
+    changes = employee_data.changes()
+    if not changes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No fields to update",
+        )
+    expected_version = if_match if if_match is not None else employee_data.version
+    try:
+        employee = await employee_repository.patch(
+            db, employee_id, changes, expected_version
+        )
+        if not employee:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Employee {employee_id} not found",
+            )
+        response.headers["ETag"] = version_etag(employee.version)
+        return APIResponse(data=employee, message="Employee updated successfully")
+    except HTTPException:
+        raise
+    except VersionConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=str(e),
+        )
+    except DuplicateKeyError as e:
+        logger.info(f"Duplicate key on update: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=_duplicate_detail(e, changes),
+        )
+    except Exception as e:
+        logger.error(f"Error updating employee {employee_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update employee",
+        )
+
+
 @router.delete("/{employee_id}", response_model=SuccessResponse)
 async def delete_employee(
     employee_id: str,
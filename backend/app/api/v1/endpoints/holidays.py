@@ -0,0 +1,150 @@
+"""Holiday calendar administration endpoints."""
+
+import logging
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+
+from app.api.deps import get_database_dependency
+from app.config.settings import settings
+from app.models.holiday import HolidayCreate, HolidayInDB
+from app.schemas.common import APIResponse, SuccessResponse
+from app.schemas.holiday import HolidayListResponse, WorkingDaysResponse
+from app.services.holiday import holiday_repository
+from app.services.working_days import working_day_calculator
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/holidays", tags=["holidays"])
+
+
+@router.get("/calendars", response_model=APIResponse[List[str]])
+async def get_holiday_calendars(
+    db: AsyncIOMotorDatabase = Depends(get_database_dependency),
+):
+    try:
+        return APIResponse(data=await holiday_repository.get_calendars(db))
+    except Exception as e:
+        logger.error(f"Error listing holiday calendars: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve holiday calendars",
+        )
+
+
+@router.get("/working-days", response_model=APIResponse[WorkingDaysResponse])
+async def get_working_days(
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    calendar: Optional[str] = Query(
+        None, description="Region or office code; default from settings"
+    ),
+    db: AsyncIOMotorDatabase = Depends(get_database_dependency),
+):
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be before or equal to end_date",
+        )
+    calendar = calendar or settings.DEFAULT_HOLIDAY_CALENDAR
+    try:
+        working_days = await working_day_calculator.count(
+            db, start_date, end_date, calendar
+        )
+        return APIResponse(
+            data=WorkingDaysResponse(
+                calendar=calendar,
+                start_date=start_date,
+                end_date=end_date,
+                working_days=working_days,
+            )
+        )
+    except Exception as e:
+        logger.error(f"Error computing working days: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to compute working days",
+        )
+
+
+@router.get(
+    "", response_model=APIResponse[HolidayListResponse], response_model_by_alias=False
+)
+async def get_holidays(
+    calendar: Optional[str] = Query(
+        None, description="Region or office code; default from settings"
+    ),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    db: AsyncIOMotorDatabase = Depends(get_database_dependency),
+):
+    calendar = calendar or settings.DEFAULT_HOLIDAY_CALENDAR
+    try:
+        holidays = await holiday_repository.get_by_calendar(
+            db, calendar, start_date, end_date
+        )
+        return APIResponse(
+            data=HolidayListResponse(
+                calendar=calendar, total=len(holidays), data=holidays
+            )
+        )
+    except Exception as e:
+        logger.error(f"Error getting holidays for {calendar}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve holidays",
+        )
+
+
+@router.post(
+    "",
+    response_model=APIResponse[HolidayInDB],
+    response_model_by_alias=False,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_holiday(
+    holiday_data: HolidayCreate,
+    db: AsyncIOMotorDatabase = Depends(get_database_dependency),
+):
+    try:
+        holiday = await holiday_repository.create(db, holiday_data)
+        return APIResponse(data=holiday, message="Holiday added successfully")
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Calendar {holiday_data.calendar} already has a holiday on {holiday_data.date}",
+        )
+    except Exception as e:
+        logger.error(f"Error creating holiday: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to add holiday",
+        )
+
+
+@router.delete("/{holiday_id}", response_model=SuccessResponse)
+async def delete_holiday(
+    holiday_id: str,
+    db: AsyncIOMotorDatabase = Depends(get_database_dependency),
+):
+    try:
+        deleted = await holiday_repository.delete(db, holiday_id)
+        if not deleted:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Holiday {holiday_id} not found",
+            )
+        return SuccessResponse(message="Holiday deleted successfully")
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error deleting holiday {holiday_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to delete holiday",
+        )
@@ -1,8 +1,11 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import employees, attendance
+from app.api.v1.endpoints import employees, attendance, dashboard, departments, holidays
 
 api_router = APIRouter()
 
 # Include all routers
 api_router.include_router(employees.router)
 api_router.include_router(attendance.router)
+api_router.include_router(dashboard.router)
+api_router.include_router(holidays.router)
+api_router.include_router(departments.router)
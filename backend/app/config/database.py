@@ -1,7 +1,11 @@
 from app.config.logging_config import get_logger
-from typing import Optional
+from typing import List, Optional
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+from pymongo.errors import (
+    ConnectionFailure,
+    OperationFailure,
+    ServerSelectionTimeoutError,
+)
 from app.config.settings import settings
 
 logger = get_logger(__name__)
@@ -118,47 +122,34 @@ async def create_indexes():
     """
     if mongodb.database is None:
         raise ConnectionError("Database not initialized. Cannot create indexes.")
-    
+
     try:
-        # Employees collection indexes - only essential ones
-        # Unique constraint for employee_id
-        await mongodb.database.employees.create_index(
-            "employee_id",
-            unique=True,
-            name="employee_id_unique_index"
-        )
-        # Unique constraint for email
-        await mongodb.database.employees.create_index(
-            "email",
+        # Employees: partial indexes over active employees (see create_employee_indexes)
+        await create_employee_indexes(mongodb.database)
+
+        # Attendance: employee-month buckets, or daily rows (standard or time-series)
+        if settings.ATTENDANCE_LAYOUT == "bucket":
+            await create_attendance_bucket_indexes(mongodb.database)
+        else:
+            await ensure_attendance_collection(mongodb.database)
+            await create_attendance_indexes(mongodb.database)
+
+        # Monthly rollups: one document per (employee, month), upserted by $inc
+        await mongodb.database.attendance_monthly.create_index(
+            [("employee_id", 1), ("month", 1)],
             unique=True,
-            name="email_unique_index"
+            name="employee_month_unique_index",
         )
-        # Department index - used in get_by_department queries
-        await mongodb.database.employees.create_index(
-            "department",
-            name="department_index"
-        )
-        
-        # Attendance collection indexes - only essential ones
-        # Enforce no duplicate attendance per employee + date (assignment requirement)
-        await mongodb.database.attendance.create_index(
-            [("employee_id", 1), ("date", 1)],
+
+        # Holiday calendars: one holiday per calendar per date
+        await mongodb.database.holidays.create_index(
+            [("calendar", 1), ("date", 1)],
             unique=True,
-            name="employee_date_unique_index"
-        )
-        # Date index - used in date range queries and sorting
-        await mongodb.database.attendance.create_index(
-            "date",
-            name="date_index"
+            name="calendar_date_unique_index",
         )
-        # Marked_at index - used in sorting attendance records
-        await mongodb.database.attendance.create_index(
-            "marked_at",
-            name="marked_at_index"
-        )
-        
+
         logger.debug("Essential MongoDB indexes created/verified successfully")
-        
+
     except Exception as e:
         logger.error(f"Error creating MongoDB indexes: {e}")
         raise
@@ -179,13 +170,13 @@ async def check_database_health() -> dict:
                 "status": "unhealthy",
                 "message": "MongoDB client or database not initialized"
             }
-        
+
         # Ping the database to verify connection
         await mongodb.client.admin.command('ping')
-        
+
         # Get server info
         server_info = await mongodb.client.server_info()
-        
+
         # Get database stats (may fail if database doesn't exist yet)
         try:
             db_stats = await mongodb.database.command("dbStats")
@@ -206,10 +197,187 @@ async def check_database_health() -> dict:
                 "database": settings.MONGODB_DB_NAME,
                 "message": "Connection healthy but stats unavailable"
             }
-        
+
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
         return {
             "status": "unhealthy",
             "message": str(e)
         }
+
+
+def attendance_timeseries_options() -> dict:
+    """
+    Time-series layout for attendance: one measurement per (employee, day).
+
+    employee_id is the metaField so each employee's days share buckets; "hours"
+    granularity gives ~30-day buckets, i.e. roughly one bucket per employee-month.
+    """
+    return {"timeField": "date", "metaField": "employee_id", "granularity": "hours"}
+
+
+async def ensure_attendance_collection(
+    database: AsyncIOMotorDatabase,
+    name: str = "attendance",
+    timeseries: Optional[bool] = None,
+) -> None:
+    """
+    Create the attendance collection in the configured storage mode if it does not exist.
+
+    An existing collection is never converted here; a mismatch is logged and left to
+    scripts/migrate_attendance_timeseries.py.
+    """
+    timeseries = settings.ATTENDANCE_TIMESERIES if timeseries is None else timeseries
+    existing = await database.list_collections(filter={"name": name}).to_list(length=1)
+    if existing:
+        is_timeseries = existing[0].get("type") == "timeseries"
+        if is_timeseries != timeseries:
+            logger.warning(
+                f"Collection {name} is {'time-series' if is_timeseries else 'standard'} but "
+                f"ATTENDANCE_TIMESERIES={timeseries}; run scripts/migrate_attendance_timeseries.py"
+            )
+        return
+    if timeseries:
+        await database.create_collection(
+            name, timeseries=attendance_timeseries_options()
+        )
+        logger.info(f"Created time-series collection {name}")
+
+
+# Full-collection employee indexes replaced by the partial ones; dropped by scripts/migrate_employee_active_flag.py
+LEGACY_EMPLOYEE_INDEXES = (
+    "employee_id_unique_index",
+    "email_unique_index",
+    "department_index",
+    "created_at_id_index",
+)
+
+
+_ACTIVE = {"is_active": True}
+
+# (keys, options) of the employees indexes; see create_employee_indexes
+EMPLOYEE_INDEXES = (
+    # Unique employee_id / email among active employees
+    (
+        "employee_id",
+        {
+            "unique": True,
+            "partialFilterExpression": _ACTIVE,
+            "name": "active_employee_id_unique_index",
+        },
+    ),
+    (
+        "email",
+        {
+            "unique": True,
+            "partialFilterExpression": _ACTIVE,
+            "name": "active_email_unique_index",
+        },
+    ),
+    # Department lists sorted by name (get_by_department, get_codes_by_department)
+    (
+        [("department", 1), ("full_name", 1)],
+        {
+            "partialFilterExpression": _ACTIVE,
+            "name": "active_department_full_name_index",
+        },
+    ),
+    # Employee list, offset and keyset pages: created_at desc with _id tiebreak
+    (
+        [("created_at", -1), ("_id", -1)],
+        {"partialFilterExpression": _ACTIVE, "name": "active_created_at_id_index"},
+    ),
+    # Employee search: multikey index over the n-gram/prefix keys (see employee_search)
+    ("search_keys", {"name": "search_keys_index"}),
+)
+
+
+async def create_employee_indexes(
+    database: AsyncIOMotorDatabase, name: str = "employees"
+) -> List[str]:
+    """
+    Indexes for the employees collection; returns the names of any that were skipped.
+
+    All but search_keys are partial on {is_active: true}: soft-deleted employees stay out
+    of them, so their IDs and emails can be reused, and every repository query (which
+    carries NOT_DELETED = {is_active: true}) is eligible to use them.
+
+    Each index is created on its own. Servers before 5.0 refuse a partial index next to a
+    full one on the same keys (LEGACY_EMPLOYEE_INDEXES), so such a conflict is logged and
+    skips only that index; scripts/migrate_employee_active_flag.py drops the legacy ones.
+    """
+    collection = database[name]
+    skipped = []
+    for keys, options in EMPLOYEE_INDEXES:
+        try:
+            await collection.create_index(keys, **options)
+        except OperationFailure as e:
+            logger.warning(
+                f"Could not create employee index {options['name']} ({e}); "
+                "run scripts/migrate_employee_active_flag.py"
+            )
+            skipped.append(options["name"])
+    return skipped
+
+
+async def create_attendance_indexes(
+    database: AsyncIOMotorDatabase,
+    name: str = "attendance",
+    timeseries: Optional[bool] = None,
+) -> None:
+    """
+    Indexes for an attendance collection in either storage mode.
+
+    Time-series collections cannot carry unique indexes, so there (employee_id, date) is
+    a plain index and uniqueness comes from the attendance_keys collection instead.
+    """
+    timeseries = settings.ATTENDANCE_TIMESERIES if timeseries is None else timeseries
+    collection = database[name]
+    if timeseries:
+        await collection.create_index(
+            [("employee_id", 1), ("date", 1)], name="employee_date_index"
+        )
+    else:
+        # Enforce no duplicate attendance per employee + date (assignment requirement)
+        await collection.create_index(
+            [("employee_id", 1), ("date", 1)],
+            unique=True,
+            name="employee_date_unique_index",
+        )
+    # Date index - used in date range queries and sorting
+    await collection.create_index("date", name="date_index")
+    # List order is (date, _id) either way; each list index ends in those two keys so
+    # filtered pages need no in-memory sort (see build_list_filter)
+    await collection.create_index([("date", 1), ("_id", 1)], name="date_id_index")
+    await collection.create_index(
+        [("employee_id", 1), ("date", 1), ("_id", 1)], name="employee_date_id_index"
+    )
+    await collection.create_index(
+        [("status", 1), ("date", 1), ("_id", 1)], name="status_date_id_index"
+    )
+    # Superseded by the _id-suffixed indexes above
+    existing = await collection.index_information()
+    for name in ("status_date_index", "date_status_index"):
+        if name in existing:
+            await collection.drop_index(name)
+    # Marked_at index - used in sorting attendance records
+    await collection.create_index("marked_at", name="marked_at_index")
+
+
+async def create_attendance_bucket_indexes(
+    database: AsyncIOMotorDatabase, name: str = "attendance_buckets"
+) -> None:
+    """
+    Indexes for the bucket layout (one document per employee-month).
+
+    The unique (employee_id, month) index is what turns a second mark of a day into a
+    DuplicateKeyError (see AttendanceBucketRepository); month serves date-range reads
+    across all employees.
+    """
+    collection = database[name]
+    await collection.create_index(
+        [("employee_id", 1), ("month", 1)],
+        unique=True,
+        name="employee_month_unique_index",
+    )
+    await collection.create_index("month", name="month_index")
@@ -5,23 +5,23 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     """Production-ready configuration with security-first defaults"""
-    
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=True,
         extra="ignore"  # Fail fast on unknown env vars
     )
-    
+
     # Project settings
     PROJECT_NAME: str = "HRMS Lite API"
     VERSION: str = "1.0.0"
     API_V1_PREFIX: str = "/api/v1"
-    
+
     # Environment configuration
     ENVIRONMENT: Literal["development", "staging", "production"] = "development"
     DEBUG: bool = Field(default=False, description="Enable debug mode and detailed errors")
-    
+
     # Security settings - MUST be set in production
     SECRET_KEY: str = Field(
         default="dev-secret-key-change-in-production-32-chars-min",
@@ -35,7 +35,7 @@ class Settings(BaseSettings):
         le=1440,
         description="Access token expiration time in minutes (1-1440)"
     )
-    
+
     # Database settings
     MONGODB_URL: str = Field(
         default="mongodb://localhost:27017",
@@ -53,7 +53,7 @@ class Settings(BaseSettings):
         ge=1,
         description="Minimum MongoDB connection pool size"
     )
-    
+
     @field_validator("MONGODB_MAX_CONNECTIONS")
     @classmethod
     def validate_connection_pool(cls, v, info):
@@ -64,7 +64,142 @@ class Settings(BaseSettings):
                 f"MONGODB_MAX_CONNECTIONS ({v}) must be >= MONGODB_MIN_CONNECTIONS ({min_conn})"
             )
         return v
-    
+
+    # Attendance stats: serve whole months from the attendance_monthly rollups. Opt-in: a
+    # failed rollup $inc is only logged, so drift needs scripts/rebuild_attendance_monthly.py.
+    # Rollups are only written while enabled; the first start after enabling rebuilds them.
+    ATTENDANCE_ROLLUPS_ENABLED: bool = Field(
+        default=False,
+        description="Read whole months from attendance_monthly rollups in stats",
+    )
+
+    # Dashboard summary: seconds a computed summary is served from the in-process cache
+    DASHBOARD_CACHE_TTL_SECONDS: int = Field(
+        default=15,
+        ge=0,
+        le=3600,
+        description="TTL of the cached dashboard summary (attendance writes invalidate it)",
+    )
+
+    # Exports: documents fetched per MongoDB cursor batch when streaming CSV/NDJSON
+    EXPORT_BATCH_SIZE: int = Field(
+        default=1000,
+        ge=1,
+        le=100000,
+        description="Cursor batch size for streaming exports",
+    )
+
+    # List totals: how offset pages count matches unless the request passes count=
+    LIST_COUNT_DEFAULT: Literal["exact", "estimated", "cached", "none"] = Field(
+        default="exact",
+        description="Default count strategy for employee/attendance list endpoints",
+    )
+    LIST_COUNT_CACHE_TTL_SECONDS: int = Field(
+        default=30,
+        ge=1,
+        le=3600,
+        description="TTL of cached list totals (count=cached); writes in this worker invalidate them",
+    )
+
+    # Conditional GETs: ETags on employee and attendance reads
+    ETAG_TTL_SECONDS: int = Field(
+        default=60,
+        ge=0,
+        le=86400,
+        description="ETags also change this often, bounding staleness from writes that bypass the API, e.g. scripts (0: never)",
+    )
+    ETAG_SYNC_INTERVAL_SECONDS: float = Field(
+        default=1.0,
+        gt=0,
+        le=60,
+        description="How often each worker flushes its write counts to write_versions and reads the others' (ETag lag across workers)",
+    )
+
+    # Employee import: rows validated, duplicate-checked and inserted per chunk
+    IMPORT_BATCH_SIZE: int = Field(
+        default=500,
+        ge=1,
+        le=10000,
+        description="Rows per chunk for bulk employee import",
+    )
+
+    # Employee search: indexed search_keys lookup, ranked in process
+    EMPLOYEE_SEARCH_MIN_LENGTH: int = Field(
+        default=3,
+        ge=1,
+        le=20,
+        description="Minimum letters/digits in an employee search query",
+    )
+    EMPLOYEE_SEARCH_MAX_CANDIDATES: int = Field(
+        default=1000,
+        ge=1,
+        le=100000,
+        description="Most index candidates ranked per employee search",
+    )
+
+    # Employee directory: in-process code <-> _id <-> profile cache used to resolve employees
+    EMPLOYEE_DIRECTORY_MAX_SIZE: int = Field(
+        default=10000,
+        ge=1,
+        le=1000000,
+        description="Most employees held in the in-process directory cache",
+    )
+    EMPLOYEE_DIRECTORY_TTL_SECONDS: int = Field(
+        default=300,
+        ge=0,
+        le=86400,
+        description="TTL of directory entries (0 disables caching); bounds staleness across workers",
+    )
+    EMPLOYEE_DIRECTORY_WARM: bool = Field(
+        default=False,
+        description="Load active employees into the directory cache at startup",
+    )
+
+    # Employee suggest: in-memory typeahead index, rebuilt to pick up other workers' writes
+    EMPLOYEE_SUGGEST_REFRESH_SECONDS: int = Field(
+        default=300,
+        ge=0,
+        le=86400,
+        description="Age after which the suggest index is rebuilt in the background (0 never)",
+    )
+
+    # Holiday calendars: default calendar for working-day counts and cache lifetime
+    DEFAULT_HOLIDAY_CALENDAR: str = Field(
+        default="default",
+        description="Holiday calendar used when a request does not name one",
+    )
+    HOLIDAY_CACHE_TTL_SECONDS: int = Field(
+        default=300,
+        ge=0,
+        le=86400,
+        description="TTL of cached holiday indexes and working-day counts",
+    )
+
+    # Attendance storage: native time-series collection instead of a standard one
+    ATTENDANCE_TIMESERIES: bool = Field(
+        default=False,
+        description="Create attendance as a time-series collection (MongoDB 7.0+); "
+        "existing data needs scripts/migrate_attendance_timeseries.py",
+    )
+
+    # Attendance layout: one document per record ("daily") or per employee-month ("bucket")
+    ATTENDANCE_LAYOUT: Literal["daily", "bucket"] = Field(
+        default="daily",
+        description="Attendance document layout; convert existing data with "
+        "scripts/convert_attendance_layout.py. ATTENDANCE_TIMESERIES applies to daily only",
+    )
+
+    # Attendance archive: closed months move from MongoDB to compressed segment files
+    ATTENDANCE_ARCHIVE_DIR: str = Field(
+        default="archive/attendance",
+        description="Directory (local disk or mounted volume) holding archived attendance segments",
+    )
+    ATTENDANCE_ARCHIVE_AFTER_DAYS: int = Field(
+        default=365,
+        ge=31,
+        description="Months that ended more than this many days ago are eligible for archiving",
+    )
+
     # Server settings
     HOST: str = Field(
         default="0.0.0.0",
@@ -76,12 +211,12 @@ class Settings(BaseSettings):
         le=65535,
         description="Server port number (1-65535)"
     )
-    
+
     @property
     def RELOAD(self) -> bool:
         """Auto-reload only in debug mode"""
         return self.DEBUG
-    
+
     # CORS settings - more restrictive defaults for production
     ALLOWED_ORIGINS: List[str] = Field(
         default=["http://localhost:5173", "http://localhost:3000"],
@@ -89,15 +224,16 @@ class Settings(BaseSettings):
     )
     ALLOWED_METHODS: List[str] = ["GET", "POST", "PUT", "DELETE", "PATCH"]
     ALLOWED_HEADERS: List[str] = [
-        "Content-Type", 
-        "Authorization", 
+        "Content-Type",
+        "Authorization",
         "X-Requested-With",
-        "X-Request-ID"
+        "X-Request-ID",
+        "If-Match",
     ]
-    
+
     # Logging configuration
     LOG_LEVEL: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = "INFO"
-    
+
     @field_validator("ENVIRONMENT", mode="before")
     @classmethod
     def validate_environment(cls, v):
@@ -108,7 +244,7 @@ class Settings(BaseSettings):
         elif env in ["staging", "stage"]:
             return "staging"
         return "development"
-    
+
     @field_validator("DEBUG", mode="before")
     @classmethod
     def set_debug_from_env(cls, v, info):
@@ -117,31 +253,31 @@ class Settings(BaseSettings):
             return bool(v)
         env = info.data.get("ENVIRONMENT", "development")
         return env != "production"
-    
+
     @field_validator("SECRET_KEY", mode="before")
     @classmethod
     def validate_secret_key(cls, v, info):
         """Ensure SECRET_KEY is secure in production"""
         env = info.data.get("ENVIRONMENT", "development")
         default_key = "dev-secret-key-change-in-production-32-chars-min"
-        
+
         # Use default if not provided
         if not v:
             v = default_key
-        
+
         # Validate length (must be at least 32 characters)
         if len(v) < 32:
             raise ValueError("SECRET_KEY must be at least 32 characters long")
-        
+
         # Production security check
         if env == "production" and (v == default_key or v == "your-secret-key-here-change-in-production"):
             raise ValueError(
                 "SECRET_KEY must be set to a secure, unique value in production. "
                 "Do not use default or example values."
             )
-        
+
         return v
-    
+
     @field_validator("ALLOWED_ORIGINS", mode="before")
     @classmethod
     def parse_cors_origins(cls, v):
@@ -162,7 +298,7 @@ class Settings(BaseSettings):
                     pass
             return [i.strip() for i in v.split(",") if i.strip()]
         raise ValueError(f"Invalid ALLOWED_ORIGINS format: {v}")
-    
+
     @field_validator("ALLOWED_METHODS", mode="before")
     @classmethod
     def parse_cors_methods(cls, v):
@@ -180,7 +316,7 @@ class Settings(BaseSettings):
             # Comma-separated string
             return [i.strip() for i in v.split(",") if i.strip()]
         raise ValueError(f"Invalid ALLOWED_METHODS format: {v}")
-    
+
     @field_validator("ALLOWED_HEADERS", mode="before")
     @classmethod
     def parse_cors_headers(cls, v):
@@ -1,13 +1,19 @@
 """Core utilities and exceptions for HRMS application"""
 
+from app.core.cache import TTLCache
+from app.core.loader import DataLoader
 from app.core.exceptions import (
     DuplicateError,
     NotFoundError,
     ValidationError,
+    VersionConflictError,
 )
 
 __all__ = [
+    "TTLCache",
+    "DataLoader",
     "DuplicateError",
     "NotFoundError",
     "ValidationError",
+    "VersionConflictError",
 ]
@@ -0,0 +1,157 @@
+"""Small in-process caches shared by services (single event loop, no locking needed)."""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Iterable, Optional, TypeVar
+
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+# {_id: collection name, version: n}: write counters shared by workers (conditional GETs)
+WRITE_VERSIONS_COLLECTION = "write_versions"
+
+_MISSING = object()
+
+
+class TTLCache(Generic[V]):
+    """
+    Bounded LRU cache whose entries expire ttl_seconds after being set.
+
+    Per-process only: with several uvicorn workers each worker keeps its own copy, so
+    callers should keep TTLs short and invalidate explicitly on writes.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 60.0) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        value = self._lookup(key)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value  # type: ignore[return-value]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._lookup(key) is not _MISSING
+
+    def set(self, key: Hashable, value: V) -> None:
+        self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def pop(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        """Remove and return a live entry without counting a hit or miss."""
+        value = self._lookup(key)
+        self._data.pop(key, None)
+        return default if value is _MISSING else value
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _lookup(self, key: Hashable) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return _MISSING
+        self._data.move_to_end(key)
+        return value
+
+
+class WriteVersions:
+    """
+    Per-collection write counters: repositories record() every write so caches can tag
+    entries with the version they were computed at and treat any other as stale.
+
+    Everything on the request path is in process: record() bumps the local counter and
+    queues the write, and tag() adds the queued writes to the shared versions last read.
+    sync() (run every ETAG_SYNC_INTERVAL_SECONDS off the request path) $incs the queued
+    writes into the write_versions collection in one bulk write and reads back every
+    worker's totals. Tags therefore agree across workers once synced, and a worker sees
+    another worker's writes within about two sync intervals; until then it may answer 304
+    for a page that write changed. Its own writes change its tags immediately.
+    """
+
+    def __init__(self) -> None:
+        self._versions: Dict[str, int] = {}
+        self._pending: Dict[str, int] = {}
+        self._shared: Dict[str, int] = {}
+
+    def get(self, collection: str) -> int:
+        return self._versions.get(collection, 0)
+
+    def bump(self, collection: str) -> int:
+        self._versions[collection] = self._versions.get(collection, 0) + 1
+        return self._versions[collection]
+
+    def record(self, collection: str) -> None:
+        """bump() and queue the write for the next sync(); no I/O."""
+        self.bump(collection)
+        self._pending[collection] = self._pending.get(collection, 0) + 1
+
+    def tag(self, collections: Iterable[str]) -> str:
+        """Versions of `collections`: shared totals as of the last sync plus unsynced local writes."""
+        return ":".join(
+            f"{name}={self._shared.get(name, 0) + self._pending.get(name, 0)}"
+            for name in collections
+        )
+
+    async def sync(self, db: Any) -> None:
+        """Flush queued writes to the shared counters and read every worker's totals back."""
+        pending, self._pending = self._pending, {}
+        try:
+            if pending:
+                updates = [
+                    UpdateOne({"_id": name}, {"$inc": {"version": n}}, upsert=True)
+                    for name, n in pending.items()
+                ]
+                await db[WRITE_VERSIONS_COLLECTION].bulk_write(updates, ordered=False)
+            pending = {}
+            cursor = db[WRITE_VERSIONS_COLLECTION].find({})
+            shared = {doc["_id"]: doc.get("version", 0) async for doc in cursor}
+        except PyMongoError:
+            # Re-queue what was not flushed; writes recorded meanwhile are already queued
+            for name, n in pending.items():
+                self._pending[name] = self._pending.get(name, 0) + n
+            raise
+        self._shared = shared
+
+    async def sync_forever(self, db: Any, interval_seconds: float) -> None:
+        """sync() every interval_seconds until cancelled; failures are logged and retried."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.sync(db)
+            except PyMongoError as e:
+                logger.error(
+                    f"Could not sync write versions; ETags from other workers may lag: {e}"
+                )
+
+
+write_versions = WriteVersions()
@@ -24,9 +24,22 @@ class NotFoundError(Exception):
 
 class ValidationError(Exception):
     """Exception for custom validation errors"""
-    
+
     def __init__(self, field_name: str, error_message: str):
         self.field_name = field_name
         self.error_message = error_message
         message = f"Validation error for field '{field_name}': {error_message}"
         super().__init__(message)
+
+
+class VersionConflictError(Exception):
+    """Exception for optimistic concurrency failures (the stored version moved on)"""
+
+    def __init__(self, resource_type: str, identifier: str, expected_version: int):
+        self.resource_type = resource_type
+        self.identifier = identifier
+        self.expected_version = expected_version
+        message = (
+            f"{resource_type} '{identifier}' is no longer at version {expected_version}"
+        )
+        super().__init__(message)
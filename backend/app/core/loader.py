@@ -0,0 +1,77 @@
+"""Request-scoped batch loader: coalesces lookups made in the same event-loop tick."""
+
+import asyncio
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    TypeVar,
+)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """
+    Collects load(key) calls and resolves them with one batch_fn(keys) call per tick.
+
+    The first load() in a tick schedules a dispatch with loop.call_soon; every load() made
+    before that callback runs (sequential code up to its first real await, and sibling tasks
+    started with asyncio.gather) joins the same batch. Results are memoised per key, so a
+    repeated key costs nothing. Meant to live for one request: create one per request and
+    drop it afterwards. batch_fn returns a map; keys missing from it resolve to None.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[K]], Awaitable[Dict[K, V]]]) -> None:
+        self._batch_fn = batch_fn
+        self._futures: Dict[K, "asyncio.Future[Optional[V]]"] = {}
+        self._queue: List[K] = []
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    async def load(self, key: K) -> Optional[V]:
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._futures[key] = future
+            self._queue.append(key)
+            if len(self._queue) == 1:
+                loop.call_soon(self._dispatch)
+        # Shielded: one cancelled caller must not cancel the result others are waiting for
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[K]) -> Dict[K, V]:
+        """Map of each key that resolved to a value (None results are left out)."""
+        keys = list(dict.fromkeys(keys))
+        values = await asyncio.gather(*(self.load(key) for key in keys))
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        task = asyncio.get_running_loop().create_task(self._resolve(keys))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, keys: List[K]) -> None:
+        try:
+            results = await self._batch_fn(keys)
+        except Exception as e:
+            for key in keys:
+                # Not memoised: a later load retries the lookup
+                future = self._futures.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+                    # Awaiters re-raise it; retrieving here avoids "never retrieved" warnings
+                    future.exception()
+            return
+        for key in keys:
+            future = self._futures[key]
+            if not future.done():
+                future.set_result(results.get(key))
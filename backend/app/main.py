@@ -1,4 +1,5 @@
 from contextlib import asynccontextmanager
+import asyncio
 import time
 from datetime import datetime, timezone
 from fastapi import FastAPI
@@ -6,7 +7,20 @@ from fastapi.responses import JSONResponse
 
 from app.config.settings import settings
 from app.config.logging_config import get_logger
-from app.config.database import connect_to_mongo, close_mongo_connection, check_database_health
+from app.config.database import (
+    connect_to_mongo,
+    close_mongo_connection,
+    check_database_health,
+    get_database,
+)
+from app.core.cache import write_versions
+from app.services.employee import employee_repository
+from app.services.department import department_repository
+from app.services.attendance_archive import attendance_archive
+from app.services.attendance_buckets import bucket_layout
+from app.services.attendance_monthly import attendance_monthly_repository
+from app.services.employee_directory import employee_directory
+from app.services.employee_suggest import employee_suggest_index
 from app.api.v1.router import api_router
 from app.middleware import (
     add_exception_handlers,
@@ -29,38 +43,130 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting HRMS Lite API...")
     startup_successful = False
-    
+
     try:
         # Connect to MongoDB
         await connect_to_mongo()
         logger.info("Successfully connected to MongoDB")
-        
+
+        # Employees stored before is_active existed would be invisible to every query
+        try:
+            backfilled = await employee_repository.backfill_active_flag(
+                await get_database()
+            )
+            if backfilled:
+                logger.info(f"Set is_active on {backfilled} employees")
+        except Exception as backfill_error:
+            logger.warning(
+                f"Employee is_active backfill failed (non-critical): {backfill_error}"
+            )
+
+        # Employees seeded or stored before search existed have no search_keys to match
+        try:
+            indexed = await employee_repository.backfill_search_keys(
+                await get_database()
+            )
+            if indexed:
+                logger.info(f"Set search_keys on {indexed} employees")
+        except Exception as backfill_error:
+            logger.warning(
+                f"Employee search_keys backfill failed (non-critical): {backfill_error}"
+            )
+
+        # Optionally preload the employee directory so first requests skip MongoDB lookups
+        if settings.EMPLOYEE_DIRECTORY_WARM:
+            try:
+                loaded = await employee_repository.warm_directory(await get_database())
+                logger.info(f"Employee directory warmed with {loaded} employees")
+            except Exception as warm_error:
+                logger.warning(
+                    f"Employee directory warm-up failed (non-critical): {warm_error}"
+                )
+
+        # Seed department headcounts from employees on the first start after upgrading
+        try:
+            seeded = await department_repository.ensure_seeded(await get_database())
+            if seeded:
+                logger.info(f"Department counts seeded for {seeded} departments")
+        except Exception as seed_error:
+            logger.warning(
+                f"Department count seeding failed (non-critical): {seed_error}"
+            )
+
+        # Attendance rollups are only written while enabled: rebuild them on the first start
+        # with them enabled, and forget they were complete on any start with them disabled
+        if not bucket_layout():
+            try:
+                if settings.ATTENDANCE_ROLLUPS_ENABLED:
+                    rollups = await attendance_monthly_repository.ensure_seeded(
+                        await get_database(), attendance_archive.iter_month_counts()
+                    )
+                    if rollups:
+                        logger.info(
+                            f"Attendance rollups built with {rollups} documents"
+                        )
+                else:
+                    await attendance_monthly_repository.clear_seeded(
+                        await get_database()
+                    )
+            except Exception as rollup_error:
+                logger.warning(
+                    f"Attendance rollup build failed (non-critical): {rollup_error}"
+                )
+
+        # Build the in-memory typeahead index (otherwise built on the first suggest request)
+        try:
+            indexed = await employee_repository.load_suggest_index(await get_database())
+            logger.info(f"Employee suggest index built with {indexed} employees")
+        except Exception as index_error:
+            logger.warning(
+                f"Employee suggest index build failed (non-critical): {index_error}"
+            )
+
+        # Share write versions (ETags) with the other workers off the request path
+        try:
+            await write_versions.sync(await get_database())
+        except Exception as sync_error:
+            logger.warning(f"Write version sync failed (non-critical): {sync_error}")
+        write_versions_sync = asyncio.create_task(
+            write_versions.sync_forever(
+                await get_database(), settings.ETAG_SYNC_INTERVAL_SECONDS
+            )
+        )
+
         # Store start time for uptime calculation
         app.state.start_time = time.time()
         logger.info("Application start time recorded")
-        
+
         # Log application configuration
         logger.info(f"Application: {settings.PROJECT_NAME} v{settings.VERSION}")
-        
+
         startup_successful = True
         yield
-        
+
     except Exception as e:
         logger.error(f"Failed to start application: {e}")
         raise
-    
+
     # Shutdown (only if startup was successful)
     if startup_successful:
         logger.info("Shutting down HRMS Lite API...")
-        
+
+        write_versions_sync.cancel()
+        try:
+            # Flush this worker's last writes so the others' ETags change
+            await write_versions.sync(await get_database())
+        except Exception as e:
+            logger.warning(f"Final write version sync failed: {e}")
+
         try:
             # Close MongoDB connection
             await close_mongo_connection()
             logger.info("Successfully disconnected from MongoDB")
-            
+
         except Exception as e:
             logger.error(f"Error during shutdown: {e}")
-        
+
         logger.info("Application shutdown complete")
 
 
@@ -126,36 +232,40 @@ async def health_check():
         # Check database connectivity
         db_health = await check_database_health()
         database_status = db_health["status"]
-        
+
         # Calculate uptime
         uptime = time.time() - app.state.start_time if hasattr(app.state, 'start_time') else 0
-        
+
         health_status = {
             "status": "healthy" if database_status == "healthy" else "unhealthy",
             "timestamp": datetime.now(timezone.utc).isoformat() + "Z",
             "environment": settings.ENVIRONMENT,
             "database": database_status,
-            "uptime": round(uptime, 2)
+            "uptime": round(uptime, 2),
+            "caches": {
+                "employee_directory": employee_directory.stats(),
+                "employee_suggest": {"employees": len(employee_suggest_index)},
+            },
         }
-        
+
         # Return appropriate status code
         status_code = 200 if database_status == "healthy" else 503
-        
+
         return JSONResponse(
             content=health_status,
             status_code=status_code
         )
-        
+
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        
+
         error_response = {
             "status": "unhealthy",
             "timestamp": datetime.now(timezone.utc).isoformat() + "Z",
             "error": str(e),
             "database": "error"
         }
-        
+
         return JSONResponse(
             content=error_response,
             status_code=503
@@ -1,6 +1,7 @@
 """Domain models for the HRMS application."""
 
-from app.models.employee import EmployeeCreate, EmployeeInDB
+from app.models.employee import EmployeeCreate, EmployeeInDB, EmployeeUpdate
+from app.models.holiday import HolidayCreate, HolidayInDB
 from app.models.attendance import (
     AttendanceCreate,
     AttendanceInDB,
@@ -10,7 +11,10 @@ from app.models.attendance import (
 __all__ = [
     "EmployeeCreate",
     "EmployeeInDB",
+    "EmployeeUpdate",
     "AttendanceCreate",
     "AttendanceInDB",
     "AttendanceResponse",
+    "HolidayCreate",
+    "HolidayInDB",
 ]
@@ -5,6 +5,8 @@ from datetime import datetime, date
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 from bson import ObjectId
 
+AttendanceStatus = Literal["present", "absent", "half-day", "leave"]
+
 
 class AttendanceBase(BaseModel):
     """Fields shared by create and DB document. employee_id stored as ObjectId in DB, serialized as str in API."""
@@ -28,7 +30,7 @@ class AttendanceBase(BaseModel):
         return v
 
     date: date
-    status: Literal["present", "absent", "half-day", "leave"] = "present"
+    status: AttendanceStatus = "present"
     notes: Optional[str] = None
     marked_by: str = "Admin"
     marked_at: Optional[datetime] = None  # Set by server on create; optional on input
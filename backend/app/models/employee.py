@@ -1,10 +1,27 @@
 import re
 from typing import Optional
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict, Field, EmailStr, field_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    EmailStr,
+    field_validator,
+    model_validator,
+)
 from bson import ObjectId
 
 
+def _validate_email(v):
+    if not v:
+        raise ValueError("Email is required")
+    v = v.lower()
+    email_pattern = r"^[a-zA-Z0-9._%+-]+@(gmail\.com|yahoo\.com|outlook\.com|hotmail\.com|company\.com|org\.com|net\.com)$"
+    if not re.match(email_pattern, v):
+        raise ValueError("Invalid email format")
+    return v
+
+
 class EmployeeBase(BaseModel):
     """Base employee fields; accepts camelCase (employeeId, fullName) or snake_case from API."""
 
@@ -31,24 +48,67 @@ class EmployeeBase(BaseModel):
 
     @field_validator('email')
     def validate_email(cls, v):
-        if not v:
-            raise ValueError('Email is required')
-        v = v.lower()
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@(gmail\.com|yahoo\.com|outlook\.com|hotmail\.com|company\.com|org\.com|net\.com)$'
-        if not re.match(email_pattern, v):
-            raise ValueError('Invalid email format')
-        return v
+        return _validate_email(v)
 
 
 class EmployeeCreate(EmployeeBase):
     pass
 
 
+class EmployeeUpdate(BaseModel):
+    """Partial update (PATCH): only the fields sent are validated and written; the ID is fixed."""
+
+    model_config = ConfigDict(populate_by_name=True, extra="forbid")
+
+    full_name: Optional[str] = Field(
+        None,
+        alias="fullName",
+        min_length=2,
+        max_length=100,
+        description="Employee full name",
+    )
+    email: Optional[EmailStr] = Field(None, description="Employee email address")
+    department: Optional[str] = Field(
+        None, min_length=1, description="Employee department"
+    )
+    position: Optional[str] = Field(None, description="Job position (null clears it)")
+    status: Optional[str] = Field(None, description="Employee status")
+    version: Optional[int] = Field(
+        None,
+        ge=0,
+        description="Expected current version (optimistic concurrency; If-Match also works)",
+    )
+
+    @field_validator("email")
+    def validate_email(cls, v):
+        return _validate_email(v) if v is not None else v
+
+    @model_validator(mode="after")
+    def required_fields_not_null(self):
+        for name in ("full_name", "email", "department", "status"):
+            if name in self.model_fields_set and getattr(self, name) is None:
+                raise ValueError(f"{name} cannot be null")
+        return self
+
+    def changes(self):
+        """Fields to $set: those sent in the request, minus the version precondition."""
+        return self.model_dump(exclude_unset=True, exclude={"version"})
+
+
 class EmployeeInDB(EmployeeBase):
     model_config = ConfigDict(populate_by_name=True)
 
     id: str = Field(..., alias="_id", description="MongoDB document ID")
     deleted_at: Optional[datetime] = Field(None, description="Set when employee is soft-deleted")
+    is_active: bool = Field(
+        True,
+        description="False once soft-deleted; the partial indexes cover active employees only",
+    )
+    version: int = Field(
+        0,
+        ge=0,
+        description="Incremented by every update; 0 for employees stored before versioning",
+    )
 
     @field_validator("id", mode="before")
     @classmethod
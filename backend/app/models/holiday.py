@@ -0,0 +1,52 @@
+"""Holiday calendar domain models. A calendar is a region or office code (e.g. "default", "IN-BLR")."""
+
+from datetime import date, datetime
+from typing import Optional
+
+from bson import ObjectId
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+
+class HolidayBase(BaseModel):
+    """Fields shared by create and DB document."""
+
+    calendar: str = Field(
+        "default", min_length=1, max_length=50, description="Region or office code"
+    )
+    date: date
+    name: str = Field(..., min_length=1, max_length=100, description="Holiday name")
+
+    @field_validator("calendar")
+    @classmethod
+    def normalize_calendar(cls, v: str) -> str:
+        return v.strip()
+
+    @field_validator("date", mode="before")
+    @classmethod
+    def date_from_datetime(cls, v):
+        """Accept datetime from MongoDB and coerce to date for API."""
+        if isinstance(v, datetime):
+            return v.date()
+        return v
+
+
+class HolidayCreate(HolidayBase):
+    """Request body for adding a holiday."""
+
+    pass
+
+
+class HolidayInDB(HolidayBase):
+    """Holiday as stored and returned. id maps from MongoDB _id."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: str = Field(..., alias="_id", description="MongoDB document ID")
+    created_at: Optional[datetime] = None
+
+    @field_validator("id", mode="before")
+    @classmethod
+    def objectid_to_str(cls, v):  # noqa: N805
+        if isinstance(v, ObjectId):
+            return str(v)
+        return v
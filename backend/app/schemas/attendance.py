@@ -1,15 +1,72 @@
 """API response schemas for attendance. Domain models live in app.models.attendance."""
 
-from typing import List
-from pydantic import BaseModel
+from datetime import date, datetime
+from typing import Any, Dict, List, Literal, Optional, Sequence
+from pydantic import BaseModel, Field
+
+from app.models.attendance import AttendanceCreate
+
+# Fields a list request may ask for with fields=; the default matches what the table shows
+ATTENDANCE_LIST_FIELDS = (
+    "id",
+    "employee_id",
+    "date",
+    "status",
+    "notes",
+    "marked_by",
+    "marked_at",
+)
+ATTENDANCE_LIST_DEFAULT_FIELDS = ("id", "date", "status")
 
 
 class AttendanceListItem(BaseModel):
-    """Single attendance row for list API; frontend displays as-is (id, date, status)."""
+    """Single attendance row for list API; frontend displays as-is (id, date, status).
+
+    With fields= only the requested attributes are set (and serialised).
+    """
 
     id: str
-    date: str  # ISO date string for display
-    status: str
+    date: Optional[str] = None  # ISO date string for display
+    status: Optional[str] = None
+    employee_id: Optional[str] = None
+    notes: Optional[str] = None
+    marked_by: Optional[str] = None
+    marked_at: Optional[datetime] = None
+    # Set only with include=employee (same names as AttendanceResponse)
+    employee_name: Optional[str] = None
+    employee_department: Optional[str] = None
+    employee_position: Optional[str] = None
+
+    def with_employee(self, profile: Optional[Dict[str, Any]]) -> "AttendanceListItem":
+        """Copy in the joined employee fields (all None when the employee no longer exists)."""
+        profile = profile or {}
+        self.employee_name = profile.get("full_name")
+        self.employee_department = profile.get("department")
+        self.employee_position = profile.get("position")
+        return self
+
+    @classmethod
+    def from_document(
+        cls, doc: Dict[str, Any], fields: Sequence[str]
+    ) -> "AttendanceListItem":
+        """Build an item straight from a projected MongoDB document, setting only `fields`."""
+        values: Dict[str, Any] = {"id": str(doc["_id"])}
+        for field in fields:
+            if field == "id":
+                continue
+            value = doc.get(field)
+            if field == "date" and isinstance(value, (datetime, date)):
+                value = (
+                    value.date().isoformat()
+                    if isinstance(value, datetime)
+                    else value.isoformat()
+                )
+            elif field == "status":
+                value = value or "present"
+            elif field == "employee_id" and value is not None:
+                value = str(value)
+            values[field] = value
+        return cls(**values)
 
     @classmethod
     def from_attendance(cls, att: object) -> "AttendanceListItem":
@@ -24,12 +81,18 @@ class AttendanceListItem(BaseModel):
 
 
 class AttendanceListResponse(BaseModel):
-    """Paginated list of attendance records. data is display-ready for the table."""
+    """Paginated list of attendance records. data is display-ready for the table.
 
-    total: int
-    page: int
+    Offset mode fills total/page/total_pages; cursor mode fills has_more and the cursors.
+    """
+
+    total: Optional[int] = None
+    page: Optional[int] = None
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    has_more: Optional[bool] = None
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
     data: List[AttendanceListItem]
 
 
@@ -44,3 +107,59 @@ class EmployeeAttendanceStatsResponse(BaseModel):
     attendance_rate: float
 
 
+class EmployeeAttendanceStatsItem(EmployeeAttendanceStatsResponse):
+    """Stats for one employee within a batch; employee_id is the identifier as requested."""
+
+    employee_id: str
+
+
+class EmployeeAttendanceStatsBatchResponse(BaseModel):
+    """Stats for many employees over one date range (single aggregation)."""
+
+    start_date: date
+    end_date: date
+    total_days: int
+    data: List[EmployeeAttendanceStatsItem]
+    not_found: List[str] = Field(default_factory=list)
+
+
+class AttendanceBulkCreate(BaseModel):
+    """Request body for marking many attendance records in one call."""
+
+    records: List[AttendanceCreate] = Field(..., min_length=1, max_length=5000)
+
+
+class AttendanceBulkItemResult(BaseModel):
+    """Outcome for one record of a bulk mark, in request order."""
+
+    index: int
+    employee_id: str
+    date: date
+    status: Literal["created", "duplicate", "error"]
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class AttendanceBulkResponse(BaseModel):
+    """Summary and per-item results of a bulk mark."""
+
+    total: int
+    created: int
+    failed: int
+    results: List[AttendanceBulkItemResult]
+
+
+class AttendanceMatrixResponse(BaseModel):
+    """
+    Packed employee × day status grid for one month.
+
+    rows[i] belongs to employees[i]: base64 of little-endian bytes where day d (0-based)
+    occupies bits [bits_per_day*d, bits_per_day*(d+1)) and holds a code from `codes`.
+    """
+
+    month: str = Field(..., description="YYYY-MM")
+    days: int = Field(..., ge=28, le=31)
+    bits_per_day: int
+    codes: Dict[str, int] = Field(..., description="Status -> code; 0 means no record")
+    employees: List[str] = Field(..., description="Employee codes, row order")
+    rows: List[str] = Field(..., description="Base64 packed day statuses per employee")
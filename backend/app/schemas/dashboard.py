@@ -0,0 +1,44 @@
+"""Response schemas for dashboard API endpoints."""
+
+from datetime import date, datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class DepartmentDaySummary(BaseModel):
+    """Headcount and attendance status counts for one department on one day."""
+
+    department: Optional[str] = None
+    headcount: int = Field(..., ge=0)
+    present: int = 0
+    absent: int = 0
+    half_day: int = 0
+    leave: int = 0
+    marked: int = 0
+    unmarked: int = 0
+
+
+class DashboardSummaryResponse(BaseModel):
+    """Organisation-wide attendance summary for one day."""
+
+    date: date
+    headcount: int = Field(..., ge=0, description="Active employees")
+    present: int = 0
+    absent: int = 0
+    half_day: int = 0
+    leave: int = 0
+    marked: int = Field(0, description="Active employees with a record for the day")
+    unmarked: int = Field(
+        0, description="Active employees without a record for the day"
+    )
+    departments: List[DepartmentDaySummary] = Field(default_factory=list)
+    generated_at: datetime = Field(
+        ..., description="When the summary was computed (may be cached)"
+    )
+
+
+__all__ = [
+    "DepartmentDaySummary",
+    "DashboardSummaryResponse",
+]
@@ -0,0 +1,28 @@
+"""Response schemas for department endpoints."""
+
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class DepartmentCount(BaseModel):
+    """Active headcount of one department."""
+
+    name: str
+    active_count: int = Field(
+        ..., ge=0, description="Employees in the department that are not soft-deleted"
+    )
+
+
+class DepartmentListResponse(BaseModel):
+    """Department facet: every department with its active headcount, by name."""
+
+    total: int = Field(..., ge=0, description="Number of departments returned")
+    total_employees: int = Field(..., ge=0, description="Sum of active headcounts")
+    data: List[DepartmentCount]
+
+
+__all__ = [
+    "DepartmentCount",
+    "DepartmentListResponse",
+]
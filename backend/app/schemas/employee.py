@@ -1,20 +1,102 @@
 """Response schemas for employee API endpoints."""
 
-from typing import List
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
 from pydantic import BaseModel, Field
-from app.models.employee import EmployeeInDB
+
+# Fields a list request may ask for with fields=; the default is the full employee
+EMPLOYEE_LIST_FIELDS = (
+    "id",
+    "employee_id",
+    "full_name",
+    "email",
+    "department",
+    "position",
+    "status",
+    "deleted_at",
+)
+
+
+class EmployeeListItem(BaseModel):
+    """Employee row for list endpoints, built from a projected document; only requested fields are set."""
+
+    id: str
+    employee_id: Optional[str] = None
+    full_name: Optional[str] = None
+    email: Optional[str] = None
+    department: Optional[str] = None
+    position: Optional[str] = None
+    status: Optional[str] = None
+    deleted_at: Optional[datetime] = None
+
+    @classmethod
+    def from_document(
+        cls, doc: Dict[str, Any], fields: Sequence[str]
+    ) -> "EmployeeListItem":
+        values = {f: doc.get(f) for f in fields if f != "id"}
+        if "status" in values:
+            values["status"] = values["status"] or "active"
+        return cls(id=str(doc["_id"]), **values)
 
 
 class EmployeeListResponse(BaseModel):
-    """Paginated list of employees."""
+    """Paginated list of employees (offset pages, or keyset pages when cursors are used)."""
 
-    total: int = Field(..., ge=0, description="Total count of employees")
-    page: int = Field(..., ge=1, description="Current page number")
+    total: Optional[int] = Field(
+        None, ge=0, description="Total count of employees (offset mode)"
+    )
+    page: Optional[int] = Field(
+        None, ge=1, description="Current page number (offset mode)"
+    )
     page_size: int = Field(..., ge=1, le=100, description="Items per page")
-    total_pages: int = Field(..., ge=0, description="Total number of pages")
-    data: List[EmployeeInDB] = Field(..., description="List of employees")
+    total_pages: Optional[int] = Field(
+        None, ge=0, description="Total number of pages (offset mode)"
+    )
+    has_more: Optional[bool] = Field(None, description="Whether a next page exists")
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as `after` for the next page"
+    )
+    prev_cursor: Optional[str] = Field(
+        None, description="Pass as `before` for the previous page"
+    )
+    data: List[EmployeeListItem] = Field(..., description="List of employees")
+
+
+class EmployeeSuggestion(BaseModel):
+    """Typeahead match served from the in-memory suggest index."""
+
+    id: str
+    employee_id: Optional[str] = None
+    full_name: Optional[str] = None
+    email: Optional[str] = None
+    department: Optional[str] = None
+    position: Optional[str] = None
+
+
+class EmployeeImportRowError(BaseModel):
+    """Why one uploaded row was not imported."""
+
+    row: int = Field(..., ge=1, description="1-based data row number in the upload")
+    employee_id: Optional[str] = Field(
+        None, description="Employee ID from the row, if readable"
+    )
+    errors: List[str] = Field(
+        ..., description="Validation or duplicate errors for the row"
+    )
+
+
+class EmployeeImportResponse(BaseModel):
+    """Outcome of a bulk employee import."""
+
+    total: int = Field(..., ge=0, description="Rows read from the upload")
+    created: int = Field(..., ge=0, description="Employees created")
+    failed: int = Field(..., ge=0, description="Rows rejected")
+    errors: List[EmployeeImportRowError] = Field(default_factory=list)
 
 
 __all__ = [
     "EmployeeListResponse",
+    "EmployeeSuggestion",
+    "EmployeeImportRowError",
+    "EmployeeImportResponse",
 ]
@@ -0,0 +1,31 @@
+"""Response schemas for holiday calendar endpoints."""
+
+from datetime import date
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from app.models.holiday import HolidayInDB
+
+
+class HolidayListResponse(BaseModel):
+    """Holidays of one calendar, sorted by date."""
+
+    calendar: str
+    total: int = Field(..., ge=0)
+    data: List[HolidayInDB]
+
+
+class WorkingDaysResponse(BaseModel):
+    """Working days (weekdays minus calendar holidays) in a date range."""
+
+    calendar: str
+    start_date: date
+    end_date: date
+    working_days: int = Field(..., ge=0)
+
+
+__all__ = [
+    "HolidayListResponse",
+    "WorkingDaysResponse",
+]
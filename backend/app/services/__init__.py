@@ -3,9 +3,19 @@
 from app.services.base import BaseRepository
 from app.services.employee import employee_repository
 from app.services.attendance import attendance_repository
+from app.services.attendance_monthly import attendance_monthly_repository
+from app.services.dashboard import dashboard_service
+from app.services.department import department_repository
+from app.services.holiday import holiday_repository
+from app.services.working_days import working_day_calculator
 
 __all__ = [
     "BaseRepository",
     "employee_repository",
     "attendance_repository",
+    "attendance_monthly_repository",
+    "dashboard_service",
+    "department_repository",
+    "holiday_repository",
+    "working_day_calculator",
 ]
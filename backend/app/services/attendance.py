@@ -1,12 +1,34 @@
 import logging
-from typing import Optional, List, Dict, Any, Type, Union
-from datetime import date, datetime, timezone
+from calendar import monthrange
+from typing import Optional, List, Dict, Any, Sequence, Tuple, Type, Union
+from datetime import date, datetime, timedelta, timezone
 from bson import ObjectId
 from bson.errors import InvalidId
-from pymongo.errors import PyMongoError
-from app.services.base import BaseRepository
-from app.models.attendance import AttendanceInDB
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
+from app.services.base import (
+    BaseRepository,
+    CountMode,
+    DUPLICATE_KEY_ERROR_CODE,
+    as_stored,
+)
+from app.models.attendance import AttendanceCreate, AttendanceInDB
 from app.services.employee import employee_repository
+from app.services.employee_loader import EmployeeLoader
+from app.services.attendance_archive import attendance_archive, row_key
+from app.services.attendance_buckets import (
+    attendance_bucket_repository,
+    bucket_layout,
+    rows_source,
+)
+from app.services.attendance_keys import attendance_key_repository
+from app.services.attendance_monthly import (
+    attendance_monthly_repository,
+    month_start,
+    split_whole_months,
+)
+from app.services.dashboard import dashboard_service
+from app.services.working_days import working_day_calculator
+from app.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -22,11 +44,54 @@ def _is_objectid(s: str) -> bool:
         return False
 
 
-def _normalize_employee_id_for_filter(employee_id: str) -> Union[ObjectId, str]:
-    """Return ObjectId or str for MongoDB filter; DB stores employee_id as ObjectId."""
-    if _is_objectid(employee_id):
-        return ObjectId(employee_id)
-    return employee_id.upper()
+async def _employee_oid(
+    db: Any, identifier: str, loader: Optional[EmployeeLoader], for_write: bool = False
+) -> Optional[ObjectId]:
+    """
+    Active employee's _id via the request's loader when given, else a one-off resolve_oids.
+    for_write skips the directory so a record never lands on a deleted employee or a code's
+    previous owner.
+    """
+    if loader is not None:
+        return await (
+            loader.active_oid(identifier) if for_write else loader.oid(identifier)
+        )
+    resolved = await employee_repository.resolve_oids(
+        db, [identifier], cached=not for_write
+    )
+    return resolved.get(identifier)
+
+
+def _projected(
+    row: Dict[str, Any], projection: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """An archived row cut down to an inclusion projection, as MongoDB would return it."""
+    if projection is None:
+        return row
+    return {k: v for k, v in row.items() if projection.get(k, 1 if k == "_id" else 0)}
+
+
+# 3-bit status codes for the packed month matrix; 0 = no record for the day
+MATRIX_STATUS_CODES = {"present": 1, "absent": 2, "half-day": 3, "leave": 4}
+MATRIX_BITS_PER_DAY = 3
+
+
+def pack_month_row(day_codes: Dict[int, int], days: int) -> bytes:
+    """Pack {day_index: code} into little-endian bytes; day d uses bits [3d, 3d+3)."""
+    acc = 0
+    for day_index, code in day_codes.items():
+        acc |= code << (MATRIX_BITS_PER_DAY * day_index)
+    return acc.to_bytes((days * MATRIX_BITS_PER_DAY + 7) // 8, "little")
+
+
+def _add_counts(
+    counts: Dict[ObjectId, Dict[str, int]], more: Dict[ObjectId, Dict[str, int]]
+) -> None:
+    """Add per-employee {status: count} from more into counts, in place."""
+    for oid, by_status_more in more.items():
+        by_status = counts.setdefault(oid, {})
+        for status, n in by_status_more.items():
+            by_status[status] = by_status.get(status, 0) + n
 
 
 def _date_range_bounds(start_date: date, end_date: date) -> tuple:
@@ -37,139 +102,567 @@ def _date_range_bounds(start_date: date, end_date: date) -> tuple:
     )
 
 
+# List order for offset and cursor pages: date with an _id tiebreak so equal dates page
+# deterministically; every index in build_list_filter's docstring yields it directly
+LIST_SORT = [("date", 1), ("_id", 1)]
+
+
+def list_sort(direction: int = 1) -> List[tuple]:
+    """LIST_SORT in the given direction (1 oldest first, -1 newest first)."""
+    return [(field, direction) for field, _ in LIST_SORT]
+
+
 class AttendanceRepository(BaseRepository[AttendanceInDB]):
+    """
+    Attendance in either ATTENDANCE_LAYOUT. Reads are written against daily rows
+    ({employee_id, date, status, ...}); in the bucket layout they run over
+    attendance_buckets through an unwinding pipeline (attendance_buckets.rows_source),
+    so callers and the API never see which layout is stored.
+    """
+
     def __init__(self) -> None:
         super().__init__(collection_name="attendance")
-    
+
     @property
     def model_class(self) -> Type[AttendanceInDB]:
         return AttendanceInDB
 
-    async def check_attendance_exists(self, db: Any, employee_id: str, att_date: date) -> bool:
+    async def _find(
+        self,
+        db: Any,
+        filter_query: Dict[str, Any],
+        projection: Optional[Dict[str, Any]],
+        sort_query: List[tuple],
+        skip: int,
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        if not bucket_layout():
+            return await super()._find(
+                db, filter_query, projection, sort_query, skip, limit
+            )
+        collection, pipeline = rows_source(filter_query)
+        pipeline += [{"$sort": dict(sort_query)}, {"$skip": skip}, {"$limit": limit}]
+        if projection:
+            pipeline.append({"$project": projection})
+        return await db[collection].aggregate(pipeline).to_list(length=limit)
+
+    async def count(
+        self, db: Any, filter_query: Optional[Dict[str, Any]] = None
+    ) -> int:
+        if not bucket_layout():
+            return await super().count(db, filter_query)
+        collection, pipeline = rows_source(filter_query or {})
         try:
-            start_dt, end_dt = _date_range_bounds(att_date, att_date)
-            filter_query = {
-                "employee_id": _normalize_employee_id_for_filter(employee_id),
-                "date": {"$gte": start_dt, "$lte": end_dt},
-            }
-            return await self.exists(db, filter_query)
-        except Exception as e:
-            logger.error(f"Error checking attendance existence: {e}")
+            result = (
+                await db[collection]
+                .aggregate(pipeline + [{"$count": "n"}])
+                .to_list(length=1)
+            )
+            return result[0]["n"] if result else 0
+        except PyMongoError as e:
+            logger.error(f"Error counting attendance buckets: {e}")
             raise
 
-    async def get_by_employee(self, db: Any, employee_id: str, skip: int = 0, limit: int = 100) -> List[AttendanceInDB]:
+    def _source(self, filter_query: Dict[str, Any]) -> Tuple[str, List[Dict[str, Any]]]:
+        return rows_source(filter_query)
+
+    async def _estimated_count(
+        self, db: Any, filter_query: Dict[str, Any]
+    ) -> Optional[int]:
+        # Buckets hold a month of rows each, so their collection count is no estimate
+        if bucket_layout():
+            return None
+        return await super()._estimated_count(db, filter_query)
+
+    async def exists(self, db: Any, filter_query: Dict[str, Any]) -> bool:
+        if not bucket_layout():
+            return await super().exists(db, filter_query)
+        collection, pipeline = rows_source(filter_query)
         try:
-            filter_query = {"employee_id": _normalize_employee_id_for_filter(employee_id)}
-            sort_query = [("date", 1)]  # ascending: 1st, 2nd, 3rd... of month
-            return await self.get_multi(db, skip=skip, limit=limit, filter_query=filter_query, sort_query=sort_query)
-        except Exception as e:
-            logger.error(f"Error getting attendance for employee {employee_id}: {e}")
+            return bool(
+                await db[collection]
+                .aggregate(pipeline + [{"$limit": 1}])
+                .to_list(length=1)
+            )
+        except PyMongoError as e:
+            logger.error(f"Error checking attendance bucket existence: {e}")
             raise
 
-    async def get_by_date_range(self, db: Any, start_date: date, end_date: date, employee_id: Optional[str] = None, skip: int = 0, limit: int = 100) -> List[AttendanceInDB]:
+    # ---- archived months in list reads ---------------------------------------
+    # Archived months are closed and older than every live month, so in LIST_SORT order
+    # the archive is a prefix of the live rows (a suffix when descending): pages read one
+    # side and continue into the other instead of merging.
+
+    async def _archived_rows(
+        self,
+        filter_query: Dict[str, Any],
+        projection: Optional[Dict[str, Any]],
+        descending: bool,
+        skip: int,
+        limit: int,
+        position: Optional[Tuple[Any, ObjectId]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Up to `limit` archived rows in list order, past `skip` rows or the keyset `position`."""
+        rows: List[Dict[str, Any]] = []
+        if limit <= 0:
+            return rows
+        if position is not None:
+            if not isinstance(position[0], datetime):
+                raise ValueError("Invalid pagination cursor for attendance")
+            # Narrow the date range to the cursor so earlier months are not read at all
+            bound, pick = ("$lte", min) if descending else ("$gte", max)
+            date_range = dict(filter_query.get("date") or {})
+            date_range[bound] = (
+                pick(date_range[bound], position[0])
+                if bound in date_range
+                else position[0]
+            )
+            filter_query = {**filter_query, "date": date_range}
+        async for row in attendance_archive.iter_matching(filter_query, descending):
+            if position is not None and (
+                row_key(row) >= position if descending else row_key(row) <= position
+            ):
+                continue
+            if skip:
+                skip -= 1
+                continue
+            rows.append(_projected(row, projection))
+            if len(rows) == limit:
+                break
+        return rows
+
+    async def _live_total(
+        self, db: Any, filter_query: Dict[str, Any], count: CountMode
+    ) -> int:
+        if count == "estimated":
+            return await self.estimated_count(db, filter_query)
+        if count == "cached":
+            return await self.cached_count(db, filter_query)
+        return await self.count(db, filter_query)
+
+    async def get_page(
+        self,
+        db: Any,
+        skip: int = 0,
+        limit: int = 100,
+        filter_query: Optional[Dict[str, Any]] = None,
+        sort_query: Optional[List[tuple]] = None,
+        projection: Optional[Dict[str, Any]] = None,
+        count: CountMode = "exact",
+    ) -> Tuple[List[Any], Optional[int], bool]:
+        """
+        BaseRepository.get_page over live and archived rows. Filters that reach no archived
+        month take the base path unchanged; otherwise the page must be in LIST_SORT order
+        (either direction) and its total adds the archive's index counts to the live total.
+        """
+        filter_query = filter_query or {}
+        if not attendance_archive.months_matching(filter_query):
+            return await super().get_page(
+                db, skip, limit, filter_query, sort_query, projection, count
+            )
+        if [field for field, _ in sort_query or []] != [
+            field for field, _ in LIST_SORT
+        ]:
+            raise ValueError("Archived attendance can only be listed by date")
+        descending = sort_query[0][1] == -1
+        wanted = limit + 1 if count == "none" else limit
+
+        async def live(skip_: int, limit_: int) -> List[Dict[str, Any]]:
+            # limit 0 means "no limit" to MongoDB
+            if limit_ <= 0:
+                return []
+            return await self._find(
+                db, filter_query, projection, sort_query, skip_, limit_
+            )
+
+        async def archived(skip_: int, limit_: int) -> List[Dict[str, Any]]:
+            return await self._archived_rows(
+                filter_query, projection, descending, skip_, limit_
+            )
+
         try:
-            start_dt, end_dt = _date_range_bounds(start_date, end_date)
-            filter_query = {"date": {"$gte": start_dt, "$lte": end_dt}}
-            if employee_id:
-                filter_query["employee_id"] = _normalize_employee_id_for_filter(employee_id)
-            sort_query = [("date", 1)]  # ascending: 1st, 2nd, 3rd... of month
-            return await self.get_multi(db, skip=skip, limit=limit, filter_query=filter_query, sort_query=sort_query)
-        except Exception as e:
-            logger.error(f"Error getting attendance by date range: {e}")
+            first, second = (live, archived) if descending else (archived, live)
+            documents = await first(skip, wanted)
+            if len(documents) < wanted:
+                if documents:
+                    second_skip = 0
+                elif descending:
+                    second_skip = max(skip - await self.count(db, filter_query), 0)
+                else:
+                    second_skip = max(
+                        skip - await attendance_archive.count_matching(filter_query), 0
+                    )
+                documents += await second(second_skip, wanted - len(documents))
+
+            total: Optional[int] = None
+            if count != "none":
+                total = await self._live_total(
+                    db, filter_query, count
+                ) + await attendance_archive.count_matching(filter_query)
+        except PyMongoError as e:
+            logger.error(f"Error getting attendance page with archived months: {e}")
             raise
 
+        if total is None:
+            has_more = len(documents) > limit
+            documents = documents[:limit]
+        else:
+            has_more = skip + len(documents) < total
+        if projection is None:
+            documents = [self.model_class(**doc) for doc in documents]
+        return documents, total, has_more
+
+    async def _find_keyset(
+        self,
+        db: Any,
+        filter_query: Dict[str, Any],
+        projection: Optional[Dict[str, Any]],
+        sort_field: str,
+        direction: int,
+        position: Optional[Tuple[Any, ObjectId]],
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """Keyset rows across live and archived months (cursor pages in LIST_SORT order)."""
+        if not attendance_archive.months_matching(filter_query):
+            return await super()._find_keyset(
+                db, filter_query, projection, sort_field, direction, position, limit
+            )
+        if sort_field != "date":
+            raise ValueError("Archived attendance can only be listed by date")
+        descending = direction == -1
+
+        async def live(limit_: int) -> List[Dict[str, Any]]:
+            if limit_ <= 0:
+                return []
+            return await super(AttendanceRepository, self)._find_keyset(
+                db, filter_query, projection, sort_field, direction, position, limit_
+            )
+
+        if descending:
+            documents = await live(limit)
+            documents += await self._archived_rows(
+                filter_query, projection, True, 0, limit - len(documents), position
+            )
+        else:
+            documents = await self._archived_rows(
+                filter_query, projection, False, 0, limit, position
+            )
+            documents += await live(limit - len(documents))
+        return documents
+
     @staticmethod
-    def _working_days_in_range(start_date: date, end_date: date) -> int:
-        """Count weekdays (Mon–Fri) between start_date and end_date inclusive."""
-        from datetime import timedelta
-        count = 0
-        d = start_date
-        while d <= end_date:
-            if d.weekday() < 5:  # 0=Mon .. 4=Fri
-                count += 1
-            d += timedelta(days=1)
-        return count
-
-    async def resolve_employee_oid(self, db: Any, employee_id: str) -> ObjectId:
+    def build_list_filter(
+        employee_oids: Union[ObjectId, Sequence[ObjectId], None] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        statuses: Union[str, Sequence[str], None] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build the MongoDB filter for list/export from any combination of filters.
+
+        Each of employee_oids and statuses may be a single value or a sequence (one value
+        becomes an equality, several an $in); either date bound may be given alone.
+        Paired with LIST_SORT in either direction, every combination is served by
+        employee_date_id_index, status_date_id_index or date_id_index without an in-memory
+        sort (tests/test_attendance_query_plans.py checks this).
+        """
+        filter_query: Dict[str, Any] = {}
+        for field, values in (("employee_id", employee_oids), ("status", statuses)):
+            if values is None:
+                continue
+            if isinstance(values, (ObjectId, str)):
+                values = [values]
+            values = list(dict.fromkeys(values))
+            filter_query[field] = values[0] if len(values) == 1 else {"$in": values}
+        date_range: Dict[str, datetime] = {}
+        if start_date:
+            date_range["$gte"] = datetime.combine(start_date, datetime.min.time())
+        if end_date:
+            date_range["$lte"] = datetime.combine(end_date, datetime.max.time())
+        if date_range:
+            filter_query["date"] = date_range
+        return filter_query
+
+    async def resolve_employee_oid(
+        self, db: Any, employee_id: str, loader: Optional[EmployeeLoader] = None
+    ) -> ObjectId:
         """Resolve employee_id (MongoDB _id string or employee code) to ObjectId used in attendance collection."""
         if _is_objectid(employee_id):
             return ObjectId(employee_id)
-        employee = await employee_repository.get_by_employee_id(db, employee_id)
-        if not employee:
+        # Codes resolve through the employee directory cache (one $in on a miss)
+        emp_oid = await _employee_oid(db, employee_id, loader)
+        if emp_oid is None:
             raise ValueError(f"Employee {employee_id} not found")
-        return ObjectId(employee.id)
+        return emp_oid
+
+    @staticmethod
+    def _stats_from_counts(counts: Dict[str, int], total_days: int) -> Dict[str, Any]:
+        """
+        Build the stats payload from per-status counts.
+
+        Rate: effective_present (present=1, half-day=0.5) / total_days. Alternative:
+        denominator = total_recorded (present+absent+half_days+leave_days) if you
+        prefer "rate among days with a record" instead of "rate vs expected working days".
+        """
+        present_days = counts.get("present", 0)
+        half_days = counts.get("half-day", 0)
+        effective_present = present_days + 0.5 * half_days
+        attendance_rate = (
+            round((effective_present / total_days) * 100, 2)
+            if total_days and total_days > 0
+            else 0.0
+        )
+        return {
+            "total_days": total_days,
+            "present_days": present_days,
+            "absent_days": counts.get("absent", 0),
+            "half_days": half_days,
+            "leave_days": counts.get("leave", 0),
+            "attendance_rate": attendance_rate,
+        }
+
+    async def _count_by_status(
+        self, db: Any, employee_oids: List[ObjectId], start_date: date, end_date: date
+    ) -> Dict[ObjectId, Dict[str, int]]:
+        """
+        Per-employee {status: count} in range. Whole calendar months come from the
+        attendance_monthly rollups (when enabled) or, in the bucket layout, from the
+        buckets' own counters and the archive index for archived months; only partial
+        edge months hit raw rows, read from MongoDB plus the archive.
+        """
+        counts: Dict[ObjectId, Dict[str, int]] = {oid: {} for oid in employee_oids}
+        if settings.ATTENDANCE_ROLLUPS_ENABLED or bucket_layout():
+            months, raw_ranges = split_whole_months(start_date, end_date)
+        else:
+            months, raw_ranges = None, [(start_date, end_date)]
+        if months and bucket_layout():
+            # Archiving deletes a month's buckets, so archived months (always the oldest)
+            # are counted from the archive index and the bucket counters cover the rest.
+            first_month, last_month = months
+            live_month = first_month
+            while live_month <= last_month and attendance_archive.is_archived(
+                live_month.date()
+            ):
+                live_month = month_start(live_month + timedelta(days=32))
+            if live_month > first_month:
+                archived = await attendance_archive.count_by_status(
+                    employee_oids,
+                    first_month.date(),
+                    live_month.date() - timedelta(days=1),
+                )
+                _add_counts(counts, archived)
+            months = (live_month, last_month) if live_month <= last_month else None
+        if months:
+            counters = (
+                attendance_bucket_repository
+                if bucket_layout()
+                else attendance_monthly_repository
+            )
+            _add_counts(counts, await counters.get_counts(db, employee_oids, *months))
+        if raw_ranges:
+            date_clauses = []
+            for range_start, range_end in raw_ranges:
+                start_dt, end_dt = _date_range_bounds(range_start, range_end)
+                date_clauses.append({"date": {"$gte": start_dt, "$lte": end_dt}})
+            match: Dict[str, Any] = {
+                "employee_id": (
+                    employee_oids[0]
+                    if len(employee_oids) == 1
+                    else {"$in": employee_oids}
+                )
+            }
+            if len(date_clauses) == 1:
+                match.update(date_clauses[0])
+            else:
+                match["$or"] = date_clauses
+            collection, pipeline = rows_source(match)
+            pipeline.append(
+                {
+                    "$group": {
+                        "_id": {"employee_id": "$employee_id", "status": "$status"},
+                        "count": {"$sum": 1},
+                    }
+                }
+            )
+            async for r in db[collection].aggregate(pipeline):
+                by_status = counts[r["_id"]["employee_id"]]
+                status = r["_id"]["status"]
+                by_status[status] = by_status.get(status, 0) + r["count"]
+            for range_start, range_end in raw_ranges:
+                archived = await attendance_archive.count_by_status(
+                    employee_oids, range_start, range_end
+                )
+                _add_counts(counts, archived)
+        return counts
 
     async def get_employee_attendance_stats(
-        self, db: Any, employee_id: str, start_date: date, end_date: date
+        self,
+        db: Any,
+        employee_id: str,
+        start_date: date,
+        end_date: date,
+        calendar: Optional[str] = None,
+        loader: Optional[EmployeeLoader] = None,
     ) -> Dict[str, Any]:
         """
-        Single aggregation: employee stats (present/absent/half-day/leave) in date range.
+        Employee stats (present/absent/half-day/leave) in date range: whole months from
+        rollups, partial edge months from a single aggregation.
 
-        total_days: Working days (Mon–Fri) in range — used as denominator so rate is
-        "attendance vs expected days". Half-days count as 0.5 toward effective presence.
+        total_days: Working days (Mon–Fri minus holidays of `calendar`) in range — used as
+        denominator so rate is "attendance vs expected days". Half-days count as 0.5 toward effective presence.
         Division-by-zero: if total_days == 0 or total_recorded == 0, rate is 0.0.
         """
         try:
-            emp_oid = await self.resolve_employee_oid(db, employee_id)
-            start_dt, end_dt = _date_range_bounds(start_date, end_date)
-            total_days = self._working_days_in_range(start_date, end_date)
-            pipeline = [
+            emp_oid = await self.resolve_employee_oid(db, employee_id, loader)
+            total_days = await working_day_calculator.count(
+                db, start_date, end_date, calendar
+            )
+            counts = await self._count_by_status(db, [emp_oid], start_date, end_date)
+            return self._stats_from_counts(counts[emp_oid], total_days)
+        except Exception as e:
+            logger.error(
+                f"Error getting employee attendance stats for {employee_id}: {e}"
+            )
+            raise
+
+    async def get_employees_attendance_stats(
+        self,
+        db: Any,
+        start_date: date,
+        end_date: date,
+        employee_ids: Optional[List[str]] = None,
+        department: Optional[str] = None,
+        calendar: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Stats for many employees from one $match/$group on (employee_id, status)
+        (plus one rollup read for whole months).
+
+        Employees are selected by employee_ids (codes or _id strings) or by department.
+        The working-days denominator is computed once for the range. Returns
+        {"total_days", "data", "not_found"} where each data item is the single-employee
+        stats payload plus "employee_id" (the identifier as requested, or the code for
+        department queries).
+        """
+        try:
+            total_days = await working_day_calculator.count(
+                db, start_date, end_date, calendar
+            )
+            # identifier -> _id; a code and an _id string for the same employee each get an item
+            if department:
+                codes = await employee_repository.get_codes_by_department(
+                    db, department
+                )
+                targets = {code: oid for oid, code in codes.items()}
+                not_found: List[str] = []
+            else:
+                ids = list(dict.fromkeys(employee_ids or []))
+                resolved = await employee_repository.resolve_oids(db, ids)
+                targets = {
+                    identifier: resolved[identifier]
+                    for identifier in ids
+                    if identifier in resolved
+                }
+                not_found = [
+                    identifier for identifier in ids if identifier not in resolved
+                ]
+            if not targets:
+                return {"total_days": total_days, "data": [], "not_found": not_found}
+
+            counts = await self._count_by_status(
+                db, list(dict.fromkeys(targets.values())), start_date, end_date
+            )
+            items = [
                 {
-                    "$match": {
-                        "employee_id": emp_oid,
-                        "date": {"$gte": start_dt, "$lte": end_dt},
-                    }
-                },
-                {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+                    "employee_id": identifier,
+                    **self._stats_from_counts(counts[oid], total_days),
+                }
+                for identifier, oid in targets.items()
             ]
-            cursor = db[self.collection_name].aggregate(pipeline)
-            results = await cursor.to_list(length=10)
-            present_days = absent_days = half_days = leave_days = 0
-            for r in results:
-                c = r["count"]
-                if r["_id"] == "present":
-                    present_days = c
-                elif r["_id"] == "absent":
-                    absent_days = c
-                elif r["_id"] == "half-day":
-                    half_days = c
-                elif r["_id"] == "leave":
-                    leave_days = c
-            # Rate: effective_present (present=1, half-day=0.5) / total_days. Alternative:
-            # denominator = total_recorded (present+absent+half_days+leave_days) if you
-            # prefer "rate among days with a record" instead of "rate vs expected working days".
-            effective_present = present_days + 0.5 * half_days
-            denominator = total_days
-            attendance_rate = (
-                round((effective_present / denominator) * 100, 2)
-                if denominator and denominator > 0
-                else 0.0
+            return {"total_days": total_days, "data": items, "not_found": not_found}
+        except Exception as e:
+            logger.error(f"Error getting batch attendance stats: {e}")
+            raise
+
+    async def get_month_matrix(
+        self, db: Any, year: int, month: int, department: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Every active employee × every day of a month, packed 3 bits per day.
+
+        One employee read for the row index, then one aggregation sorted by
+        (employee_id, date) streams statuses straight into per-employee bit rows.
+        Returns {"days", "employees": [codes], "rows": [bytes]} in matching order.
+        """
+        try:
+            days = monthrange(year, month)[1]
+            employee_filter = employee_repository._and_not_deleted(
+                {"department": department} if department else {}
             )
+            employees = (
+                await db[employee_repository.collection_name]
+                .find(employee_filter, {"_id": 1, "employee_id": 1})
+                .sort([("employee_id", 1)])
+                .to_list(length=None)
+            )
+            position = {doc["_id"]: i for i, doc in enumerate(employees)}
+            day_codes: List[Dict[int, int]] = [{} for _ in employees]
+
+            def mark(doc: Dict[str, Any]) -> None:
+                i = position.get(doc["employee_id"])
+                code = MATRIX_STATUS_CODES.get(doc.get("status"))
+                if i is not None and code:
+                    day_codes[i][doc["date"].day - 1] = code
+
+            first, last = date(year, month, 1), date(year, month, days)
+            if attendance_archive.is_archived(first):
+                # A closed month lives only in its segment file
+                for doc in await attendance_archive.read_range(
+                    first, last, list(position) if department else None
+                ):
+                    mark(doc)
+            else:
+                start_dt, end_dt = _date_range_bounds(first, last)
+                match: Dict[str, Any] = {"date": {"$gte": start_dt, "$lte": end_dt}}
+                if department:
+                    match["employee_id"] = {"$in": list(position)}
+                collection, pipeline = rows_source(match)
+                pipeline += [
+                    {"$sort": {"employee_id": 1, "date": 1}},
+                    {"$project": {"_id": 0, "employee_id": 1, "date": 1, "status": 1}},
+                ]
+                async for doc in db[collection].aggregate(pipeline):
+                    mark(doc)
             return {
-                "total_days": total_days,
-                "present_days": present_days,
-                "absent_days": absent_days,
-                "half_days": half_days,
-                "leave_days": leave_days,
-                "attendance_rate": attendance_rate,
+                "days": days,
+                "employees": [doc.get("employee_id") for doc in employees],
+                "rows": [pack_month_row(codes, days) for codes in day_codes],
             }
         except Exception as e:
-            logger.error(f"Error getting employee attendance stats for {employee_id}: {e}")
+            logger.error(
+                f"Error building attendance matrix for {year}-{month:02d}: {e}"
+            )
             raise
 
-    async def create(self, db: Any, obj_in: AttendanceInDB) -> AttendanceInDB:
+    async def create(
+        self, db: Any, obj_in: AttendanceInDB, loader: Optional[EmployeeLoader] = None
+    ) -> AttendanceInDB:
+        """
+        Insert one record. Re-marking the same day is left to employee_date_unique_index
+        (DuplicateKeyError propagates), and the result is built from the inserted doc.
+        In the bucket layout the record is one $set/$inc upsert into its employee-month.
+        """
         try:
-            if await self.check_attendance_exists(db, obj_in.employee_id, obj_in.date):
-                raise ValueError(f"Attendance already exists for employee {obj_in.employee_id} on {obj_in.date}")
-
-            if _is_objectid(obj_in.employee_id):
-                employee = await employee_repository.get(db, obj_in.employee_id)
-            else:
-                employee = await employee_repository.get_by_employee_id(db, obj_in.employee_id)
-            if not employee:
+            emp_oid = await _employee_oid(
+                db, obj_in.employee_id, loader, for_write=True
+            )
+            if emp_oid is None:
                 raise ValueError(f"Employee {obj_in.employee_id} not found")
+            if attendance_archive.is_archived(obj_in.date):
+                raise ValueError(
+                    f"Attendance for {obj_in.date:%Y-%m} is archived and closed"
+                )
 
-            emp_oid = ObjectId(employee.id)
             now_utc = datetime.now(timezone.utc)
             date_dt = datetime.combine(obj_in.date, datetime.min.time())
             # Insert with employee_id as ObjectId (model_dump() would serialize it as str)
@@ -183,16 +676,145 @@ class AttendanceRepository(BaseRepository[AttendanceInDB]):
                 "created_at": now_utc,
                 "updated_at": now_utc,
             }
-            result = await db[self.collection_name].insert_one(doc)
-            created_doc = await db[self.collection_name].find_one({"_id": result.inserted_id})
-            if not created_doc:
-                raise PyMongoError("Failed to retrieve created attendance document")
-            return self.model_class(**created_doc)
-        except ValueError:
+            if bucket_layout():
+                doc["_id"] = ObjectId()
+                await attendance_bucket_repository.mark(db, doc)
+                self._written()
+                dashboard_service.invalidate()
+                return self.model_class(**as_stored(doc))
+            # Time-series mode: uniqueness comes from claiming the (employee, day) key first
+            await attendance_key_repository.claim(db, doc)
+            try:
+                result = await db[self.collection_name].insert_one(doc)
+            except PyMongoError:
+                await attendance_key_repository.release(db, [doc])
+                raise
+            self._written()
+            await attendance_monthly_repository.record(
+                db, emp_oid, obj_in.date, doc["status"]
+            )
+            dashboard_service.invalidate()
+            doc["_id"] = result.inserted_id
+            return self.model_class(**as_stored(doc))
+        except (ValueError, DuplicateKeyError):
             raise
         except Exception as e:
             logger.error(f"Error creating attendance: {e}")
             raise
 
+    async def create_many(
+        self, db: Any, records: List[AttendanceCreate]
+    ) -> List[Dict[str, Any]]:
+        """
+        Mark many attendance records with one employee $in lookup and one unordered insert_many.
+
+        Returns one result per input record, in input order:
+        {"index", "employee_id", "date", "status": "created"|"duplicate"|"error", "id", "error"}.
+        Duplicates (already marked, or repeated within the batch) are reported by the
+        employee_date_unique_index (or attendance_keys in time-series mode) rather than
+        pre-checked. The bucket layout uses one unordered bulk of per-day upserts instead.
+        """
+        results: List[Dict[str, Any]] = [
+            {
+                "index": i,
+                "employee_id": rec.employee_id,
+                "date": rec.date,
+                "status": "error",
+                "id": None,
+                "error": None,
+            }
+            for i, rec in enumerate(records)
+        ]
+        try:
+            resolved = await employee_repository.resolve_oids(
+                db, [rec.employee_id for rec in records], cached=False
+            )
+            now_utc = datetime.now(timezone.utc)
+            docs: List[Dict[str, Any]] = []
+            doc_indexes: List[int] = []
+            today = date.today()
+            for i, rec in enumerate(records):
+                if rec.date > today:
+                    results[i]["error"] = "Attendance date cannot be in the future"
+                    continue
+                if attendance_archive.is_archived(rec.date):
+                    results[i][
+                        "error"
+                    ] = f"Attendance for {rec.date:%Y-%m} is archived and closed"
+                    continue
+                emp_oid = resolved.get(rec.employee_id)
+                if emp_oid is None:
+                    results[i]["error"] = f"Employee {rec.employee_id} not found"
+                    continue
+                docs.append(
+                    {
+                        "employee_id": emp_oid,
+                        "date": datetime.combine(rec.date, datetime.min.time()),
+                        "status": rec.status or "present",
+                        "notes": rec.notes,
+                        "marked_by": rec.marked_by,
+                        "marked_at": now_utc,
+                        "created_at": now_utc,
+                        "updated_at": now_utc,
+                    }
+                )
+                doc_indexes.append(i)
+            if not docs:
+                return results
+
+            if bucket_layout():
+                for doc in docs:
+                    doc["_id"] = ObjectId()
+                failed = await attendance_bucket_repository.mark_many(db, docs)
+                to_insert = []
+            else:
+                # Time-series mode claims (employee, day) keys first; duplicates fail there
+                failed = await attendance_key_repository.claim_many(db, docs)
+                to_insert = [pos for pos in range(len(docs)) if pos not in failed]
+            try:
+                if to_insert:
+                    await db[self.collection_name].insert_many(
+                        [docs[pos] for pos in to_insert], ordered=False
+                    )
+            except BulkWriteError as bwe:
+                insert_failed = [
+                    to_insert[we["index"]] for we in bwe.details.get("writeErrors", [])
+                ]
+                for write_error in bwe.details.get("writeErrors", []):
+                    failed[to_insert[write_error["index"]]] = write_error
+                await attendance_key_repository.release(
+                    db, [docs[pos] for pos in insert_failed]
+                )
+
+            # insert_many sets _id on each doc client-side, so no re-read is needed
+            rollup_changes = []
+            for doc_pos, (i, doc) in enumerate(zip(doc_indexes, docs)):
+                write_error = failed.get(doc_pos)
+                if write_error is None:
+                    results[i]["status"] = "created"
+                    results[i]["id"] = str(doc["_id"])
+                    rollup_changes.append(
+                        (doc["employee_id"], records[i].date, doc["status"], 1)
+                    )
+                elif write_error.get("code") == DUPLICATE_KEY_ERROR_CODE:
+                    results[i]["status"] = "duplicate"
+                    results[i]["error"] = (
+                        f"Attendance already exists for employee {records[i].employee_id} "
+                        f"on {records[i].date}"
+                    )
+                else:
+                    results[i]["error"] = write_error.get(
+                        "errmsg", "Failed to mark attendance"
+                    )
+            if not bucket_layout():
+                await attendance_monthly_repository.record_many(db, rollup_changes)
+            if rollup_changes:
+                self._written()
+                dashboard_service.invalidate()
+            return results
+        except Exception as e:
+            logger.error(f"Error bulk creating attendance: {e}")
+            raise
+
 
 attendance_repository = AttendanceRepository()
@@ -0,0 +1,459 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+from collections import Counter
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from bson import ObjectId, json_util
+from pymongo.errors import PyMongoError
+
+from app.config.settings import settings
+from app.core.cache import write_versions
+from app.services.attendance_buckets import (
+    attendance_bucket_repository,
+    bucket_layout,
+    find_rows,
+    rows_source,
+)
+from app.services.attendance_keys import attendance_key_repository
+from app.services.attendance_monthly import month_start
+
+logger = logging.getLogger(__name__)
+
+# Rows deleted from MongoDB per delete_many once their segment is safely on disk
+_DELETE_BATCH = 1000
+
+
+def month_key(d: date) -> str:
+    return f"{d.year:04d}-{d.month:02d}"
+
+
+def _months_between(start: date, end: date) -> Iterator[str]:
+    """Month keys touched by the inclusive range start..end."""
+    current = date(start.year, start.month, 1)
+    while current <= end:
+        yield month_key(current)
+        current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _month_bounds(key: str) -> Tuple[date, date]:
+    first = date(int(key[:4]), int(key[5:7]), 1)
+    next_first = (first.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return first, next_first - timedelta(days=1)
+
+
+def _row_date(row: Dict[str, Any]) -> date:
+    value = row["date"]
+    return value.date() if isinstance(value, datetime) else value
+
+
+def row_key(row: Dict[str, Any]) -> Tuple[Any, ObjectId]:
+    """(date, _id): the order list pages and exports use, in MongoDB and in segments alike."""
+    return row["date"], row["_id"]
+
+
+def _filter_values(condition: Any) -> Optional[Set[Any]]:
+    if condition is None:
+        return None
+    if isinstance(condition, dict):
+        return set(condition["$in"])
+    return {condition}
+
+
+class RowFilter:
+    """
+    A build_list_filter() filter ({employee_id, status, date: {$gte, $lte}}) applied to
+    archived rows. Other filter shapes raise ValueError rather than silently matching more.
+    """
+
+    def __init__(self, filter_query: Dict[str, Any]) -> None:
+        unknown = set(filter_query) - {"employee_id", "status", "date"}
+        date_range = filter_query.get("date") or {}
+        if unknown or set(date_range) - {"$gte", "$lte"}:
+            raise ValueError(
+                f"Unsupported attendance filter for archived months: {filter_query}"
+            )
+        self.start: Optional[date] = (
+            _row_date({"date": date_range["$gte"]}) if "$gte" in date_range else None
+        )
+        self.end: Optional[date] = (
+            _row_date({"date": date_range["$lte"]}) if "$lte" in date_range else None
+        )
+        self.employee_oids = _filter_values(filter_query.get("employee_id"))
+        self.statuses = _filter_values(filter_query.get("status"))
+
+    def covers_month(self, key: str) -> bool:
+        first, last = _month_bounds(key)
+        return (self.start is None or self.start <= first) and (
+            self.end is None or last <= self.end
+        )
+
+    def overlaps_month(self, key: str) -> bool:
+        first, last = _month_bounds(key)
+        return (self.start is None or self.start <= last) and (
+            self.end is None or first <= self.end
+        )
+
+    def matches(self, row: Dict[str, Any]) -> bool:
+        row_date = _row_date(row)
+        return (
+            (self.start is None or self.start <= row_date)
+            and (self.end is None or row_date <= self.end)
+            and (self.employee_oids is None or row["employee_id"] in self.employee_oids)
+            and (self.statuses is None or row.get("status", "present") in self.statuses)
+        )
+
+
+class AttendanceArchive:
+    """
+    Closed attendance months stored as compressed, month-partitioned segment files.
+
+    Layout under ATTENDANCE_ARCHIVE_DIR:
+      YYYY/YYYY-MM.gN.seg     concatenated gzip members, one per employee, each holding
+                              that employee's rows for the month as sorted JSON lines
+      YYYY/YYYY-MM.idx.json   {"segment": "YYYY-MM.gN.seg", "generation": N,
+                               "employees": {employee _id: {offset, length, rows, counts}}}
+      manifest.json           {"months": [...]}: months whose rows now live only here
+
+    Rewriting a month writes a new generation's segment, then swaps the index to it, so a
+    reader (or a crash) never pairs an index with the wrong segment.
+
+    The per-employee index lets a reader seek to and inflate one employee's member, and
+    its status counts answer whole-month stats without touching the segment at all.
+    Archived months are closed: new attendance for them is rejected, so MongoDB and the
+    archive never hold rows for the same month and readers can simply combine both.
+    """
+
+    def __init__(self, root: Optional[str] = None) -> None:
+        self._root = root
+        self._manifest_cache: Tuple[float, Set[str]] = (-1.0, set())
+        self._index_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+    @property
+    def root(self) -> Path:
+        return Path(self._root or settings.ATTENDANCE_ARCHIVE_DIR)
+
+    @staticmethod
+    def default_cutoff(today: Optional[date] = None) -> date:
+        """First day of the oldest month that stays live; earlier months may be archived."""
+        today = today or date.today()
+        return month_start(
+            today - timedelta(days=settings.ATTENDANCE_ARCHIVE_AFTER_DAYS)
+        ).date()
+
+    # ---- manifest / index --------------------------------------------------
+
+    def _index_path(self, key: str) -> Path:
+        return self.root / key[:4] / f"{key}.idx.json"
+
+    def archived_months(self) -> Set[str]:
+        """Archived month keys; re-read only when another process rewrote the manifest."""
+        path = self.root / "manifest.json"
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return set()
+        if mtime != self._manifest_cache[0]:
+            with path.open("r", encoding="utf-8") as f:
+                self._manifest_cache = (mtime, set(json.load(f).get("months", [])))
+        return self._manifest_cache[1]
+
+    def is_archived(self, d: date) -> bool:
+        return month_key(d) in self.archived_months()
+
+    def months_in_range(self, start: date, end: date) -> List[str]:
+        archived = self.archived_months()
+        if not archived:
+            return []
+        return [key for key in _months_between(start, end) if key in archived]
+
+    def _load_index(self, key: str) -> Dict[str, Any]:
+        idx_path = self._index_path(key)
+        mtime = idx_path.stat().st_mtime
+        cached = self._index_cache.get(key)
+        if cached is None or cached[0] != mtime:
+            with idx_path.open("r", encoding="utf-8") as f:
+                cached = (mtime, json.load(f))
+            self._index_cache[key] = cached
+        return cached[1]
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _write_manifest(self, months: Set[str]) -> None:
+        payload = json.dumps({"months": sorted(months)}, indent=1).encode()
+        self._atomic_write(self.root / "manifest.json", payload)
+
+    # ---- segment IO (blocking; called through asyncio.to_thread) ------------
+
+    def _read_month(
+        self, key: str, employee_oids: Optional[Set[ObjectId]]
+    ) -> List[Dict[str, Any]]:
+        index = self._load_index(key)
+        seg_path = self._index_path(key).with_name(index["segment"])
+        if employee_oids is None:
+            with gzip.open(seg_path, "rt", encoding="utf-8") as f:
+                return [json_util.loads(line) for line in f if line.strip()]
+        rows: List[Dict[str, Any]] = []
+        with seg_path.open("rb") as f:
+            for oid in employee_oids:
+                entry = index["employees"].get(str(oid))
+                if entry is None:
+                    continue
+                f.seek(entry["offset"])
+                member = gzip.decompress(f.read(entry["length"])).decode("utf-8")
+                rows.extend(
+                    json_util.loads(line) for line in member.splitlines() if line
+                )
+        return rows
+
+    def _write_month(self, key: str, rows: Iterable[Dict[str, Any]]) -> None:
+        by_employee: Dict[ObjectId, Dict[ObjectId, Dict[str, Any]]] = {}
+        for row in rows:
+            by_employee.setdefault(row["employee_id"], {})[row["_id"]] = row
+        idx_path = self._index_path(key)
+        previous = self._load_index(key) if idx_path.exists() else None
+        generation = previous["generation"] + 1 if previous else 1
+        seg_path = idx_path.with_name(f"{key}.g{generation}.seg")
+        index: Dict[str, Any] = {}
+        chunks: List[bytes] = []
+        offset = 0
+        for oid in sorted(by_employee, key=str):
+            employee_rows = sorted(by_employee[oid].values(), key=lambda r: r["date"])
+            payload = "".join(json_util.dumps(r) + "\n" for r in employee_rows).encode(
+                "utf-8"
+            )
+            member = gzip.compress(payload, mtime=0)
+            index[str(oid)] = {
+                "offset": offset,
+                "length": len(member),
+                "rows": len(employee_rows),
+                "counts": dict(
+                    Counter(r.get("status", "present") for r in employee_rows)
+                ),
+            }
+            chunks.append(member)
+            offset += len(member)
+        self._atomic_write(seg_path, b"".join(chunks))
+        payload = {
+            "segment": seg_path.name,
+            "generation": generation,
+            "employees": index,
+        }
+        self._atomic_write(
+            idx_path, json.dumps(payload, separators=(",", ":")).encode()
+        )
+        if previous:
+            idx_path.with_name(previous["segment"]).unlink(missing_ok=True)
+
+    # ---- async read API ----------------------------------------------------
+
+    async def read_range(
+        self, start: date, end: date, employee_oids: Optional[Iterable[ObjectId]] = None
+    ) -> List[Dict[str, Any]]:
+        """Archived rows in start..end (optionally for some employees), sorted by date."""
+        keys = self.months_in_range(start, end)
+        if not keys:
+            return []
+        oids = set(employee_oids) if employee_oids is not None else None
+        rows: List[Dict[str, Any]] = []
+        for key in keys:
+            month_rows = await asyncio.to_thread(self._read_month, key, oids)
+            rows.extend(r for r in month_rows if start <= _row_date(r) <= end)
+        rows.sort(key=lambda r: (r["date"], str(r["employee_id"])))
+        return rows
+
+    async def count_by_status(
+        self, employee_oids: List[ObjectId], start: date, end: date
+    ) -> Dict[ObjectId, Dict[str, int]]:
+        """Per-employee {status: count} from archived months; whole months use index counts only."""
+        counts: Dict[ObjectId, Dict[str, int]] = {}
+        for key in self.months_in_range(start, end):
+            first, last = _month_bounds(key)
+            if start <= first and last <= end:
+                index = await asyncio.to_thread(self._load_index, key)
+                for oid in employee_oids:
+                    entry = index["employees"].get(str(oid))
+                    if entry:
+                        by_status = counts.setdefault(oid, {})
+                        for status, n in entry["counts"].items():
+                            by_status[status] = by_status.get(status, 0) + n
+                continue
+            rows = await asyncio.to_thread(self._read_month, key, set(employee_oids))
+            for row in rows:
+                if start <= _row_date(row) <= end:
+                    by_status = counts.setdefault(row["employee_id"], {})
+                    status = row.get("status", "present")
+                    by_status[status] = by_status.get(status, 0) + 1
+        return counts
+
+    def months_matching(self, filter_query: Dict[str, Any]) -> List[str]:
+        """Archived months (ascending) holding rows a build_list_filter() filter may match."""
+        archived = self.archived_months()
+        if not archived:
+            return []
+        row_filter = RowFilter(filter_query)
+        return sorted(key for key in archived if row_filter.overlaps_month(key))
+
+    async def count_matching(self, filter_query: Dict[str, Any]) -> int:
+        """Archived rows matching the filter; months the range covers are counted from the index."""
+        row_filter = RowFilter(filter_query)
+        total = 0
+        for key in self.months_matching(filter_query):
+            if not row_filter.covers_month(key):
+                rows = await asyncio.to_thread(
+                    self._read_month, key, row_filter.employee_oids
+                )
+                total += sum(1 for row in rows if row_filter.matches(row))
+                continue
+            index = await asyncio.to_thread(self._load_index, key)
+            for oid, entry in index["employees"].items():
+                if (
+                    row_filter.employee_oids is not None
+                    and ObjectId(oid) not in row_filter.employee_oids
+                ):
+                    continue
+                total += sum(
+                    n
+                    for status, n in entry["counts"].items()
+                    if row_filter.statuses is None or status in row_filter.statuses
+                )
+        return total
+
+    async def iter_matching(
+        self, filter_query: Dict[str, Any], descending: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Archived rows matching the filter in row_key() order, one month read at a time, so a
+        caller that stops early (a first page) never inflates the months it does not reach.
+        """
+        row_filter = RowFilter(filter_query)
+        keys = self.months_matching(filter_query)
+        for key in reversed(keys) if descending else keys:
+            rows = await asyncio.to_thread(
+                self._read_month, key, row_filter.employee_oids
+            )
+            rows = [row for row in rows if row_filter.matches(row)]
+            rows.sort(key=row_key, reverse=descending)
+            for row in rows:
+                yield row
+
+    def iter_month_counts(self) -> Iterator[Tuple[ObjectId, datetime, Dict[str, int]]]:
+        """(employee_id, month, counts) for every archived month; used to restore rollups."""
+        for key in sorted(self.archived_months()):
+            month = datetime(int(key[:4]), int(key[5:7]), 1)
+            for oid, entry in self._load_index(key)["employees"].items():
+                yield ObjectId(oid), month, entry["counts"]
+
+    # ---- archiver ------------------------------------------------------------
+
+    async def archive(
+        self, db: Any, before: Optional[date] = None, dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Move every attendance row dated before `before` (a month boundary; default
+        default_cutoff()) into segment files, one month at a time.
+
+        Each month is written and fsynced, added to the manifest, and only then deleted
+        from MongoDB by _id, so an interrupted run never loses rows. Re-running merges
+        into existing segments.
+        """
+        cutoff = month_start(before or self.default_cutoff())
+        collection, old_rows = rows_source({"date": {"$lt": cutoff}})
+        try:
+            months = (
+                await db[collection]
+                .aggregate(
+                    [
+                        *old_rows,
+                        {
+                            "$group": {
+                                "_id": {
+                                    "y": {"$year": "$date"},
+                                    "m": {"$month": "$date"},
+                                }
+                            }
+                        },
+                        {"$sort": {"_id.y": 1, "_id.m": 1}},
+                    ]
+                )
+                .to_list(length=None)
+            )
+        except PyMongoError as e:
+            logger.error(f"Error listing attendance months to archive: {e}")
+            raise
+
+        report: Dict[str, Any] = {"cutoff": cutoff.date(), "months": [], "rows": 0}
+        for group in months:
+            key = f"{group['_id']['y']:04d}-{group['_id']['m']:02d}"
+            first, last = _month_bounds(key)
+            month_filter = {
+                "date": {
+                    "$gte": datetime.combine(first, datetime.min.time()),
+                    "$lte": datetime.combine(last, datetime.max.time()),
+                }
+            }
+            try:
+                rows = await find_rows(db, month_filter).to_list(length=None)
+            except PyMongoError as e:
+                logger.error(f"Error reading attendance for {key}: {e}")
+                raise
+            report["months"].append({"month": key, "rows": len(rows)})
+            report["rows"] += len(rows)
+            if dry_run or not rows:
+                continue
+
+            archived = set(self.archived_months())
+            existing = (
+                await asyncio.to_thread(self._read_month, key, None)
+                if key in archived
+                else []
+            )
+            await asyncio.to_thread(self._write_month, key, existing + rows)
+            archived.add(key)
+            await asyncio.to_thread(self._write_manifest, archived)
+
+            ids = [row["_id"] for row in rows]
+            try:
+                if bucket_layout():
+                    # The month's buckets hold exactly the rows just archived
+                    await attendance_bucket_repository.delete_month(
+                        db, month_start(first)
+                    )
+                else:
+                    for i in range(0, len(ids), _DELETE_BATCH):
+                        await db[collection].delete_many(
+                            {"_id": {"$in": ids[i : i + _DELETE_BATCH]}}
+                        )
+            except PyMongoError as e:
+                logger.error(f"Error deleting archived attendance for {key}: {e}")
+                raise
+            write_versions.record("attendance")
+            # Closed months take no new marks, so their uniqueness keys are no longer needed
+            await attendance_key_repository.delete_range(db, first, last)
+            logger.info(f"Archived {len(rows)} attendance row(s) for {key}")
+        return report
+
+
+attendance_archive = AttendanceArchive()
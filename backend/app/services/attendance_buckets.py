@@ -0,0 +1,245 @@
+import logging
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
+
+from app.config.settings import settings
+from app.services.attendance_monthly import month_start
+from app.services.base import DUPLICATE_KEY_ERROR_CODE
+
+logger = logging.getLogger(__name__)
+
+BUCKET_COLLECTION = "attendance_buckets"
+DAILY_COLLECTION = "attendance"
+
+
+def bucket_layout() -> bool:
+    return settings.ATTENDANCE_LAYOUT == "bucket"
+
+
+def day_field(day: date) -> str:
+    """Path of one day's entry; zero-padded so the entries of a bucket sort by date."""
+    return f"days.{day.day:02d}"
+
+
+def _month_bounds(condition: Any) -> Dict[str, datetime]:
+    """Bucket `month` bounds implied by a row-level `date` condition."""
+    if isinstance(condition, datetime):
+        return {"$gte": month_start(condition), "$lte": month_start(condition)}
+    if not isinstance(condition, dict):
+        return {}
+    bounds: Dict[str, datetime] = {}
+    for op, key in (
+        ("$gte", "$gte"),
+        ("$gt", "$gte"),
+        ("$lte", "$lte"),
+        ("$lt", "$lte"),
+    ):
+        value = condition.get(op)
+        if isinstance(value, datetime):
+            bounds[key] = month_start(value)
+    return bounds
+
+
+def bucket_prefilter(match: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Bucket-level filter selecting every bucket that can hold a row matching `match`.
+
+    Taken from top-level (and $and) employee_id / date conditions; anything else is
+    left to the row-level $match after the unwind.
+    """
+    prefilter: Dict[str, Any] = {}
+    clauses = [match] + [c for c in match.get("$and", []) if isinstance(c, dict)]
+    for clause in clauses:
+        if "employee_id" in clause:
+            prefilter["employee_id"] = clause["employee_id"]
+        bounds = _month_bounds(clause.get("date"))
+        if bounds:
+            prefilter.setdefault("month", {}).update(bounds)
+    return prefilter
+
+
+def rows_pipeline(match: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Aggregation over attendance_buckets yielding daily-layout rows that match `match`."""
+    pipeline: List[Dict[str, Any]] = [
+        {"$match": bucket_prefilter(match)},
+        {"$project": {"_id": 0, "days": {"$objectToArray": "$days"}}},
+        {"$unwind": "$days"},
+        {"$replaceRoot": {"newRoot": "$days.v"}},
+    ]
+    if match:
+        pipeline.append({"$match": match})
+    return pipeline
+
+
+def rows_source(match: Dict[str, Any]) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    (collection, leading stages) producing daily-layout attendance rows matching `match`.
+
+    Lets aggregations outside AttendanceRepository (dashboard, archive) work on either
+    layout by appending their own stages.
+    """
+    if bucket_layout():
+        return BUCKET_COLLECTION, rows_pipeline(match)
+    return DAILY_COLLECTION, [{"$match": match}]
+
+
+def find_rows(
+    db: Any,
+    match: Dict[str, Any],
+    projection: Optional[Dict[str, Any]] = None,
+    sort: Optional[List[Tuple[str, int]]] = None,
+    batch_size: Optional[int] = None,
+) -> Any:
+    """Async cursor over daily-layout rows: a plain find, or the unwinding aggregation."""
+    if not bucket_layout():
+        cursor = db[DAILY_COLLECTION].find(match, projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        return cursor.batch_size(batch_size) if batch_size else cursor
+    collection, pipeline = rows_source(match)
+    if sort:
+        pipeline.append({"$sort": dict(sort)})
+    if projection:
+        pipeline.append({"$project": projection})
+    options = {"batchSize": batch_size} if batch_size else {}
+    return db[collection].aggregate(pipeline, **options)
+
+
+def bucket_from_rows(
+    employee_oid: ObjectId, month: datetime, rows: Iterable[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Build one bucket document from the daily rows of an employee-month (converter)."""
+    days: Dict[str, Dict[str, Any]] = {}
+    counts: Dict[str, int] = {}
+    for row in rows:
+        days[f"{row['date'].day:02d}"] = row
+        status = row.get("status", "present")
+        counts[status] = counts.get(status, 0) + 1
+    now_utc = datetime.now(timezone.utc)
+    return {
+        "employee_id": employee_oid,
+        "month": month,
+        "days": dict(sorted(days.items())),
+        "counts": counts,
+        "created_at": now_utc,
+        "updated_at": now_utc,
+    }
+
+
+class AttendanceBucketRepository:
+    """
+    One document per (employee, month) in the bucket layout:
+    {employee_id, month (1st of month), days: {"DD": daily row}, counts: {status: n}}.
+    Each day entry is the complete daily-layout row (own _id, employee_id, date, ...), so
+    reads unwind buckets straight back into rows.
+
+    Marking a day is a single upsert that sets days.DD and increments its counter, guarded
+    by days.DD not existing; a second mark misses the guard, the upsert then collides on
+    employee_month_unique_index and surfaces as DuplicateKeyError like the daily layout.
+    Whole-month stats read `counts` directly, so attendance_monthly is not maintained.
+    """
+
+    collection_name = BUCKET_COLLECTION
+
+    @staticmethod
+    def _mark_update(doc: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """(filter, update) marking doc's day: set days.DD and bump its status counter."""
+        status = doc.get("status", "present")
+        filter_query = {
+            "employee_id": doc["employee_id"],
+            "month": month_start(doc["date"]),
+            day_field(doc["date"]): {"$exists": False},
+        }
+        update = {
+            "$set": {day_field(doc["date"]): doc, "updated_at": doc["updated_at"]},
+            "$inc": {f"counts.{status}": 1},
+            "$setOnInsert": {"created_at": doc["created_at"]},
+        }
+        return filter_query, update
+
+    async def _mark_existing(self, db: Any, doc: Dict[str, Any]) -> bool:
+        """
+        Retry a mark whose upsert collided without upserting: two first marks of the same
+        month race to insert the bucket, and the loser lands here. False = day already marked.
+        """
+        result = await db[self.collection_name].update_one(*self._mark_update(doc))
+        return result.matched_count > 0
+
+    async def mark(self, db: Any, doc: Dict[str, Any]) -> None:
+        """Mark one day (doc needs an _id); raises DuplicateKeyError when already marked."""
+        try:
+            await db[self.collection_name].update_one(
+                *self._mark_update(doc), upsert=True
+            )
+        except DuplicateKeyError:
+            if not await self._mark_existing(db, doc):
+                raise
+        except PyMongoError as e:
+            logger.error(f"Error marking attendance bucket: {e}")
+            raise
+
+    async def mark_many(
+        self, db: Any, docs: List[Dict[str, Any]]
+    ) -> Dict[int, Dict[str, Any]]:
+        """Mark many days with one unordered bulk_write; returns {position: writeError} for failures."""
+        if not docs:
+            return {}
+        failed: Dict[int, Dict[str, Any]] = {}
+        try:
+            await db[self.collection_name].bulk_write(
+                [UpdateOne(*self._mark_update(doc), upsert=True) for doc in docs],
+                ordered=False,
+            )
+        except BulkWriteError as bwe:
+            for write_error in bwe.details.get("writeErrors", []):
+                pos = write_error["index"]
+                duplicate = write_error.get("code") == DUPLICATE_KEY_ERROR_CODE
+                if duplicate and await self._mark_existing(db, docs[pos]):
+                    continue
+                failed[pos] = write_error
+        except PyMongoError as e:
+            logger.error(f"Error bulk marking attendance buckets: {e}")
+            raise
+        return failed
+
+    async def get_counts(
+        self,
+        db: Any,
+        employee_oids: List[ObjectId],
+        first_month: datetime,
+        last_month: datetime,
+    ) -> Dict[ObjectId, Dict[str, int]]:
+        """Sum bucket counters over [first_month, last_month]; one document per employee-month."""
+        totals: Dict[ObjectId, Dict[str, int]] = {}
+        try:
+            cursor = db[self.collection_name].find(
+                {
+                    "employee_id": {"$in": employee_oids},
+                    "month": {"$gte": first_month, "$lte": last_month},
+                },
+                {"_id": 0, "employee_id": 1, "counts": 1},
+            )
+            async for doc in cursor:
+                emp_totals = totals.setdefault(doc["employee_id"], {})
+                for status, count in (doc.get("counts") or {}).items():
+                    emp_totals[status] = emp_totals.get(status, 0) + count
+            return totals
+        except PyMongoError as e:
+            logger.error(f"Error reading attendance bucket counts: {e}")
+            raise
+
+    async def delete_month(self, db: Any, month: datetime) -> int:
+        """Drop every bucket of a month (after archiving it)."""
+        try:
+            result = await db[self.collection_name].delete_many({"month": month})
+            return result.deleted_count
+        except PyMongoError as e:
+            logger.error(f"Error deleting attendance buckets for {month:%Y-%m}: {e}")
+            raise
+
+
+attendance_bucket_repository = AttendanceBucketRepository()
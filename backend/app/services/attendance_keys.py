@@ -0,0 +1,100 @@
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, List
+
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+KEYS_COLLECTION = "attendance_keys"
+
+
+def day_key(employee_oid: Any, day: datetime) -> str:
+    """ "YYYY-MM-DD:<employee _id>": date first so a month is one _id range."""
+    return f"{day:%Y-%m-%d}:{employee_oid}"
+
+
+class AttendanceKeyRepository:
+    """
+    One document per marked (employee, day), keyed by day_key in _id.
+
+    Time-series collections cannot have unique indexes, so in ATTENDANCE_TIMESERIES mode a
+    key is claimed here (the _id index rejects a second claim) before the measurement is
+    inserted. In standard mode (and the bucket layout) every method is a no-op and a
+    unique index does the job.
+    """
+
+    collection_name = KEYS_COLLECTION
+
+    @property
+    def enabled(self) -> bool:
+        return settings.ATTENDANCE_TIMESERIES and settings.ATTENDANCE_LAYOUT == "daily"
+
+    async def claim(self, db: Any, doc: Dict[str, Any]) -> None:
+        """Claim one key; raises DuplicateKeyError when the day is already marked."""
+        if not self.enabled:
+            return
+        try:
+            await db[self.collection_name].insert_one(
+                {"_id": day_key(doc["employee_id"], doc["date"])}
+            )
+        except DuplicateKeyError:
+            raise
+        except PyMongoError as e:
+            logger.error(f"Error claiming attendance key: {e}")
+            raise
+
+    async def claim_many(
+        self, db: Any, docs: List[Dict[str, Any]]
+    ) -> Dict[int, Dict[str, Any]]:
+        """Claim keys with one unordered insert; returns {position: writeError} for failures."""
+        if not self.enabled or not docs:
+            return {}
+        failed: Dict[int, Dict[str, Any]] = {}
+        try:
+            await db[self.collection_name].insert_many(
+                [{"_id": day_key(doc["employee_id"], doc["date"])} for doc in docs],
+                ordered=False,
+            )
+        except BulkWriteError as bwe:
+            for write_error in bwe.details.get("writeErrors", []):
+                failed[write_error["index"]] = write_error
+        except PyMongoError as e:
+            logger.error(f"Error claiming attendance keys: {e}")
+            raise
+        return failed
+
+    async def release(self, db: Any, docs: List[Dict[str, Any]]) -> None:
+        """Give back keys whose measurement insert failed, so the day can be marked again."""
+        if not self.enabled or not docs:
+            return
+        try:
+            await db[self.collection_name].delete_many(
+                {
+                    "_id": {
+                        "$in": [
+                            day_key(doc["employee_id"], doc["date"]) for doc in docs
+                        ]
+                    }
+                }
+            )
+        except PyMongoError as e:
+            logger.error(f"Error releasing attendance keys: {e}")
+
+    async def delete_range(self, db: Any, start: date, end: date) -> None:
+        """Drop keys for start..end (e.g. archived months); a single _id range scan."""
+        if not self.enabled:
+            return
+        next_day = date.fromordinal(end.toordinal() + 1)
+        try:
+            await db[self.collection_name].delete_many(
+                {"_id": {"$gte": f"{start:%Y-%m-%d}", "$lt": f"{next_day:%Y-%m-%d}"}}
+            )
+        except PyMongoError as e:
+            logger.error(f"Error deleting attendance keys {start}..{end}: {e}")
+            raise
+
+
+attendance_key_repository = AttendanceKeyRepository()
@@ -0,0 +1,252 @@
+import logging
+from calendar import monthrange
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_COLLECTION = "attendance_monthly"
+
+# Marker document written after a full rebuild; absent = rollups may be partial
+SEEDED_MARKER = {"_id": "seeded"}
+
+# Selects (employee, month) documents, leaving the marker out
+ROLLUPS = {"employee_id": {"$exists": True}}
+
+
+def month_start(d: date) -> datetime:
+    """First day of d's month as the naive datetime used for the rollup `month` key."""
+    return datetime(d.year, d.month, 1)
+
+
+def split_whole_months(
+    start_date: date, end_date: date
+) -> Tuple[Optional[Tuple[datetime, datetime]], List[Tuple[date, date]]]:
+    """
+    Split an inclusive range into whole calendar months and partial edge ranges.
+
+    Returns (months, edges): months is (first_month_key, last_month_key) or None when the
+    range covers no complete month; edges are the leading/trailing partial date ranges.
+    """
+    if start_date.day == 1:
+        first_full = start_date
+    else:
+        days_in_month = monthrange(start_date.year, start_date.month)[1]
+        first_full = start_date.replace(day=days_in_month) + timedelta(days=1)
+    if end_date.day == monthrange(end_date.year, end_date.month)[1]:
+        last_full = end_date
+    else:
+        last_full = end_date.replace(day=1) - timedelta(days=1)
+    if first_full > last_full:
+        return None, [(start_date, end_date)]
+    edges: List[Tuple[date, date]] = []
+    if start_date < first_full:
+        edges.append((start_date, first_full - timedelta(days=1)))
+    if end_date > last_full:
+        edges.append((last_full + timedelta(days=1), end_date))
+    return (month_start(first_full), month_start(last_full)), edges
+
+
+def rebuild_pipeline() -> List[Dict[str, Any]]:
+    """Aggregation over `attendance` that recomputes every rollup document via $out."""
+    return [
+        {
+            "$group": {
+                "_id": {
+                    "employee_id": "$employee_id",
+                    "month": {
+                        "$dateFromParts": {
+                            "year": {"$year": "$date"},
+                            "month": {"$month": "$date"},
+                        }
+                    },
+                    "status": "$status",
+                },
+                "count": {"$sum": 1},
+            }
+        },
+        {
+            "$group": {
+                "_id": {"employee_id": "$_id.employee_id", "month": "$_id.month"},
+                "counts": {"$push": {"k": "$_id.status", "v": "$count"}},
+            }
+        },
+        {
+            "$project": {
+                "_id": 0,
+                "employee_id": "$_id.employee_id",
+                "month": "$_id.month",
+                "counts": {"$arrayToObject": "$counts"},
+                "updated_at": "$$NOW",
+            }
+        },
+        {"$out": ROLLUP_COLLECTION},
+    ]
+
+
+class AttendanceMonthlyRepository:
+    """
+    Per-(employee, month) attendance counters kept in step with the attendance collection.
+
+    Documents: {employee_id: ObjectId, month: datetime (1st of month), counts: {status: n}}.
+    Writers call record()/record_many() after changing attendance; stats read whole months
+    from here instead of re-aggregating raw rows. Both only write while
+    ATTENDANCE_ROLLUPS_ENABLED is set, so with it off the collection goes stale: the
+    SEEDED_MARKER document is dropped at startup (clear_seeded) and the next start with
+    rollups enabled rebuilds from scratch (ensure_seeded).
+    """
+
+    def __init__(self) -> None:
+        self.collection_name = ROLLUP_COLLECTION
+
+    async def record(
+        self,
+        db: Any,
+        employee_oid: ObjectId,
+        att_date: date,
+        status: str,
+        delta: int = 1,
+    ) -> None:
+        """Apply +delta (or -delta) to one status counter; upserts the month document."""
+        await self.record_many(db, [(employee_oid, att_date, status, delta)])
+
+    async def record_change(
+        self,
+        db: Any,
+        employee_oid: ObjectId,
+        att_date: date,
+        old_status: str,
+        new_status: str,
+    ) -> None:
+        """Move one day from old_status to new_status (for attendance updates)."""
+        if old_status == new_status:
+            return
+        await self.record_many(
+            db,
+            [
+                (employee_oid, att_date, old_status, -1),
+                (employee_oid, att_date, new_status, 1),
+            ],
+        )
+
+    async def record_many(
+        self, db: Any, changes: Iterable[Tuple[ObjectId, date, str, int]]
+    ) -> None:
+        """Apply many (employee_oid, date, status, delta) changes with one bulk_write."""
+        if not settings.ATTENDANCE_ROLLUPS_ENABLED:
+            return
+        merged: Dict[Tuple[ObjectId, datetime], Dict[str, int]] = {}
+        for employee_oid, att_date, status, delta in changes:
+            inc = merged.setdefault((employee_oid, month_start(att_date)), {})
+            inc[f"counts.{status}"] = inc.get(f"counts.{status}", 0) + delta
+        if not merged:
+            return
+        now_utc = datetime.now(timezone.utc)
+        ops = [
+            UpdateOne(
+                {"employee_id": employee_oid, "month": month},
+                {"$inc": inc, "$set": {"updated_at": now_utc}},
+                upsert=True,
+            )
+            for (employee_oid, month), inc in merged.items()
+        ]
+        try:
+            await db[self.collection_name].bulk_write(ops, ordered=False)
+        except PyMongoError as e:
+            # Rollups are derived data and the attendance write already happened: log, and
+            # let the rebuild script repair drift (why ATTENDANCE_ROLLUPS_ENABLED is opt-in)
+            logger.error(f"Error updating attendance rollups: {e}")
+
+    async def get_counts(
+        self,
+        db: Any,
+        employee_oids: List[ObjectId],
+        first_month: datetime,
+        last_month: datetime,
+    ) -> Dict[ObjectId, Dict[str, int]]:
+        """Sum per-status counters over [first_month, last_month] for each employee."""
+        totals: Dict[ObjectId, Dict[str, int]] = {}
+        try:
+            cursor = db[self.collection_name].find(
+                {
+                    "employee_id": {"$in": employee_oids},
+                    "month": {"$gte": first_month, "$lte": last_month},
+                },
+                {"_id": 0, "employee_id": 1, "counts": 1},
+            )
+            async for doc in cursor:
+                emp_totals = totals.setdefault(doc["employee_id"], {})
+                for status, count in (doc.get("counts") or {}).items():
+                    emp_totals[status] = emp_totals.get(status, 0) + count
+            return totals
+        except PyMongoError as e:
+            logger.error(f"Error reading attendance rollups: {e}")
+            raise
+
+    async def ensure_seeded(
+        self,
+        db: Any,
+        archived: Iterable[Tuple[ObjectId, datetime, Dict[str, int]]] = (),
+    ) -> int:
+        """
+        Rebuild unless the seeded marker is present (first start with rollups enabled, or
+        the first since they were disabled), so stats never read whole months from
+        missing or partial rollups. Returns document count.
+        """
+        try:
+            if await db[self.collection_name].find_one(SEEDED_MARKER, {"_id": 1}):
+                return 0
+        except PyMongoError as e:
+            logger.error(f"Error checking attendance rollups: {e}")
+            raise
+        return await self.rebuild(db, archived)
+
+    async def clear_seeded(self, db: Any) -> None:
+        """Drop the seeded marker (startup with rollups disabled: writes stop updating them)."""
+        try:
+            await db[self.collection_name].delete_one(SEEDED_MARKER)
+        except PyMongoError as e:
+            logger.error(f"Error clearing attendance rollup marker: {e}")
+            raise
+
+    async def rebuild(
+        self,
+        db: Any,
+        archived: Iterable[Tuple[ObjectId, datetime, Dict[str, int]]] = (),
+    ) -> int:
+        """
+        Recompute all rollups from the attendance collection, plus archived months'
+        (employee_id, month, counts) since those rows are no longer in it, then set the
+        seeded marker. Returns document count.
+        """
+        try:
+            await db["attendance"].aggregate(rebuild_pipeline()).to_list(length=None)
+            # Archived months have no rows left in attendance, so $set is exact and idempotent
+            ops = [
+                UpdateOne(
+                    {"employee_id": employee_oid, "month": month},
+                    {"$set": {"counts": dict(counts)}},
+                    upsert=True,
+                )
+                for employee_oid, month, counts in archived
+            ]
+            if ops:
+                await db[self.collection_name].bulk_write(ops, ordered=False)
+            await db[self.collection_name].update_one(
+                SEEDED_MARKER,
+                {"$set": {"seeded_at": datetime.now(timezone.utc)}},
+                upsert=True,
+            )
+            return int(await db[self.collection_name].count_documents(ROLLUPS))
+        except PyMongoError as e:
+            logger.error(f"Error rebuilding attendance rollups: {e}")
+            raise
+
+
+attendance_monthly_repository = AttendanceMonthlyRepository()
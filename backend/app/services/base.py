@@ -1,64 +1,359 @@
+import base64
+import binascii
 import logging
-from typing import Generic, TypeVar, Type, Optional, List, Dict, Any
+from typing import (
+    Generic,
+    TypeVar,
+    Type,
+    Optional,
+    List,
+    Dict,
+    Any,
+    Literal,
+    Tuple,
+    Union,
+)
 from datetime import datetime, timezone
 from pydantic import BaseModel
+from pymongo import ReturnDocument
 from pymongo.errors import DuplicateKeyError, PyMongoError
-from bson import ObjectId, errors as bson_errors
+from bson import ObjectId, errors as bson_errors, json_util
+
+from app.config.settings import settings
+from app.core.cache import TTLCache, write_versions
 
 logger = logging.getLogger(__name__)
 
 # Generic type variable for Pydantic models
 ModelType = TypeVar("ModelType", bound=BaseModel)
 
+# MongoDB server error code for unique index violations
+DUPLICATE_KEY_ERROR_CODE = 11000
+
+# How an offset page reports its total (see BaseRepository.get_page)
+CountMode = Literal["exact", "estimated", "cached", "none"]
+
+
+def as_stored(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return doc as MongoDB would hand it back: datetimes become naive UTC with millisecond
+    precision. Lets create paths build the response from the inserted dict instead of
+    re-reading it.
+    """
+    stored = {}
+    for key, value in doc.items():
+        if isinstance(value, datetime):
+            if value.tzinfo is not None:
+                value = value.astimezone(timezone.utc).replace(tzinfo=None)
+            value = value.replace(microsecond=value.microsecond // 1000 * 1000)
+        stored[key] = value
+    return stored
+
+
+def encode_cursor(sort_value: Any, object_id: ObjectId) -> str:
+    """Opaque keyset cursor: base64url of extended JSON {"v": sort key, "id": _id}."""
+    raw = json_util.dumps({"v": sort_value, "id": object_id})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, ObjectId]:
+    """Inverse of encode_cursor. Raises ValueError for malformed or foreign tokens."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json_util.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        object_id = data["id"]
+        if not isinstance(object_id, ObjectId):
+            raise TypeError("cursor id is not an ObjectId")
+        return data["v"], object_id
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor}") from e
+
+
+def _keyset_filter(
+    sort_field: str, direction: int, sort_value: Any, object_id: ObjectId
+) -> Dict[str, Any]:
+    """
+    Rows strictly after (sort_value, object_id) in (sort_field, _id) order `direction`.
+
+    The outer $gte/$lte bound lets the planner start the index scan at the cursor
+    instead of evaluating the $or from the beginning.
+    """
+    op, op_inclusive = ("$gt", "$gte") if direction == 1 else ("$lt", "$lte")
+    return {
+        sort_field: {op_inclusive: sort_value},
+        "$or": [
+            {sort_field: {op: sort_value}},
+            {sort_field: sort_value, "_id": {op: object_id}},
+        ],
+    }
+
 
 class BaseRepository(Generic[ModelType]):
     def __init__(self, collection_name: str):
         self.collection_name = collection_name
+        # count=cached totals: filter -> (write version, count)
+        self._count_cache: TTLCache[Tuple[int, int]] = TTLCache(
+            max_size=256, ttl_seconds=settings.LIST_COUNT_CACHE_TTL_SECONDS
+        )
 
-    async def get(self, db: Any, id: str) -> Optional[ModelType]:
+    def _written(self) -> None:
+        """Record a write to this collection; cached totals and ETags computed before it go stale."""
+        write_versions.record(self.collection_name)
+
+    async def get(
+        self, db: Any, id: str, projection: Optional[Dict[str, Any]] = None
+    ) -> Union[ModelType, Dict[str, Any], None]:
+        """Get by _id. With a projection the raw projected document is returned, not a model."""
         try:
             object_id = ObjectId(id)
         except (bson_errors.InvalidId, ValueError) as e:
             raise ValueError(f"Invalid ID format: {id}") from e
-        
+
         try:
-            document = await db[self.collection_name].find_one({"_id": object_id})
-            return self.model_class(**document) if document else None
+            document = await db[self.collection_name].find_one(
+                {"_id": object_id}, projection
+            )
+            if document is None or projection is not None:
+                return document
+            return self.model_class(**document)
         except PyMongoError as e:
             logger.error(f"Error getting document {id} from {self.collection_name}: {e}")
             raise
 
+    async def _find(
+        self,
+        db: Any,
+        filter_query: Dict[str, Any],
+        projection: Optional[Dict[str, Any]],
+        sort_query: List[tuple],
+        skip: int,
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """Raw documents for get_multi/get_multi_keyset; overridden where storage differs."""
+        cursor = (
+            db[self.collection_name]
+            .find(filter_query, projection)
+            .sort(sort_query)
+            .skip(skip)
+            .limit(limit)
+        )
+        return await cursor.to_list(length=limit)
+
+    def _source(self, filter_query: Dict[str, Any]) -> Tuple[str, List[Dict[str, Any]]]:
+        """(collection, leading pipeline stages) yielding the documents matching filter_query."""
+        return self.collection_name, [{"$match": filter_query}]
+
+    async def _find_with_count(
+        self,
+        db: Any,
+        filter_query: Dict[str, Any],
+        projection: Optional[Dict[str, Any]],
+        sort_query: List[tuple],
+        skip: int,
+        limit: int,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        One page plus the total in a single round trip: $match and $sort run ahead of the
+        $facet so they can still use an index; the facet splits the sorted stream into the
+        page and a $count.
+        """
+        collection, pipeline = self._source(filter_query)
+        page: List[Dict[str, Any]] = [{"$skip": skip}, {"$limit": limit}]
+        if projection:
+            page.append({"$project": projection})
+        pipeline += [
+            {"$sort": dict(sort_query)},
+            {"$facet": {"data": page, "total": [{"$count": "n"}]}},
+        ]
+        result = await db[collection].aggregate(pipeline).to_list(length=1)
+        facet = result[0] if result else {"data": [], "total": []}
+        return facet["data"], facet["total"][0]["n"] if facet["total"] else 0
+
+    async def get_page(
+        self,
+        db: Any,
+        skip: int = 0,
+        limit: int = 100,
+        filter_query: Optional[Dict[str, Any]] = None,
+        sort_query: Optional[List[tuple]] = None,
+        projection: Optional[Dict[str, Any]] = None,
+        count: CountMode = "exact",
+    ) -> Tuple[List[Any], Optional[int], bool]:
+        """
+        Offset page with its total per count strategy; returns (items, total, has_more).
+
+        exact: page and count_documents-equivalent total from one $facet aggregation.
+        estimated: estimated_count() when the filter allows it, else an exact count.
+        cached: cached_count(), reused until this collection is written or the TTL ends.
+        none: no total; one extra document is fetched to tell whether a next page exists.
+        Items are models, or raw dicts with a projection (as get_multi).
+        """
+        if filter_query is None:
+            filter_query = {}
+        if sort_query is None:
+            sort_query = [("created_at", -1)]
+
+        try:
+            total: Optional[int] = None
+            if count == "exact":
+                documents, total = await self._find_with_count(
+                    db, filter_query, projection, sort_query, skip, limit
+                )
+            elif count == "none":
+                documents = await self._find(
+                    db, filter_query, projection, sort_query, skip, limit + 1
+                )
+            else:
+                documents = await self._find(
+                    db, filter_query, projection, sort_query, skip, limit
+                )
+                if count == "estimated":
+                    total = await self.estimated_count(db, filter_query)
+                else:
+                    total = await self.cached_count(db, filter_query)
+        except PyMongoError as e:
+            logger.error(f"Error getting page from {self.collection_name}: {e}")
+            raise
+
+        if total is None:
+            has_more = len(documents) > limit
+            documents = documents[:limit]
+        else:
+            has_more = skip + len(documents) < total
+        if projection is None:
+            documents = [self.model_class(**doc) for doc in documents]
+        return documents, total, has_more
+
     async def get_multi(
-        self, db: Any, skip: int = 0, limit: int = 100,
+        self,
+        db: Any,
+        skip: int = 0,
+        limit: int = 100,
         filter_query: Optional[Dict[str, Any]] = None,
-        sort_query: Optional[List[tuple]] = None
-    ) -> List[ModelType]:
+        sort_query: Optional[List[tuple]] = None,
+        projection: Optional[Dict[str, Any]] = None,
+    ) -> List[Any]:
+        """
+        Offset page of documents. Without a projection each is validated into model_class;
+        with one, only the projected fields leave MongoDB and the raw dicts are returned
+        so callers can build lightweight response models from them directly.
+        """
         if filter_query is None:
             filter_query = {}
         if sort_query is None:
             sort_query = [("created_at", -1)]
-        
+
         try:
-            cursor = db[self.collection_name].find(filter_query).sort(sort_query).skip(skip).limit(limit)
-            documents = await cursor.to_list(length=limit)
+            documents = await self._find(
+                db, filter_query, projection, sort_query, skip, limit
+            )
+            if projection is not None:
+                return documents
             return [self.model_class(**doc) for doc in documents]
         except PyMongoError as e:
             logger.error(f"Error getting multiple documents from {self.collection_name}: {e}")
             raise
 
+    async def get_multi_keyset(
+        self,
+        db: Any,
+        limit: int = 100,
+        filter_query: Optional[Dict[str, Any]] = None,
+        sort_field: str = "created_at",
+        direction: int = -1,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        projection: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[List[Any], Optional[str], Optional[str]]:
+        """
+        Keyset (cursor) pagination over (sort_field, _id): every page costs the same as
+        the first because the cursor seeks into the index instead of skipping rows.
+
+        Returns (items, next_cursor, prev_cursor); a cursor is None when there is no
+        page in that direction. Raises ValueError for an invalid cursor. As with get_multi,
+        a projection returns raw dicts (sort_field is always fetched for the cursors).
+        """
+        if after and before:
+            raise ValueError("Use either after or before, not both")
+        # Paging backwards: walk the reversed order from the cursor, then flip the page
+        scan_direction = -direction if before else direction
+        cursor_token = before or after
+        position = decode_cursor(cursor_token) if cursor_token else None
+
+        try:
+            if projection is not None:
+                projection = {**projection, sort_field: 1}
+            documents = await self._find_keyset(
+                db,
+                filter_query or {},
+                projection,
+                sort_field,
+                scan_direction,
+                position,
+                limit + 1,
+            )
+        except PyMongoError as e:
+            logger.error(f"Error getting keyset page from {self.collection_name}: {e}")
+            raise
+
+        has_extra = len(documents) > limit
+        documents = documents[:limit]
+        if before:
+            documents.reverse()
+        if not documents:
+            return [], None, None
+
+        first, last = documents[0], documents[-1]
+        first_cursor = encode_cursor(first.get(sort_field), first["_id"])
+        last_cursor = encode_cursor(last.get(sort_field), last["_id"])
+        if before:
+            next_cursor, prev_cursor = last_cursor, (
+                first_cursor if has_extra else None
+            )
+        else:
+            next_cursor = last_cursor if has_extra else None
+            prev_cursor = first_cursor if after else None
+        if projection is None:
+            documents = [self.model_class(**doc) for doc in documents]
+        return documents, next_cursor, prev_cursor
+
+    async def _find_keyset(
+        self,
+        db: Any,
+        filter_query: Dict[str, Any],
+        projection: Optional[Dict[str, Any]],
+        sort_field: str,
+        direction: int,
+        position: Optional[Tuple[Any, ObjectId]],
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """Up to `limit` documents strictly after `position` in (sort_field, _id) order `direction`."""
+        conditions = [filter_query] if filter_query else []
+        if position is not None:
+            conditions.append(_keyset_filter(sort_field, direction, *position))
+        query = (
+            {"$and": conditions}
+            if len(conditions) > 1
+            else (conditions[0] if conditions else {})
+        )
+        sort_query = [(sort_field, direction), ("_id", direction)]
+        return await self._find(db, query, projection, sort_query, 0, limit)
+
+    def _document_for_insert(self, obj_in: ModelType) -> Dict[str, Any]:
+        """Document create() inserts for obj_in; overridden to add derived fields."""
+        return obj_in.model_dump()
+
     async def create(self, db: Any, obj_in: ModelType) -> ModelType:
         try:
-            obj_data = obj_in.model_dump()
+            obj_data = self._document_for_insert(obj_in)
             current_time = datetime.now(timezone.utc)
             obj_data["created_at"] = current_time
             obj_data["updated_at"] = current_time
-            
+
             result = await db[self.collection_name].insert_one(obj_data)
-            created_doc = await db[self.collection_name].find_one({"_id": result.inserted_id})
-            if not created_doc:
-                raise PyMongoError("Failed to retrieve created document")
-            
-            return self.model_class(**created_doc)
+            self._written()
+            obj_data["_id"] = result.inserted_id
+            return self.model_class(**as_stored(obj_data))
         except DuplicateKeyError:
             raise
         except PyMongoError as e:
@@ -68,28 +363,30 @@ class BaseRepository(Generic[ModelType]):
     async def update(
         self, db: Any, id: str, obj_in: ModelType
     ) -> Optional[ModelType]:
+        """Set the fields set on obj_in; returns the updated document, or None if it does not exist."""
         try:
             object_id = ObjectId(id)
         except (bson_errors.InvalidId, ValueError) as e:
             raise ValueError(f"Invalid ID format: {id}") from e
-        
+
         try:
             update_data = obj_in.model_dump(exclude_unset=True, exclude={"id", "_id"})
-            
+
             if not update_data:
                 return await self.get(db, id)
-            
+
             update_data["updated_at"] = datetime.now(timezone.utc)
-            
-            result = await db[self.collection_name].update_one(
-                {"_id": object_id}, {"$set": update_data}
+
+            # One round trip, and an unchanged document is still returned (not None)
+            updated_doc = await db[self.collection_name].find_one_and_update(
+                {"_id": object_id},
+                {"$set": update_data},
+                return_document=ReturnDocument.AFTER,
             )
-            
-            if result.modified_count > 0:
-                updated_doc = await db[self.collection_name].find_one({"_id": object_id})
-                return self.model_class(**updated_doc) if updated_doc else None
-            
-            return None
+            if updated_doc is None:
+                return None
+            self._written()
+            return self.model_class(**updated_doc)
         except DuplicateKeyError:
             raise
         except PyMongoError as e:
@@ -101,9 +398,11 @@ class BaseRepository(Generic[ModelType]):
             object_id = ObjectId(id)
         except (bson_errors.InvalidId, ValueError) as e:
             raise ValueError(f"Invalid ID format: {id}") from e
-        
+
         try:
             result = await db[self.collection_name].delete_one({"_id": object_id})
+            if result.deleted_count:
+                self._written()
             return result.deleted_count > 0
         except PyMongoError as e:
             logger.error(f"Error deleting document {id} from {self.collection_name}: {e}")
@@ -112,7 +411,7 @@ class BaseRepository(Generic[ModelType]):
     async def count(self, db: Any, filter_query: Optional[Dict[str, Any]] = None) -> int:
         if filter_query is None:
             filter_query = {}
-        
+
         try:
             count = await db[self.collection_name].count_documents(filter_query)
             return int(count)
@@ -120,6 +419,43 @@ class BaseRepository(Generic[ModelType]):
             logger.error(f"Error counting documents in {self.collection_name}: {e}")
             raise
 
+    async def _estimated_count(
+        self, db: Any, filter_query: Dict[str, Any]
+    ) -> Optional[int]:
+        """A total from metadata instead of a scan, or None when there is none for this filter."""
+        if filter_query:
+            return None
+        return int(await db[self.collection_name].estimated_document_count())
+
+    async def estimated_count(
+        self, db: Any, filter_query: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Cheap total where _estimated_count has one (may lag slightly), else an exact count."""
+        try:
+            estimate = await self._estimated_count(db, filter_query or {})
+        except PyMongoError as e:
+            logger.error(
+                f"Error estimating document count in {self.collection_name}: {e}"
+            )
+            raise
+        return estimate if estimate is not None else await self.count(db, filter_query)
+
+    async def cached_count(
+        self, db: Any, filter_query: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Exact count memoised per filter, tagged with the collection's write version so any
+        write through this process invalidates it; other workers' writes show within the TTL.
+        """
+        key = json_util.dumps(filter_query or {}, sort_keys=True)
+        version = write_versions.get(self.collection_name)
+        cached = self._count_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        total = await self.count(db, filter_query)
+        self._count_cache.set(key, (version, total))
+        return total
+
     async def exists(self, db: Any, filter_query: Dict[str, Any]) -> bool:
         try:
             count = await db[self.collection_name].count_documents(filter_query, limit=1)
@@ -137,7 +473,7 @@ class BaseRepository(Generic[ModelType]):
                 cursor = db[self.collection_name].find(filter_query).limit(1)
             else:
                 cursor = db[self.collection_name].find(filter_query).sort(sort_query).limit(1)
-            
+
             document = await cursor.to_list(length=1)
             return self.model_class(**document[0]) if document else None
         except PyMongoError as e:
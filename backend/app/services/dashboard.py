@@ -0,0 +1,173 @@
+import asyncio
+import logging
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List
+
+from pymongo.errors import PyMongoError
+
+from app.config.settings import settings
+from app.core.cache import TTLCache
+from app.services.attendance_buckets import rows_source
+from app.services.employee import NOT_DELETED
+
+logger = logging.getLogger(__name__)
+
+STATUS_FIELDS = {
+    "present": "present",
+    "absent": "absent",
+    "half-day": "half_day",
+    "leave": "leave",
+}
+
+
+def _empty_counts() -> Dict[str, int]:
+    return {field: 0 for field in STATUS_FIELDS.values()}
+
+
+class DashboardService:
+    """
+    Organisation "today" summary from one $facet over employees and one over attendance.
+
+    Results sit in a short-TTL in-process cache keyed by day; attendance writes call
+    invalidate() so a newly marked record shows up on the next poll.
+    """
+
+    def __init__(self) -> None:
+        self._cache: TTLCache[Dict[str, Any]] = TTLCache(
+            max_size=8, ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS
+        )
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._cache.clear()
+
+    async def get_summary(self, db: Any, day: date) -> Dict[str, Any]:
+        cached = self._cache.get(day)
+        if cached is not None:
+            return cached
+        # Concurrent misses wait for the first computation instead of all querying MongoDB
+        async with self._lock:
+            cached = self._cache.get(day)
+            if cached is not None:
+                return cached
+            summary = await self._compute_summary(db, day)
+            self._cache.set(day, summary)
+            return summary
+
+    async def _compute_summary(self, db: Any, day: date) -> Dict[str, Any]:
+        try:
+            employee_facets = (
+                await db["employees"]
+                .aggregate(
+                    [
+                        {"$match": NOT_DELETED},
+                        {
+                            "$facet": {
+                                "headcount": [{"$count": "n"}],
+                                "by_department": [
+                                    {
+                                        "$group": {
+                                            "_id": "$department",
+                                            "headcount": {"$sum": 1},
+                                        }
+                                    }
+                                ],
+                            }
+                        },
+                    ]
+                )
+                .to_list(length=1)
+            )
+            collection, day_rows = rows_source(
+                {
+                    "date": {
+                        "$gte": datetime.combine(day, datetime.min.time()),
+                        "$lte": datetime.combine(day, datetime.max.time()),
+                    }
+                }
+            )
+            attendance_facets = (
+                await db[collection]
+                .aggregate(
+                    [
+                        *day_rows,
+                        {
+                            "$lookup": {
+                                "from": "employees",
+                                "localField": "employee_id",
+                                "foreignField": "_id",
+                                "as": "employee",
+                            }
+                        },
+                        {"$unwind": "$employee"},
+                        {"$match": {"employee.is_active": True}},
+                        {
+                            "$facet": {
+                                "by_status": [
+                                    {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+                                ],
+                                "by_department": [
+                                    {
+                                        "$group": {
+                                            "_id": {
+                                                "department": "$employee.department",
+                                                "status": "$status",
+                                            },
+                                            "count": {"$sum": 1},
+                                        }
+                                    }
+                                ],
+                            }
+                        },
+                    ]
+                )
+                .to_list(length=1)
+            )
+        except PyMongoError as e:
+            logger.error(f"Error computing dashboard summary for {day}: {e}")
+            raise
+
+        emp = employee_facets[0] if employee_facets else {}
+        att = attendance_facets[0] if attendance_facets else {}
+        headcount = emp["headcount"][0]["n"] if emp.get("headcount") else 0
+
+        totals = _empty_counts()
+        for row in att.get("by_status", []):
+            field = STATUS_FIELDS.get(row["_id"])
+            if field:
+                totals[field] += row["count"]
+
+        departments: Dict[str, Dict[str, Any]] = {
+            row["_id"]: {
+                "department": row["_id"],
+                "headcount": row["headcount"],
+                **_empty_counts(),
+            }
+            for row in emp.get("by_department", [])
+        }
+        for row in att.get("by_department", []):
+            dept = row["_id"].get("department")
+            field = STATUS_FIELDS.get(row["_id"].get("status"))
+            if dept in departments and field:
+                departments[dept][field] += row["count"]
+
+        department_rows: List[Dict[str, Any]] = []
+        for dept in sorted(departments, key=lambda d: (d is None, d or "")):
+            row = departments[dept]
+            row["marked"] = sum(row[field] for field in STATUS_FIELDS.values())
+            row["unmarked"] = max(row["headcount"] - row["marked"], 0)
+            department_rows.append(row)
+
+        marked = sum(totals.values())
+        return {
+            "date": day,
+            "headcount": headcount,
+            **totals,
+            "marked": marked,
+            "unmarked": max(headcount - marked, 0),
+            "departments": department_rows,
+            "generated_at": datetime.now(timezone.utc),
+        }
+
+
+dashboard_service = DashboardService()
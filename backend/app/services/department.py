@@ -0,0 +1,113 @@
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+DEPARTMENT_COLLECTION = "departments"
+
+
+def rebuild_pipeline() -> List[Dict[str, Any]]:
+    """Aggregation over `employees` that recomputes every department document via $out."""
+    return [
+        {"$match": {"is_active": True}},
+        {"$group": {"_id": "$department", "active_count": {"$sum": 1}}},
+        {"$set": {"updated_at": "$$NOW"}},
+        {"$out": DEPARTMENT_COLLECTION},
+    ]
+
+
+class DepartmentRepository:
+    """
+    Per-department active headcount kept in step with the employees collection.
+
+    Documents: {_id: department name, active_count: int, updated_at}. EmployeeRepository
+    and the importer call adjust()/adjust_many() after creating, moving or soft-deleting
+    employees; each change is a single atomic $inc, so concurrent writers never lose
+    counts. Departments whose headcount drops to zero are kept (count 0).
+    """
+
+    def __init__(self) -> None:
+        self.collection_name = DEPARTMENT_COLLECTION
+
+    async def adjust(self, db: Any, department: str, delta: int) -> None:
+        """Apply +delta (or -delta) to one department; upserts the document."""
+        await self.adjust_many(db, {department: delta})
+
+    async def adjust_many(self, db: Any, deltas: Dict[str, int]) -> None:
+        """Apply many department deltas with one bulk_write."""
+        deltas = {
+            department: delta
+            for department, delta in deltas.items()
+            if department and delta
+        }
+        if not deltas:
+            return
+        now_utc = datetime.now(timezone.utc)
+        ops = [
+            UpdateOne(
+                {"_id": department},
+                {"$inc": {"active_count": delta}, "$set": {"updated_at": now_utc}},
+                upsert=True,
+            )
+            for department, delta in deltas.items()
+        ]
+        try:
+            await db[self.collection_name].bulk_write(ops, ordered=False)
+        except PyMongoError as e:
+            # Counts are derived data and the employee write already happened: log, and let
+            # readers re-count missing or zero headcounts and the rebuild script repair drift
+            logger.error(f"Error updating department counts: {e}")
+
+    async def get(self, db: Any, department: str) -> Optional[Dict[str, Any]]:
+        """{name, active_count} for one department, or None if it never had employees."""
+        try:
+            doc = await db[self.collection_name].find_one({"_id": department})
+        except PyMongoError as e:
+            logger.error(f"Error getting department {department}: {e}")
+            raise
+        return (
+            {"name": doc["_id"], "active_count": doc.get("active_count", 0)}
+            if doc
+            else None
+        )
+
+    async def get_all(
+        self, db: Any, include_empty: bool = False
+    ) -> List[Dict[str, Any]]:
+        """{name, active_count} for every department, by name; empty ones only on request."""
+        filter_query = {} if include_empty else {"active_count": {"$gt": 0}}
+        try:
+            cursor = db[self.collection_name].find(filter_query).sort([("_id", 1)])
+            return [
+                {"name": doc["_id"], "active_count": doc.get("active_count", 0)}
+                async for doc in cursor
+            ]
+        except PyMongoError as e:
+            logger.error(f"Error listing departments: {e}")
+            raise
+
+    async def ensure_seeded(self, db: Any) -> int:
+        """Rebuild when the collection is empty (first start after upgrading). Returns department count."""
+        try:
+            if await db[self.collection_name].estimated_document_count():
+                return 0
+        except PyMongoError as e:
+            logger.error(f"Error checking department counts: {e}")
+            raise
+        return await self.rebuild(db)
+
+    async def rebuild(self, db: Any) -> int:
+        """Recompute all department counts from the employees collection. Returns department count."""
+        try:
+            await db["employees"].aggregate(rebuild_pipeline()).to_list(length=None)
+            return int(await db[self.collection_name].count_documents({}))
+        except PyMongoError as e:
+            logger.error(f"Error rebuilding department counts: {e}")
+            raise
+
+
+department_repository = DepartmentRepository()
@@ -1,21 +1,48 @@
+import asyncio
 import logging
+import time
 from datetime import datetime, timezone
-from typing import Optional, List, Any, Type, Dict
+from typing import Optional, List, Any, Type, Dict, Tuple, Union
 from bson import ObjectId
-from pymongo.errors import PyMongoError
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError, PyMongoError
 
 from app.services.base import BaseRepository
+from app.services.department import department_repository
+from app.services.employee_directory import DIRECTORY_FIELDS, employee_directory
+from app.services.employee_search import (
+    SEARCH_FIELD_WEIGHTS,
+    field_keys,
+    query_keys,
+    query_terms,
+    rank,
+    search_key_fields,
+)
+from app.services.employee_suggest import SUGGEST_FIELDS, employee_suggest_index
+from app.core.exceptions import VersionConflictError
 from app.models.employee import EmployeeInDB
+from app.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
-# Exclude soft-deleted employees from all list/get operations
-NOT_DELETED = {"$or": [{"deleted_at": {"$exists": False}}, {"deleted_at": None}]}
+# Exclude soft-deleted employees from all list/get operations. Every employee carries
+# is_active (set on insert, cleared by soft delete), so this is one equality the partial
+# indexes (partialFilterExpression {is_active: true}) can serve.
+NOT_DELETED = {"is_active": True}
+
+# Employees per bulk write when backfilling search_keys
+_BACKFILL_BATCH = 1000
+
+
+def _version_filter(version: int) -> Any:
+    """Match a stored version; version 0 was stored before versioning, so the field is absent."""
+    return version if version else {"$exists": False}
 
 
 class EmployeeRepository(BaseRepository[EmployeeInDB]):
     def __init__(self) -> None:
         super().__init__(collection_name="employees")
+        self._suggest_refresh: Optional[asyncio.Task] = None
 
     @property
     def model_class(self) -> Type[EmployeeInDB]:
@@ -24,42 +51,112 @@ class EmployeeRepository(BaseRepository[EmployeeInDB]):
     @staticmethod
     def _and_not_deleted(filter_query: Dict[str, Any]) -> Dict[str, Any]:
         """Merge filter with NOT_DELETED so soft-deleted employees are excluded."""
-        if not filter_query:
-            return NOT_DELETED
-        return {"$and": [NOT_DELETED, filter_query]}
+        return {**filter_query, **NOT_DELETED}
 
     @staticmethod
     def build_list_filter(
         search: Optional[str] = None,
         department: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Build MongoDB filter for list endpoint; always excludes soft-deleted."""
-        conditions = [NOT_DELETED]
+        """
+        Build MongoDB filter for list endpoint; always excludes soft-deleted.
+
+        search becomes an $all over the multikey-indexed search_keys (see employee_search),
+        a superset of the real matches that search() then verifies and ranks. Raises
+        ValueError when the query is shorter than EMPLOYEE_SEARCH_MIN_LENGTH.
+        """
+        filter_query: Dict[str, Any] = dict(NOT_DELETED)
         if department:
-            conditions.append({"department": department})
+            filter_query["department"] = department
         if search and search.strip():
-            regex_pattern = f".*{search.strip()}.*"
-            conditions.append({
-                "$or": [
-                    {"full_name": {"$regex": regex_pattern, "$options": "i"}},
-                    {"email": {"$regex": regex_pattern, "$options": "i"}},
-                    {"employee_id": {"$regex": regex_pattern, "$options": "i"}},
-                    {"position": {"$regex": regex_pattern, "$options": "i"}},
-                ]
-            })
-        return {"$and": conditions} if len(conditions) > 1 else conditions[0]
+            filter_query["search_keys"] = {"$all": query_keys(query_terms(search))}
+        return filter_query
+
+    async def _estimated_count(
+        self, db: Any, filter_query: Dict[str, Any]
+    ) -> Optional[int]:
+        """
+        Active totals, overall or per department, from the maintained department headcounts.
+        A missing or zero headcount may be a lost $inc rather than an empty department, so
+        it gives None and the caller counts instead.
+        """
+        department = filter_query.get("department")
+        if filter_query == NOT_DELETED:
+            total = sum(
+                d["active_count"] for d in await department_repository.get_all(db)
+            )
+            return total or None
+        if filter_query == {**NOT_DELETED, "department": department} and isinstance(
+            department, str
+        ):
+            info = await department_repository.get(db, department)
+            return info["active_count"] if info and info["active_count"] > 0 else None
+        return None
+
+    async def search(
+        self,
+        db: Any,
+        search: str,
+        department: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        projection: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int], bool]:
+        """
+        Employees matching search, best match first (ties by full_name); returns
+        (page, total, has_more) like get_page.
 
-    async def get(self, db: Any, id: str) -> Optional[EmployeeInDB]:
-        """Get by _id; returns None if not found or soft-deleted."""
+        Candidates come from the search_keys index, are re-checked token by token and
+        ranked in process. Only EMPLOYEE_SEARCH_MAX_CANDIDATES are ranked: when the index
+        holds more, the ranking covers an arbitrary subset, so total is None (unknown) and
+        has_more only speaks for the ranked subset. Documents are raw dicts.
+        """
+        terms = query_terms(search)
+        filter_query = self.build_list_filter(search=search, department=department)
+        if projection is not None:
+            projection = {**projection, **{field: 1 for field in SEARCH_FIELD_WEIGHTS}}
+        max_candidates = settings.EMPLOYEE_SEARCH_MAX_CANDIDATES
+        try:
+            # One past the cap tells whether the candidates were cut off
+            cursor = (
+                db[self.collection_name]
+                .find(filter_query, projection)
+                .limit(max_candidates + 1)
+            )
+            candidates = await cursor.to_list(length=max_candidates + 1)
+        except PyMongoError as e:
+            logger.error(f"Error searching employees for {search!r}: {e}")
+            raise
+        truncated = len(candidates) > max_candidates
+        if truncated:
+            logger.info(
+                f"Employee search {search!r} has over {max_candidates} candidates; ranking a subset"
+            )
+        scored = [(rank(doc, terms), doc) for doc in candidates[:max_candidates]]
+        matches = [(score, doc) for score, doc in scored if score]
+        matches.sort(key=lambda item: (-item[0], item[1].get("full_name") or ""))
+        page = [doc for _, doc in matches[skip : skip + limit]]
+        return (
+            page,
+            None if truncated else len(matches),
+            skip + len(page) < len(matches),
+        )
+
+    async def get(
+        self, db: Any, id: str, projection: Optional[Dict[str, Any]] = None
+    ) -> Union[EmployeeInDB, Dict[str, Any], None]:
+        """Get by _id; returns None if not found or soft-deleted (raw dict when projected)."""
         try:
             object_id = ObjectId(id)
         except (Exception, TypeError):
             return None
         try:
             doc = await db[self.collection_name].find_one(
-                {"$and": [{"_id": object_id}, NOT_DELETED]}
+                self._and_not_deleted({"_id": object_id}), projection
             )
-            return self.model_class(**doc) if doc else None
+            if doc is None or projection is not None:
+                return doc
+            return self.model_class(**doc)
         except PyMongoError as e:
             logger.error(f"Error getting employee {id}: {e}")
             raise
@@ -78,6 +175,24 @@ class EmployeeRepository(BaseRepository[EmployeeInDB]):
             logger.error(f"Error getting employee by employee_id {employee_id}: {e}")
             raise
 
+    async def get_by_employee_ids(
+        self,
+        db: Any,
+        employee_ids: List[str],
+    ) -> Dict[str, EmployeeInDB]:
+        """Map upper-cased code -> active employee with one $in query; unknown codes are absent."""
+        codes = list({employee_id.upper() for employee_id in employee_ids})
+        try:
+            cursor = db[self.collection_name].find(
+                self._and_not_deleted({"employee_id": {"$in": codes}})
+            )
+            docs = await cursor.to_list(length=None)
+        except PyMongoError as e:
+            logger.error(f"Error getting employees by employee_id: {e}")
+            raise
+        employee_directory.put_many(docs)
+        return {doc["employee_id"]: self.model_class(**doc) for doc in docs}
+
     async def get_by_email(
         self,
         db: Any,
@@ -92,13 +207,221 @@ class EmployeeRepository(BaseRepository[EmployeeInDB]):
             logger.error(f"Error getting employee by email {email}: {e}")
             raise
 
+    async def resolve_oids(
+        self,
+        db: Any,
+        identifiers: List[str],
+        cached: bool = True,
+    ) -> Dict[str, ObjectId]:
+        """
+        Resolve many identifiers (MongoDB _id strings or employee codes) with one $in query.
+
+        Returns a map from each given identifier to the employee's ObjectId; identifiers
+        that match no active employee are absent from the result. Identifiers found in
+        the in-process employee directory skip MongoDB entirely unless cached=False, which
+        write paths pass: another worker may have soft-deleted the employee or handed the
+        code to someone new since this worker cached it.
+        """
+        resolved: Dict[str, ObjectId] = {}
+        oids: List[ObjectId] = []
+        codes: List[str] = []
+        for identifier in set(identifiers):
+            entry = employee_directory.get(identifier) if cached else None
+            if entry is not None:
+                if entry.get("deleted_at") is None:
+                    resolved[identifier] = entry["_id"]
+                continue
+            if ObjectId.is_valid(identifier) and len(identifier) == 24:
+                oids.append(ObjectId(identifier))
+            else:
+                codes.append(identifier.upper())
+        if not oids and not codes:
+            return resolved
+        lookup: List[Dict[str, Any]] = []
+        if oids:
+            lookup.append({"_id": {"$in": oids}})
+        if codes:
+            lookup.append({"employee_id": {"$in": codes}})
+        try:
+            cursor = db[self.collection_name].find(
+                self._and_not_deleted({"$or": lookup}),
+                {field: 1 for field in DIRECTORY_FIELDS},
+            )
+            docs = await cursor.to_list(length=None)
+        except PyMongoError as e:
+            logger.error(f"Error resolving employee identifiers: {e}")
+            raise
+        employee_directory.put_many(docs)
+        by_oid = {str(doc["_id"]): doc["_id"] for doc in docs}
+        by_code = {doc.get("employee_id"): doc["_id"] for doc in docs}
+        for identifier in identifiers:
+            if identifier in resolved:
+                continue
+            oid = by_oid.get(identifier) or by_code.get(identifier.upper())
+            if oid is not None:
+                resolved[identifier] = oid
+        return resolved
+
+    async def get_codes_by_department(
+        self,
+        db: Any,
+        department: str,
+    ) -> Dict[ObjectId, str]:
+        """Map _id -> employee code for every active employee in a department."""
+        try:
+            cursor = (
+                db[self.collection_name]
+                .find(
+                    self._and_not_deleted({"department": department}),
+                    {"_id": 1, "employee_id": 1},
+                )
+                .sort([("full_name", 1)])
+            )
+            return {doc["_id"]: doc["employee_id"] async for doc in cursor}
+        except PyMongoError as e:
+            logger.error(
+                f"Error getting employee codes for department {department}: {e}"
+            )
+            raise
+
+    async def get_profiles(
+        self,
+        db: Any,
+        oids: List[ObjectId],
+    ) -> Dict[ObjectId, Dict[str, Any]]:
+        """
+        Map _id -> {employee_id, full_name, department, position} with one $in query.
+
+        Soft-deleted employees are included so historical attendance still shows who it was.
+        Served from the employee directory where possible; only misses hit MongoDB.
+        """
+        profiles: Dict[ObjectId, Dict[str, Any]] = {}
+        misses: List[ObjectId] = []
+        for oid in set(oids):
+            entry = employee_directory.get_by_oid(oid)
+            if entry is None:
+                misses.append(oid)
+            else:
+                profiles[oid] = entry
+        if not misses:
+            return profiles
+        try:
+            cursor = db[self.collection_name].find(
+                {"_id": {"$in": misses}}, {field: 1 for field in DIRECTORY_FIELDS}
+            )
+            async for doc in cursor:
+                profiles[doc["_id"]] = employee_directory.put(doc)
+            return profiles
+        except PyMongoError as e:
+            logger.error(f"Error getting employee profiles: {e}")
+            raise
+
+    async def backfill_active_flag(self, db: Any) -> int:
+        """
+        Set is_active on employees stored before it existed (True unless deleted_at is set).
+        Idempotent; returns the number of documents updated.
+        """
+        missing = {"is_active": {"$exists": False}}
+        try:
+            # Equality with null matches both a missing and a null deleted_at
+            active = await db[self.collection_name].update_many(
+                {**missing, "deleted_at": None}, {"$set": {"is_active": True}}
+            )
+            deleted = await db[self.collection_name].update_many(
+                missing, {"$set": {"is_active": False}}
+            )
+            if active.modified_count or deleted.modified_count:
+                self._written()
+            return active.modified_count + deleted.modified_count
+        except PyMongoError as e:
+            logger.error(f"Error backfilling employee is_active: {e}")
+            raise
+
+    async def backfill_search_keys(self, db: Any) -> int:
+        """
+        Set search_keys and search_field_keys on employees stored without them (before
+        search existed, or by scripts writing to the collection directly), so search can
+        find them and updates can rebuild them. Idempotent; returns the number updated.
+        """
+        updated = 0
+        try:
+            cursor = db[self.collection_name].find(
+                {"search_field_keys": {"$exists": False}},
+                {field: 1 for field in SEARCH_FIELD_WEIGHTS},
+            )
+            while batch := await cursor.to_list(length=_BACKFILL_BATCH):
+                updates = [
+                    UpdateOne({"_id": doc["_id"]}, {"$set": search_key_fields(doc)})
+                    for doc in batch
+                ]
+                result = await db[self.collection_name].bulk_write(
+                    updates, ordered=False
+                )
+                updated += result.modified_count
+        except PyMongoError as e:
+            logger.error(f"Error backfilling employee search_keys: {e}")
+            raise
+        if updated:
+            self._written()
+        return updated
+
+    async def warm_directory(self, db: Any) -> int:
+        """Load up to EMPLOYEE_DIRECTORY_MAX_SIZE active employees into the directory."""
+        try:
+            cursor = (
+                db[self.collection_name]
+                .find(NOT_DELETED, {field: 1 for field in DIRECTORY_FIELDS})
+                .limit(settings.EMPLOYEE_DIRECTORY_MAX_SIZE)
+            )
+            return employee_directory.put_many(await cursor.to_list(length=None))
+        except PyMongoError as e:
+            logger.error(f"Error warming employee directory: {e}")
+            raise
+
+    async def load_suggest_index(self, db: Any) -> int:
+        """(Re)build the in-memory typeahead index from all active employees."""
+        try:
+            cursor = db[self.collection_name].find(
+                NOT_DELETED, {field: 1 for field in SUGGEST_FIELDS}
+            )
+            return employee_suggest_index.build(await cursor.to_list(length=None))
+        except PyMongoError as e:
+            logger.error(f"Error building employee suggest index: {e}")
+            raise
+
+    async def suggest(
+        self, db: Any, query: str, limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Typeahead matches from the in-memory index. MongoDB is only read to build the
+        index on first use; once it is older than EMPLOYEE_SUGGEST_REFRESH_SECONDS a
+        rebuild runs in the background while the current index keeps serving.
+        """
+        if not employee_suggest_index.loaded:
+            await self.load_suggest_index(db)
+        elif (
+            settings.EMPLOYEE_SUGGEST_REFRESH_SECONDS
+            and time.monotonic() - employee_suggest_index.loaded_at
+            > settings.EMPLOYEE_SUGGEST_REFRESH_SECONDS
+            and (self._suggest_refresh is None or self._suggest_refresh.done())
+        ):
+            self._suggest_refresh = asyncio.create_task(self._refresh_suggest_index(db))
+        return employee_suggest_index.suggest(query, limit)
+
+    async def _refresh_suggest_index(self, db: Any) -> None:
+        try:
+            await self.load_suggest_index(db)
+        except PyMongoError:
+            pass  # logged by load_suggest_index; the current index keeps serving
+
     async def get_by_department(
         self,
         db: Any,
         department: str,
         skip: int = 0,
         limit: int = 100,
-    ) -> List[EmployeeInDB]:
+        projection: Optional[Dict[str, Any]] = None,
+    ) -> List[Any]:
         try:
             filter_query = self._and_not_deleted({"department": department})
             sort_query = [("full_name", 1)]
@@ -108,6 +431,7 @@ class EmployeeRepository(BaseRepository[EmployeeInDB]):
                 limit=limit,
                 filter_query=filter_query,
                 sort_query=sort_query,
+                projection=projection,
             )
         except Exception as e:
             logger.error(f"Error getting employees by department {department}: {e}")
@@ -120,17 +444,129 @@ class EmployeeRepository(BaseRepository[EmployeeInDB]):
             return False
         now = datetime.now(timezone.utc)
         try:
+            # Only an active document matches, so concurrent deletes decrement the headcount once
             result = await db[self.collection_name].update_one(
-                {"_id": ObjectId(employee.id)},
-                {"$set": {"deleted_at": now, "updated_at": now}},
+                self._and_not_deleted({"_id": ObjectId(employee.id)}),
+                {"$set": {"deleted_at": now, "is_active": False, "updated_at": now}},
             )
-            return result.modified_count > 0
         except PyMongoError as e:
             logger.error(f"Error soft-deleting employee {employee_id}: {e}")
             raise
+        employee_directory.invalidate(ObjectId(employee.id), employee.employee_id)
+        employee_suggest_index.remove(employee.id)
+        if result.modified_count == 0:
+            return False
+        self._written()
+        await department_repository.adjust(db, employee.department, -1)
+        return True
+
+    def _document_for_insert(self, obj_in: EmployeeInDB) -> Dict[str, Any]:
+        doc = obj_in.model_dump()
+        doc.update(search_key_fields(doc))
+        doc["is_active"] = True
+        doc["version"] = 1
+        return doc
 
     async def create(self, db: Any, obj_in: EmployeeInDB) -> EmployeeInDB:
-        return await super().create(db, obj_in)
+        employee = await super().create(db, obj_in)
+        await department_repository.adjust(db, employee.department, 1)
+        employee_directory.put(employee.model_dump())
+        employee_suggest_index.add(employee.model_dump())
+        return employee
+
+    async def update(
+        self, db: Any, id: str, obj_in: EmployeeInDB
+    ) -> Optional[EmployeeInDB]:
+        """Update by _id with the fields set on obj_in (see _update_active)."""
+        try:
+            object_id = ObjectId(id)
+        except Exception as e:
+            raise ValueError(f"Invalid ID format: {id}") from e
+        changes = obj_in.model_dump(exclude_unset=True, exclude={"id", "version"})
+        return await self._update_active(db, {"_id": object_id}, changes)
+
+    async def patch(
+        self,
+        db: Any,
+        employee_id: str,
+        changes: Dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> Optional[EmployeeInDB]:
+        """
+        Partial update of an active employee by code. With expected_version the write only
+        applies if the stored version still matches (VersionConflictError otherwise).
+        Returns None if there is no such employee.
+        """
+        filter_query = {"employee_id": employee_id.upper()}
+        updated = await self._update_active(db, filter_query, changes, expected_version)
+        if updated is None and expected_version is not None:
+            if await self.exists(db, self._and_not_deleted(filter_query)):
+                raise VersionConflictError("Employee", employee_id, expected_version)
+        return updated
+
+    async def _update_active(
+        self,
+        db: Any,
+        filter_query: Dict[str, Any],
+        changes: Dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> Optional[EmployeeInDB]:
+        """
+        $set changes and increment version on one active employee in a single
+        find_one_and_update returning the new document; None if nothing matched (no such
+        employee, or not at expected_version).
+
+        The update is a pipeline so MongoDB does the dependent work: search_keys are
+        rebuilt from search_field_keys with only the changed fields' keys replaced, and a
+        department move records previous_department, which tells the departments
+        collection whose headcount to move.
+        """
+        query = self._and_not_deleted(filter_query)
+        if expected_version is not None:
+            query["version"] = _version_filter(expected_version)
+        written = {**changes, "updated_at": datetime.now(timezone.utc)}
+        fields: Dict[str, Any] = {
+            name: {"$literal": value} for name, value in written.items()
+        }
+        fields["version"] = {"$add": [{"$ifNull": ["$version", 0]}, 1]}
+        if "department" in changes:
+            fields["previous_department"] = "$department"
+        pipeline = [{"$set": fields}]
+        changed_keys = {
+            field: field_keys(changes[field])
+            for field in SEARCH_FIELD_WEIGHTS
+            if field in changes
+        }
+        if changed_keys:
+            for field, keys in changed_keys.items():
+                fields[f"search_field_keys.{field}"] = {"$literal": keys}
+            all_keys = [
+                {"$ifNull": [f"$search_field_keys.{field}", []]}
+                for field in SEARCH_FIELD_WEIGHTS
+            ]
+            pipeline.append({"$set": {"search_keys": {"$setUnion": all_keys}}})
+        try:
+            after = await db[self.collection_name].find_one_and_update(
+                query, pipeline, return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            raise
+        except PyMongoError as e:
+            logger.error(f"Error updating employee {filter_query}: {e}")
+            raise
+        if after is None:
+            return None
+
+        self._written()
+        moved_from = after.get("previous_department")
+        if "department" in changes and moved_from != after.get("department"):
+            await department_repository.adjust_many(
+                db, {moved_from: -1, after.get("department"): 1}
+            )
+        employee_directory.invalidate(after["_id"])
+        updated = self.model_class(**after)
+        employee_suggest_index.add(updated.model_dump())
+        return updated
 
 
 # Create singleton instance
@@ -0,0 +1,98 @@
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+from bson import ObjectId
+
+from app.config.settings import settings
+from app.core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Fields kept per employee; enough to resolve identifiers, render attendance rows and
+# answer If-None-Match on GET /employees/{id} from the version
+DIRECTORY_FIELDS = (
+    "employee_id",
+    "full_name",
+    "email",
+    "department",
+    "position",
+    "deleted_at",
+    "version",
+)
+
+
+def directory_entry(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Directory entry for an employee document (or a model dump with "id")."""
+    oid = doc.get("_id") or doc.get("id")
+    entry = {field: doc.get(field) for field in DIRECTORY_FIELDS}
+    entry["_id"] = oid if isinstance(oid, ObjectId) else ObjectId(oid)
+    return entry
+
+
+class EmployeeDirectory:
+    """
+    In-process employee code ↔ _id ↔ basic profile map in front of the employees collection.
+
+    Entries live in two TTLCaches (by upper-cased code and by _id) sharing the same dict,
+    bounded by EMPLOYEE_DIRECTORY_MAX_SIZE and expiring after EMPLOYEE_DIRECTORY_TTL_SECONDS.
+    EmployeeRepository reads through it and calls put()/invalidate() on create, update and
+    soft delete; other workers converge within the TTL. Only hits are cached, so an unknown
+    code always reaches MongoDB.
+    """
+
+    def __init__(self) -> None:
+        self._by_code: TTLCache[Dict[str, Any]] = TTLCache(
+            max_size=settings.EMPLOYEE_DIRECTORY_MAX_SIZE,
+            ttl_seconds=settings.EMPLOYEE_DIRECTORY_TTL_SECONDS,
+        )
+        self._by_oid: TTLCache[Dict[str, Any]] = TTLCache(
+            max_size=settings.EMPLOYEE_DIRECTORY_MAX_SIZE,
+            ttl_seconds=settings.EMPLOYEE_DIRECTORY_TTL_SECONDS,
+        )
+
+    def get(self, identifier: str) -> Optional[Dict[str, Any]]:
+        """Entry for a MongoDB _id string or an employee code, or None on a miss."""
+        if ObjectId.is_valid(identifier) and len(identifier) == 24:
+            return self._by_oid.get(ObjectId(identifier))
+        return self._by_code.get(identifier.upper())
+
+    def get_by_oid(self, oid: ObjectId) -> Optional[Dict[str, Any]]:
+        return self._by_oid.get(oid)
+
+    def put(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        entry = directory_entry(doc)
+        self._by_oid.set(entry["_id"], entry)
+        # Codes of soft-deleted employees can be reused, so only active ones are keyed by code
+        if entry.get("employee_id") and entry.get("deleted_at") is None:
+            self._by_code.set(entry["employee_id"], entry)
+        return entry
+
+    def put_many(self, docs: Iterable[Dict[str, Any]]) -> int:
+        count = 0
+        for doc in docs:
+            self.put(doc)
+            count += 1
+        return count
+
+    def invalidate(
+        self, oid: Optional[ObjectId] = None, code: Optional[str] = None
+    ) -> None:
+        """Drop an employee by _id and/or code (both keys go, whichever is given)."""
+        if oid is not None:
+            entry = self._by_oid.pop(oid)
+            if entry and entry.get("employee_id"):
+                self._by_code.invalidate(entry["employee_id"])
+        if code is not None:
+            entry = self._by_code.pop(code.upper())
+            if entry:
+                self._by_oid.invalidate(entry["_id"])
+
+    def clear(self) -> None:
+        self._by_code.clear()
+        self._by_oid.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"by_code": self._by_code.stats(), "by_id": self._by_oid.stats()}
+
+
+employee_directory = EmployeeDirectory()
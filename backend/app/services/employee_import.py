@@ -0,0 +1,214 @@
+import csv
+import io
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, IO, Iterable, Iterator, List, Literal, Optional, Set
+
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from app.config.settings import settings
+from app.core.cache import write_versions
+from app.models.employee import EmployeeCreate
+from app.services.base import DUPLICATE_KEY_ERROR_CODE
+from app.services.department import department_repository
+from app.services.employee_search import search_key_fields
+from app.services.employee_suggest import employee_suggest_index
+
+logger = logging.getLogger(__name__)
+
+ImportFormat = Literal["csv", "json", "ndjson"]
+
+
+def iter_rows(stream: IO[bytes], fmt: ImportFormat) -> Iterator[Any]:
+    """
+    Yield raw row dicts from an uploaded file without loading it whole.
+
+    CSV and NDJSON are read line by line; a JSON array is parsed in one go, so prefer
+    NDJSON for very large JSON uploads.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        for row in csv.DictReader(text):
+            # Empty CSV cells mean "not provided" (e.g. optional position)
+            yield {
+                k.strip(): v.strip()
+                for k, v in row.items()
+                if k and v is not None and v.strip()
+            }
+    elif fmt == "ndjson":
+        for line in text:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # Reported per row by the importer instead of aborting the upload
+                    yield None
+    else:
+        data = json.load(text)
+        if not isinstance(data, list):
+            raise ValueError("JSON import must be an array of employee objects")
+        yield from data
+
+
+def _validation_messages(e: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(x) for x in err.get('loc', ())) or 'row'}: {err.get('msg')}"
+        for err in e.errors()
+    ]
+
+
+class EmployeeImporter:
+    """
+    Create employees in bulk. Rows are validated with EmployeeCreate, checked against
+    existing IDs/emails with two $in queries per chunk, and inserted with one unordered
+    insert_many per chunk, so memory is bounded by the chunk size.
+    """
+
+    collection_name = "employees"
+
+    async def run(
+        self, db: Any, rows: Iterable[Any], batch_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        report: Dict[str, Any] = {"total": 0, "created": 0, "failed": 0, "errors": []}
+        # Keys seen earlier in this upload; catches duplicates across chunks
+        seen_ids: Set[str] = set()
+        seen_emails: Set[str] = set()
+        chunk: List[Dict[str, Any]] = []
+        for raw in rows:
+            report["total"] += 1
+            chunk.append({"row": report["total"], "raw": raw})
+            if len(chunk) >= batch_size:
+                await self._import_chunk(db, chunk, seen_ids, seen_emails, report)
+                chunk = []
+        if chunk:
+            await self._import_chunk(db, chunk, seen_ids, seen_emails, report)
+        report["errors"].sort(key=lambda err: err["row"])
+        return report
+
+    @staticmethod
+    def _fail(
+        report: Dict[str, Any], row: int, employee_id: Optional[str], errors: List[str]
+    ) -> None:
+        report["failed"] += 1
+        report["errors"].append(
+            {"row": row, "employee_id": employee_id, "errors": errors}
+        )
+
+    async def _import_chunk(
+        self,
+        db: Any,
+        chunk: List[Dict[str, Any]],
+        seen_ids: Set[str],
+        seen_emails: Set[str],
+        report: Dict[str, Any],
+    ) -> None:
+        valid: List[Dict[str, Any]] = []
+        for item in chunk:
+            raw = item["raw"]
+            if not isinstance(raw, dict):
+                self._fail(
+                    report, item["row"], None, ["row: invalid or non-object record"]
+                )
+                continue
+            try:
+                employee = EmployeeCreate.model_validate(raw)
+            except ValidationError as e:
+                raw_id = raw.get("employee_id") or raw.get("employeeId")
+                self._fail(report, item["row"], raw_id, _validation_messages(e))
+                continue
+            valid.append({"row": item["row"], "employee": employee})
+        if not valid:
+            return
+
+        ids = [v["employee"].employee_id for v in valid]
+        emails = [v["employee"].email for v in valid]
+        try:
+            # The unique indexes are partial on active employees, so codes/emails of
+            # soft-deleted employees may be reused
+            existing_ids = {
+                doc["employee_id"]
+                async for doc in db[self.collection_name].find(
+                    {"employee_id": {"$in": ids}, "is_active": True},
+                    {"_id": 0, "employee_id": 1},
+                )
+            }
+            existing_emails = {
+                doc["email"]
+                async for doc in db[self.collection_name].find(
+                    {"email": {"$in": emails}, "is_active": True},
+                    {"_id": 0, "email": 1},
+                )
+            }
+        except PyMongoError as e:
+            logger.error(f"Error checking existing employees during import: {e}")
+            raise
+
+        now_utc = datetime.now(timezone.utc)
+        docs: List[Dict[str, Any]] = []
+        doc_rows: List[Dict[str, Any]] = []
+        for v in valid:
+            employee: EmployeeCreate = v["employee"]
+            errors = []
+            if employee.employee_id in existing_ids:
+                errors.append(f"Employee with ID {employee.employee_id} already exists")
+            elif employee.employee_id in seen_ids:
+                errors.append(f"Duplicate employee ID {employee.employee_id} in upload")
+            if employee.email in existing_emails:
+                errors.append(f"Employee with email {employee.email} already exists")
+            elif employee.email in seen_emails:
+                errors.append(f"Duplicate email {employee.email} in upload")
+            seen_ids.add(employee.employee_id)
+            seen_emails.add(employee.email)
+            if errors:
+                self._fail(report, v["row"], employee.employee_id, errors)
+                continue
+            doc = employee.model_dump()
+            docs.append(
+                {
+                    **doc,
+                    **search_key_fields(doc),
+                    "is_active": True,
+                    "version": 1,
+                    "created_at": now_utc,
+                    "updated_at": now_utc,
+                }
+            )
+            doc_rows.append(v)
+        if not docs:
+            return
+
+        failed_positions: Dict[int, Dict[str, Any]] = {}
+        try:
+            await db[self.collection_name].insert_many(docs, ordered=False)
+        except BulkWriteError as bwe:
+            for write_error in bwe.details.get("writeErrors", []):
+                failed_positions[write_error["index"]] = write_error
+        except PyMongoError as e:
+            logger.error(f"Error inserting employees during import: {e}")
+            raise
+
+        if len(failed_positions) < len(docs):
+            write_versions.record(self.collection_name)
+        headcounts: Dict[str, int] = {}
+        for pos, v in enumerate(doc_rows):
+            write_error = failed_positions.get(pos)
+            if write_error is None:
+                report["created"] += 1
+                headcounts[docs[pos]["department"]] = (
+                    headcounts.get(docs[pos]["department"], 0) + 1
+                )
+                employee_suggest_index.add(docs[pos])
+                continue
+            employee = v["employee"]
+            if write_error.get("code") == DUPLICATE_KEY_ERROR_CODE:
+                message = "Employee with this ID or email already exists"
+            else:
+                message = write_error.get("errmsg", "Failed to create employee")
+            self._fail(report, v["row"], employee.employee_id, [message])
+        await department_repository.adjust_many(db, headcounts)
+
+
+employee_importer = EmployeeImporter()
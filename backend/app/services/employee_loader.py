@@ -0,0 +1,57 @@
+from typing import Any, Dict, Iterable, Optional
+
+from bson import ObjectId
+
+from app.core.loader import DataLoader
+from app.models.employee import EmployeeInDB
+from app.services.employee import employee_repository
+
+
+class EmployeeLoader:
+    """
+    Per-request batching front for employee lookups (inject with get_employee_loader).
+
+    Lookups issued in the same event-loop tick share one call: resolve_oids and
+    get_profiles answer from the employee directory and read MongoDB only for misses;
+    active_oid and employee always issue one $in read, since writes must not trust the
+    directory and it holds no full documents. A key already looked up in this request
+    is answered from memory.
+    """
+
+    def __init__(self, db: Any) -> None:
+        self._oids: DataLoader[str, ObjectId] = DataLoader(
+            lambda identifiers: employee_repository.resolve_oids(db, identifiers)
+        )
+        self._active_oids: DataLoader[str, ObjectId] = DataLoader(
+            lambda identifiers: employee_repository.resolve_oids(
+                db, identifiers, cached=False
+            )
+        )
+        self._employees: DataLoader[str, EmployeeInDB] = DataLoader(
+            lambda codes: employee_repository.get_by_employee_ids(db, codes)
+        )
+        self._profiles: DataLoader[ObjectId, Dict[str, Any]] = DataLoader(
+            lambda oids: employee_repository.get_profiles(db, oids)
+        )
+
+    async def oid(self, identifier: str) -> Optional[ObjectId]:
+        """Active employee's _id for a code or _id string (as resolve_oids), or None."""
+        return await self._oids.load(identifier)
+
+    async def active_oid(self, identifier: str) -> Optional[ObjectId]:
+        """As oid(), but checked against MongoDB rather than the directory; for writes."""
+        return await self._active_oids.load(identifier)
+
+    async def oids(self, identifiers: Iterable[str]) -> Dict[str, ObjectId]:
+        """Identifier -> _id for those that match an active employee (as resolve_oids)."""
+        return await self._oids.load_many(identifiers)
+
+    async def employee(self, employee_id: str) -> Optional[EmployeeInDB]:
+        """Active employee by code (as get_by_employee_id), or None."""
+        return await self._employees.load(employee_id.upper())
+
+    async def profiles(
+        self, oids: Iterable[ObjectId]
+    ) -> Dict[ObjectId, Dict[str, Any]]:
+        """_id -> directory profile, soft-deleted employees included (as get_profiles)."""
+        return await self._profiles.load_many(oids)
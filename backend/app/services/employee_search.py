@@ -0,0 +1,123 @@
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Set
+
+from app.config.settings import settings
+
+# Searchable fields and their weight when ranking matches
+SEARCH_FIELD_WEIGHTS = {"employee_id": 4, "full_name": 3, "email": 2, "position": 1}
+
+# Gram length for infix matching; shorter query terms fall back to token-prefix keys
+GRAM_SIZE = 3
+
+# How a query term matched a token, best first
+_EXACT, _PREFIX, _INFIX = 3, 2, 1
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def normalize(text: str) -> str:
+    """Case- and accent-insensitive form: NFKD with combining marks dropped, casefolded."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def tokenize(text: Any) -> List[str]:
+    """Alphanumeric runs of the normalised text ("john.smith@x.com" -> john, smith, x, com)."""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(normalize(str(text)))
+
+
+def _token_keys(token: str) -> Set[str]:
+    keys = {"^" + token[:n] for n in range(1, min(len(token), GRAM_SIZE - 1) + 1)}
+    keys.update(token[i : i + GRAM_SIZE] for i in range(len(token) - GRAM_SIZE + 1))
+    return keys
+
+
+def field_keys(value: Any) -> List[str]:
+    """
+    Keys one field value contributes to `search_keys`: every token's trigrams (infix
+    matches) and its 1- and 2-character prefixes marked with "^" (short query terms).
+    """
+    keys: Set[str] = set()
+    for token in tokenize(value):
+        keys |= _token_keys(token)
+    return sorted(keys)
+
+
+def search_keys(doc: Dict[str, Any]) -> List[str]:
+    """Keys stored in an employee's `search_keys` array (multikey-indexed): all fields' field_keys."""
+    keys: Set[str] = set()
+    for field in SEARCH_FIELD_WEIGHTS:
+        keys.update(field_keys(doc.get(field)))
+    return sorted(keys)
+
+
+def search_key_fields(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Search fields to store on an employee document: `search_keys`, plus the keys of each
+    field in `search_field_keys` so an update can rebuild search_keys in MongoDB from the
+    fields it changes, without reading the others first (see EmployeeRepository.patch).
+    """
+    per_field = {field: field_keys(doc.get(field)) for field in SEARCH_FIELD_WEIGHTS}
+    return {
+        "search_keys": sorted(set().union(*per_field.values())),
+        "search_field_keys": per_field,
+    }
+
+
+def query_terms(search: str) -> List[str]:
+    """Distinct query tokens; ValueError when shorter than EMPLOYEE_SEARCH_MIN_LENGTH."""
+    terms = list(dict.fromkeys(tokenize(search)))
+    if sum(len(term) for term in terms) < settings.EMPLOYEE_SEARCH_MIN_LENGTH:
+        raise ValueError(
+            f"search must contain at least {settings.EMPLOYEE_SEARCH_MIN_LENGTH} letters or digits"
+        )
+    return terms
+
+
+def query_keys(terms: Iterable[str]) -> List[str]:
+    """Keys every matching document must carry: a superset filter for the $all lookup."""
+    keys: Set[str] = set()
+    for term in terms:
+        if len(term) >= GRAM_SIZE:
+            keys.update(
+                term[i : i + GRAM_SIZE] for i in range(len(term) - GRAM_SIZE + 1)
+            )
+        else:
+            keys.add("^" + term)
+    return sorted(keys)
+
+
+def _term_match(term: str, tokens: List[str]) -> int:
+    best = 0
+    for token in tokens:
+        if token == term:
+            return _EXACT
+        if token.startswith(term):
+            best = _PREFIX
+        elif best < _INFIX and len(term) >= GRAM_SIZE and term in token:
+            best = _INFIX
+    return best
+
+
+def rank(doc: Dict[str, Any], terms: List[str]) -> int:
+    """
+    Match quality of doc for the query terms; 0 when some term does not really match
+    (the key lookup only guarantees the grams are present, possibly from different tokens).
+
+    Each term scores its best field weight × match kind (exact token > token prefix >
+    infix); terms of two characters or fewer only match token prefixes.
+    """
+    field_tokens = {field: tokenize(doc.get(field)) for field in SEARCH_FIELD_WEIGHTS}
+    score = 0
+    for term in terms:
+        best = max(
+            weight * _term_match(term, field_tokens[field])
+            for field, weight in SEARCH_FIELD_WEIGHTS.items()
+        )
+        if not best:
+            return 0
+        score += best
+    return score
@@ -0,0 +1,131 @@
+import time
+from bisect import bisect_left, insort
+from typing import Any, Dict, List, Set, Tuple
+
+from bson import ObjectId
+
+from app.services.employee_search import normalize, tokenize
+
+# Fields returned with each suggestion
+SUGGEST_FIELDS = ("employee_id", "full_name", "email", "department", "position")
+
+# Most prefix matches examined per query; bounds one-letter queries on large directories
+SUGGEST_SCAN_LIMIT = 500
+
+
+def _entry(employee_id: str, doc: Dict[str, Any]) -> Dict[str, Any]:
+    return {"id": employee_id, **{field: doc.get(field) for field in SUGGEST_FIELDS}}
+
+
+def suggest_keys(doc: Dict[str, Any]) -> Set[str]:
+    """
+    Prefix-searchable keys: name words, plus the email local part and the employee code
+    both split ("john", "smith") and joined ("johnsmith"), so "john.sm" and "EMP-00" match.
+    """
+    keys = set(tokenize(doc.get("full_name")))
+    local_part = (doc.get("email") or "").split("@", 1)[0]
+    for value in (local_part, doc.get("employee_id")):
+        tokens = tokenize(value)
+        keys.update(tokens)
+        if len(tokens) > 1:
+            keys.add("".join(tokens))
+    return keys
+
+
+class EmployeeSuggestIndex:
+    """
+    In-memory prefix index over active employees for typeahead.
+
+    A sorted array of (key, _id) pairs is bisected to the first key starting with the
+    query, then walked while keys still match, so a lookup is O(log n + matches) with no
+    MongoDB round trip. EmployeeRepository builds it (at startup, or lazily on first use),
+    keeps it in step with this worker's employee writes, and rebuilds it in the background
+    every EMPLOYEE_SUGGEST_REFRESH_SECONDS to pick up other workers' writes.
+    """
+
+    def __init__(self) -> None:
+        self._keys: List[Tuple[str, str]] = []
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._keys_by_id: Dict[str, Set[str]] = {}
+        self._sort_names: Dict[str, str] = {}
+        self.loaded_at: float = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def build(self, docs: List[Dict[str, Any]]) -> int:
+        """Replace the index with docs (active employees)."""
+        keys: List[Tuple[str, str]] = []
+        entries: Dict[str, Dict[str, Any]] = {}
+        keys_by_id: Dict[str, Set[str]] = {}
+        sort_names: Dict[str, str] = {}
+        for doc in docs:
+            employee_id = str(doc.get("_id") or doc.get("id"))
+            entries[employee_id] = _entry(employee_id, doc)
+            keys_by_id[employee_id] = suggest_keys(doc)
+            sort_names[employee_id] = normalize(doc.get("full_name") or "")
+            keys.extend((key, employee_id) for key in keys_by_id[employee_id])
+        keys.sort()
+        self._keys, self._entries, self._keys_by_id = keys, entries, keys_by_id
+        self._sort_names = sort_names
+        self.loaded_at = time.monotonic()
+        return len(entries)
+
+    def add(self, doc: Dict[str, Any]) -> None:
+        """Insert or replace one employee."""
+        employee_id = str(doc.get("_id") or doc.get("id"))
+        self.remove(employee_id)
+        self._entries[employee_id] = _entry(employee_id, doc)
+        self._keys_by_id[employee_id] = suggest_keys(doc)
+        self._sort_names[employee_id] = normalize(doc.get("full_name") or "")
+        for key in self._keys_by_id[employee_id]:
+            insort(self._keys, (key, employee_id))
+
+    def remove(self, employee_id: Any) -> None:
+        employee_id = (
+            str(employee_id) if isinstance(employee_id, ObjectId) else employee_id
+        )
+        self._entries.pop(employee_id, None)
+        self._sort_names.pop(employee_id, None)
+        for key in self._keys_by_id.pop(employee_id, ()):
+            i = bisect_left(self._keys, (key, employee_id))
+            if i < len(self._keys) and self._keys[i] == (key, employee_id):
+                del self._keys[i]
+
+    def suggest(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Employees with a key starting with every query word, best first: an exact key
+        match beats a prefix match, then by full name.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        # Walk the prefix range of the longest (most selective) word
+        lead = max(terms, key=len)
+        candidates: Dict[str, int] = {}
+        i = bisect_left(self._keys, (lead,))
+        while i < len(self._keys) and len(candidates) < SUGGEST_SCAN_LIMIT:
+            key, employee_id = self._keys[i]
+            if not key.startswith(lead):
+                break
+            rank = 0 if key == lead else 1
+            candidates[employee_id] = min(rank, candidates.get(employee_id, rank))
+            i += 1
+        others = [term for term in terms if term != lead]
+        matches = [
+            (rank, employee_id)
+            for employee_id, rank in candidates.items()
+            if all(
+                any(key.startswith(term) for key in self._keys_by_id[employee_id])
+                for term in others
+            )
+        ]
+        matches.sort(key=lambda m: (m[0], self._sort_names[m[1]]))
+        return [dict(self._entries[employee_id]) for _, employee_id in matches[:limit]]
+
+
+employee_suggest_index = EmployeeSuggestIndex()
@@ -0,0 +1,154 @@
+import csv
+import io
+import json
+import logging
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, List, Literal, Tuple
+
+from bson import ObjectId
+
+from app.config.settings import settings
+from app.services.attendance_archive import attendance_archive
+from app.services.attendance_buckets import find_rows
+from app.services.employee import NOT_DELETED
+
+logger = logging.getLogger(__name__)
+
+ExportFormat = Literal["csv", "ndjson"]
+
+EMPLOYEE_COLUMNS = [
+    "employee_id",
+    "full_name",
+    "email",
+    "department",
+    "position",
+    "status",
+    "created_at",
+]
+ATTENDANCE_COLUMNS = [
+    "employee_id",
+    "employee_name",
+    "department",
+    "date",
+    "status",
+    "notes",
+    "marked_by",
+    "marked_at",
+]
+
+# Flush the output buffer once it holds roughly this many characters
+_CHUNK_CHARS = 64 * 1024
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+async def _encode(
+    rows: AsyncIterator[Dict[str, Any]], columns: List[str], fmt: ExportFormat
+) -> AsyncIterator[str]:
+    """Serialise rows as CSV (with header) or NDJSON, yielding ~64 KB chunks."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer is not None:
+        writer.writerow(columns)
+    async for row in rows:
+        if writer is not None:
+            writer.writerow(
+                ["" if row.get(c) is None else _json_value(row.get(c)) for c in columns]
+            )
+        else:
+            buffer.write(json.dumps({c: _json_value(row.get(c)) for c in columns}))
+            buffer.write("\n")
+        if buffer.tell() >= _CHUNK_CHARS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def _employee_rows(db: Any) -> AsyncIterator[Dict[str, Any]]:
+    cursor = (
+        db["employees"]
+        .find(NOT_DELETED, {c: 1 for c in EMPLOYEE_COLUMNS})
+        .sort([("employee_id", 1)])
+        .batch_size(settings.EXPORT_BATCH_SIZE)
+    )
+    async for doc in cursor:
+        yield doc
+
+
+async def _employee_directory(db: Any) -> Dict[ObjectId, Tuple[str, str, str]]:
+    """_id -> (code, full_name, department) for every employee, including soft-deleted ones."""
+    cursor = (
+        db["employees"]
+        .find({}, {"employee_id": 1, "full_name": 1, "department": 1})
+        .batch_size(settings.EXPORT_BATCH_SIZE)
+    )
+    return {
+        doc["_id"]: (
+            doc.get("employee_id"),
+            doc.get("full_name"),
+            doc.get("department"),
+        )
+        async for doc in cursor
+    }
+
+
+async def _attendance_rows(
+    db: Any, filter_query: Dict[str, Any]
+) -> AsyncIterator[Dict[str, Any]]:
+    # One employee read up front replaces a per-row join; the directory is bounded by headcount
+    directory = await _employee_directory(db)
+
+    # Archived months are all older than live ones: stream them first, then MongoDB
+    async def docs() -> AsyncIterator[Dict[str, Any]]:
+        async for row in attendance_archive.iter_matching(filter_query):
+            yield row
+        cursor = find_rows(
+            db,
+            filter_query,
+            {
+                "_id": 0,
+                "employee_id": 1,
+                "date": 1,
+                "status": 1,
+                "notes": 1,
+                "marked_by": 1,
+                "marked_at": 1,
+            },
+            sort=[("date", 1), ("_id", 1)],
+            batch_size=settings.EXPORT_BATCH_SIZE,
+        )
+        async for doc in cursor:
+            yield doc
+
+    async for doc in docs():
+        code, name, department = directory.get(
+            doc.get("employee_id"), (None, None, None)
+        )
+        att_date = doc.get("date")
+        yield {
+            **doc,
+            "employee_id": code or _json_value(doc.get("employee_id")),
+            "employee_name": name,
+            "department": department,
+            "date": att_date.date() if isinstance(att_date, datetime) else att_date,
+        }
+
+
+def export_employees(db: Any, fmt: ExportFormat) -> AsyncIterator[str]:
+    """Stream all active employees; memory stays flat regardless of collection size."""
+    return _encode(_employee_rows(db), EMPLOYEE_COLUMNS, fmt)
+
+
+def export_attendance(
+    db: Any, filter_query: Dict[str, Any], fmt: ExportFormat
+) -> AsyncIterator[str]:
+    """Stream attendance matching filter_query, sorted by date, keyed by employee code."""
+    return _encode(_attendance_rows(db, filter_query), ATTENDANCE_COLUMNS, fmt)
@@ -0,0 +1,93 @@
+import logging
+from datetime import date, datetime, timezone
+from typing import Any, List, Optional, Type
+
+from bson import ObjectId, errors as bson_errors
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from app.models.holiday import HolidayCreate, HolidayInDB
+from app.services.base import BaseRepository
+from app.services.working_days import working_day_calculator
+
+logger = logging.getLogger(__name__)
+
+
+class HolidayRepository(BaseRepository[HolidayInDB]):
+    def __init__(self) -> None:
+        super().__init__(collection_name="holidays")
+
+    @property
+    def model_class(self) -> Type[HolidayInDB]:
+        return HolidayInDB
+
+    async def get_by_calendar(
+        self,
+        db: Any,
+        calendar: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List[HolidayInDB]:
+        filter_query: dict = {"calendar": calendar}
+        if start_date or end_date:
+            filter_query["date"] = {}
+            if start_date:
+                filter_query["date"]["$gte"] = datetime.combine(
+                    start_date, datetime.min.time()
+                )
+            if end_date:
+                filter_query["date"]["$lte"] = datetime.combine(
+                    end_date, datetime.max.time()
+                )
+        try:
+            cursor = db[self.collection_name].find(filter_query).sort([("date", 1)])
+            return [self.model_class(**doc) async for doc in cursor]
+        except PyMongoError as e:
+            logger.error(f"Error getting holidays for calendar {calendar}: {e}")
+            raise
+
+    async def get_calendars(self, db: Any) -> List[str]:
+        try:
+            return sorted(await db[self.collection_name].distinct("calendar"))
+        except PyMongoError as e:
+            logger.error(f"Error listing holiday calendars: {e}")
+            raise
+
+    async def create(self, db: Any, obj_in: HolidayCreate) -> HolidayInDB:
+        """Insert a holiday; DuplicateKeyError if the calendar already has that date."""
+        now_utc = datetime.now(timezone.utc)
+        doc = {
+            "calendar": obj_in.calendar,
+            "date": datetime.combine(obj_in.date, datetime.min.time()),
+            "name": obj_in.name,
+            "created_at": now_utc,
+            "updated_at": now_utc,
+        }
+        try:
+            result = await db[self.collection_name].insert_one(doc)
+        except DuplicateKeyError:
+            raise
+        except PyMongoError as e:
+            logger.error(f"Error creating holiday: {e}")
+            raise
+        working_day_calculator.invalidate(obj_in.calendar)
+        self._written()
+        return self.model_class(**{**doc, "_id": result.inserted_id})
+
+    async def delete(self, db: Any, id: str) -> bool:
+        try:
+            object_id = ObjectId(id)
+        except (bson_errors.InvalidId, TypeError) as e:
+            raise ValueError(f"Invalid ID format: {id}") from e
+        try:
+            doc = await db[self.collection_name].find_one_and_delete({"_id": object_id})
+        except PyMongoError as e:
+            logger.error(f"Error deleting holiday {id}: {e}")
+            raise
+        if doc is None:
+            return False
+        working_day_calculator.invalidate(doc.get("calendar"))
+        self._written()
+        return True
+
+
+holiday_repository = HolidayRepository()
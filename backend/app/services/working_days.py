@@ -0,0 +1,81 @@
+import logging
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Any, List, Optional
+
+from app.config.settings import settings
+from app.core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def count_weekdays(start_date: date, end_date: date) -> int:
+    """Mon–Fri days in [start_date, end_date] in constant time (0 if the range is empty)."""
+    if end_date < start_date:
+        return 0
+    days = (end_date - start_date).days + 1
+    full_weeks, remainder = divmod(days, 7)
+    first_weekday = start_date.weekday()
+    # The leftover (< 7) days start on first_weekday; count those falling on Mon–Fri
+    extra = sum(1 for i in range(remainder) if (first_weekday + i) % 7 < 5)
+    return full_weeks * 5 + extra
+
+
+class WorkingDayCalculator:
+    """
+    Working days = weekdays minus weekday holidays of a calendar.
+
+    Each calendar's holidays are held as a sorted list of date ordinals, so the holiday
+    count for any range is two bisections (O(log n)). Indexes and per-(calendar, range)
+    results are cached in-process; holiday writes call invalidate().
+    """
+
+    def __init__(self) -> None:
+        self._index: TTLCache[List[int]] = TTLCache(
+            max_size=256, ttl_seconds=settings.HOLIDAY_CACHE_TTL_SECONDS
+        )
+        self._results: TTLCache[int] = TTLCache(
+            max_size=4096, ttl_seconds=settings.HOLIDAY_CACHE_TTL_SECONDS
+        )
+
+    def invalidate(self, calendar: Optional[str] = None) -> None:
+        if calendar is None:
+            self._index.clear()
+        else:
+            self._index.invalidate(calendar)
+        self._results.clear()
+
+    async def _holiday_index(self, db: Any, calendar: str) -> List[int]:
+        index = self._index.get(calendar)
+        if index is None:
+            cursor = db["holidays"].find({"calendar": calendar}, {"_id": 0, "date": 1})
+            ordinals = set()
+            async for doc in cursor:
+                day = (
+                    doc["date"].date() if hasattr(doc["date"], "date") else doc["date"]
+                )
+                if day.weekday() < 5:  # weekend holidays do not reduce working days
+                    ordinals.add(day.toordinal())
+            index = sorted(ordinals)
+            self._index.set(calendar, index)
+        return index
+
+    async def count(
+        self, db: Any, start_date: date, end_date: date, calendar: Optional[str] = None
+    ) -> int:
+        """Working days in [start_date, end_date] for calendar (default from settings)."""
+        calendar = calendar or settings.DEFAULT_HOLIDAY_CALENDAR
+        key = (calendar, start_date, end_date)
+        cached = self._results.get(key)
+        if cached is not None:
+            return cached
+        index = await self._holiday_index(db, calendar)
+        holidays = bisect_right(index, end_date.toordinal()) - bisect_left(
+            index, start_date.toordinal()
+        )
+        result = max(count_weekdays(start_date, end_date) - holidays, 0)
+        self._results.set(key, result)
+        return result
+
+
+working_day_calculator = WorkingDayCalculator()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Move closed attendance months out of MongoDB into compressed segment files.
+Months that ended more than ATTENDANCE_ARCHIVE_AFTER_DAYS ago (or before --before) are
+written to ATTENDANCE_ARCHIVE_DIR and then deleted from the attendance collection; reads
+and stats keep seeing them. Safe to re-run; schedule it e.g. monthly.
+Run from backend: python scripts/archive_attendance.py [--before YYYY-MM] [--dry-run]
+Requires: MongoDB running; .env with MONGODB_URL (default: mongodb://localhost:27017).
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from datetime import date
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv(backend_dir / ".env")
+except ImportError:
+    pass
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "hrms_lite")
+
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient
+except ImportError:
+    print("Install motor: pip install motor", file=sys.stderr)
+    sys.exit(1)
+
+from app.core.cache import write_versions
+from app.services.attendance_archive import attendance_archive
+
+
+def parse_month(value: str) -> date:
+    try:
+        year, month = (int(part) for part in value.split("-"))
+        return date(year, month, 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected YYYY-MM")
+
+
+async def run(before: date, dry_run: bool):
+    print(f"Connecting to MongoDB ({MONGODB_DB_NAME})...")
+    client = AsyncIOMotorClient(
+        MONGODB_URL,
+        serverSelectionTimeoutMS=5000,
+        connectTimeoutMS=5000,
+    )
+    await client.admin.command("ping")
+    db = client[MONGODB_DB_NAME]
+    try:
+        report = await attendance_archive.archive(db, before, dry_run=dry_run)
+        # So running API workers' ETags change at their next sync
+        await write_versions.sync(db)
+    finally:
+        client.close()
+
+    verb = "Would archive" if dry_run else "Archived"
+    for month in report["months"]:
+        print(f"  {month['month']}: {month['rows']} row(s)")
+    print(
+        f"\n{verb} {report['rows']} row(s) dated before {report['cutoff']} into {attendance_archive.root}."
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Archive closed attendance months to segment files"
+    )
+    parser.add_argument(
+        "--before",
+        type=parse_month,
+        help="Archive months before this one (default: from ATTENDANCE_ARCHIVE_AFTER_DAYS)",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only report what would be archived"
+    )
+    args = parser.parse_args()
+    before = args.before or attendance_archive.default_cutoff()
+    if before > attendance_archive.default_cutoff():
+        parser.error(
+            f"--before must not be after {attendance_archive.default_cutoff():%Y-%m} (ATTENDANCE_ARCHIVE_AFTER_DAYS)"
+        )
+    asyncio.run(run(before, args.dry_run))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
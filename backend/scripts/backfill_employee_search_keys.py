@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Compute search_keys and search_field_keys for every employee (including soft-deleted ones).
+The API maintains them on create/import/update and fills in missing ones at startup;
+run this after changing how keys are computed (employee_search), to refresh them all.
+Run from backend: python scripts/backfill_employee_search_keys.py [--batch-size 1000]
+Requires: MongoDB running; .env with MONGODB_URL (default: mongodb://localhost:27017).
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv(backend_dir / ".env")
+except ImportError:
+    pass
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "hrms_lite")
+
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from pymongo import UpdateOne
+except ImportError:
+    print("Install motor: pip install motor", file=sys.stderr)
+    sys.exit(1)
+
+from app.services.employee_search import SEARCH_FIELD_WEIGHTS, search_key_fields
+
+
+async def backfill(db, batch_size: int) -> int:
+    updated = 0
+    ops = []
+
+    async def flush():
+        nonlocal updated
+        await db["employees"].bulk_write(ops, ordered=False)
+        updated += len(ops)
+        print(f"  updated {updated} employee(s)...", end="\r")
+        ops.clear()
+
+    projection = {field: 1 for field in SEARCH_FIELD_WEIGHTS}
+    async for doc in db["employees"].find({}, projection).batch_size(batch_size):
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": search_key_fields(doc)}))
+        if len(ops) >= batch_size:
+            await flush()
+    if ops:
+        await flush()
+    print()
+    return updated
+
+
+async def run(batch_size: int):
+    print(f"Connecting to MongoDB ({MONGODB_DB_NAME})...")
+    client = AsyncIOMotorClient(
+        MONGODB_URL, serverSelectionTimeoutMS=5000, connectTimeoutMS=5000
+    )
+    await client.admin.command("ping")
+    try:
+        db = client[MONGODB_DB_NAME]
+        await db["employees"].create_index("search_keys", name="search_keys_index")
+        updated = await backfill(db, batch_size)
+        print(f"Done. search_keys refreshed for {updated} employee(s).")
+    finally:
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill employee search_keys")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Updates per bulk_write (default 1000)",
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.batch_size))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
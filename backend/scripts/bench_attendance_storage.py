@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Compare standard vs time-series storage for the current attendance data.
+Copies attendance into bench_attendance_standard and bench_attendance_timeseries (same
+indexes the API creates), then reports storage/index size and p50/p99 latency of an
+employee-month range read, a one-week date-range page and a monthly stats aggregation,
+ending with a Markdown table to paste into a PR.
+Seed first (scripts/seed_employees.py, scripts/seed_dummy_attendance.py) for a realistic set,
+or pass --employees/--months to generate a synthetic set (seed_dummy_attendance's status mix)
+into bench_attendance_source instead of reading attendance.
+Run from backend: python scripts/bench_attendance_storage.py [--runs 200] [--keep]
+                  [--employees 500 --months 12]
+Requires: MongoDB 7.0+ running; .env with MONGODB_URL (default: mongodb://localhost:27017).
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv(backend_dir / ".env")
+except ImportError:
+    pass
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "hrms_lite")
+
+try:
+    from bson import ObjectId
+    from motor.motor_asyncio import AsyncIOMotorClient
+except ImportError:
+    print("Install motor: pip install motor", file=sys.stderr)
+    sys.exit(1)
+
+from app.config.database import attendance_timeseries_options, create_attendance_indexes
+from scripts.migrate_attendance_timeseries import copy_rows
+from scripts.seed_dummy_attendance import weekday_dates, weighted_status
+
+MODES = {"standard": False, "timeseries": True}
+SYNTHETIC_SOURCE = "bench_attendance_source"
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+async def timed(runs: int, make_query):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await make_query()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+async def seed_synthetic(db, employees: int, months: int) -> str:
+    """Weekday rows for `employees` new ids over the last `months` whole months; returns the collection."""
+    await db[SYNTHETIC_SOURCE].drop()
+    end = date.today().replace(day=1) - timedelta(days=1)
+    start = end.replace(day=1)
+    for _ in range(months - 1):
+        start = (start - timedelta(days=1)).replace(day=1)
+    days = [datetime.combine(d, datetime.min.time()) for d in weekday_dates(start, end)]
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    print(
+        f"Generating {employees} employee(s) x {len(days)} weekday(s) ({start} to {end})..."
+    )
+    for _ in range(employees):
+        oid = ObjectId()
+        await db[SYNTHETIC_SOURCE].insert_many(
+            [
+                {
+                    "employee_id": oid,
+                    "date": day,
+                    "status": weighted_status(rng),
+                    "notes": None,
+                    "marked_by": "Admin",
+                    "marked_at": now,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for day in days
+            ],
+            ordered=False,
+        )
+    return SYNTHETIC_SOURCE
+
+
+async def storage_stats(db, name: str):
+    stats = await db.command("collStats", name)
+    # Time-series stats describe the internal buckets collection
+    return (
+        stats.get("storageSize", 0),
+        stats.get("totalIndexSize", 0),
+        stats.get("timeseries", {}).get("bucketCount"),
+    )
+
+
+async def run(runs: int, keep: bool, employees: int, months: int):
+    print(f"Connecting to MongoDB ({MONGODB_DB_NAME})...")
+    client = AsyncIOMotorClient(
+        MONGODB_URL, serverSelectionTimeoutMS=5000, connectTimeoutMS=5000
+    )
+    await client.admin.command("ping")
+    db = client[MONGODB_DB_NAME]
+    source = await seed_synthetic(db, employees, months) if employees else "attendance"
+    total = await db[source].estimated_document_count()
+    if not total:
+        print(
+            f"{source} is empty; seed it first or pass --employees/--months.",
+            file=sys.stderr,
+        )
+        return
+    sample = await db[source].find_one(sort=[("date", -1)])
+    employee_oid = sample["employee_id"]
+    month_end = sample["date"]
+    month_start = month_end.replace(day=1)
+    week_start = month_end - timedelta(days=6)
+    print(
+        f"{total} record(s); queries use employee {employee_oid} and {month_start:%Y-%m}.\n"
+    )
+
+    rows = []
+    try:
+        for mode, timeseries in MODES.items():
+            name = f"bench_attendance_{mode}"
+            await db[name].drop()
+            if timeseries:
+                await db.create_collection(
+                    name, timeseries=attendance_timeseries_options()
+                )
+            started = time.perf_counter()
+            await copy_rows(db, source, name, with_keys=False, batch_size=1000)
+            load_s = time.perf_counter() - started
+            await create_attendance_indexes(db, name, timeseries=timeseries)
+            storage, index_size, buckets = await storage_stats(db, name)
+            coll = db[name]
+
+            range_ms = await timed(
+                runs,
+                lambda: coll.find(
+                    {
+                        "employee_id": employee_oid,
+                        "date": {"$gte": month_start, "$lte": month_end},
+                    }
+                )
+                .sort([("date", 1)])
+                .to_list(length=None),
+            )
+            page_ms = await timed(
+                runs,
+                lambda: coll.find({"date": {"$gte": week_start, "$lte": month_end}})
+                .sort([("date", 1)])
+                .limit(100)
+                .to_list(length=100),
+            )
+            stats_ms = await timed(
+                runs,
+                lambda: coll.aggregate(
+                    [
+                        {"$match": {"date": {"$gte": month_start, "$lte": month_end}}},
+                        {
+                            "$group": {
+                                "_id": {
+                                    "employee_id": "$employee_id",
+                                    "status": "$status",
+                                },
+                                "count": {"$sum": 1},
+                            }
+                        },
+                    ]
+                ).to_list(length=None),
+            )
+
+            print(
+                f"[{mode}] load {load_s:.1f}s  storage {storage / 1024:.0f} KiB  "
+                f"indexes {index_size / 1024:.0f} KiB"
+                + (f"  buckets {buckets}" if buckets else "")
+            )
+            for label, samples in (
+                ("employee-month", range_ms),
+                ("week page", page_ms),
+                ("month stats", stats_ms),
+            ):
+                print(
+                    f"    {label:<15} p50={percentile(samples, 50):7.2f} ms  "
+                    f"p99={percentile(samples, 99):7.2f} ms  mean={statistics.fmean(samples):7.2f} ms"
+                )
+            rows.append(
+                f"| {mode} | {storage / 1024:.0f} KiB | {index_size / 1024:.0f} KiB | "
+                + " | ".join(
+                    f"{percentile(samples, 50):.2f} / {percentile(samples, 99):.2f} ms"
+                    for samples in (range_ms, page_ms, stats_ms)
+                )
+                + " |"
+            )
+        print(f"\n{total} record(s), {runs} run(s) per query; latency is p50 / p99:\n")
+        print(
+            "| Layout | Storage | Indexes | Employee-month | Week page | Month stats |"
+        )
+        print(
+            "|--------|---------|---------|----------------|-----------|-------------|"
+        )
+        print("\n".join(rows))
+    finally:
+        if not keep:
+            for mode in MODES:
+                await db[f"bench_attendance_{mode}"].drop()
+            if employees:
+                await db[SYNTHETIC_SOURCE].drop()
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark attendance storage modes")
+    parser.add_argument(
+        "--runs", type=int, default=200, help="Repetitions per query (default 200)"
+    )
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep the bench_attendance_* collections"
+    )
+    parser.add_argument(
+        "--employees",
+        type=int,
+        default=0,
+        help="Generate this many synthetic employees",
+    )
+    parser.add_argument(
+        "--months",
+        type=int,
+        default=12,
+        help="Whole months of synthetic data (default 12)",
+    )
+    args = parser.parse_args()
+    if args.employees and args.months < 1:
+        parser.error("--months must be at least 1")
+    asyncio.run(run(args.runs, args.keep, args.employees, args.months))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
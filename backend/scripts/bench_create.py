@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for the single-document create paths: POST /employees and POST /attendance.
+Creates N employees (EMP<start>..), then marks today's attendance for each, and prints
+p50/p99/max per endpoint.
+Run from backend with the API up: python scripts/bench_create.py [--n 500] [--concurrency 10]
+Requires: httpx (dev dependency). Writes real data; use a scratch database.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import date
+from typing import Any, Dict, List
+
+try:
+    import httpx
+except ImportError:
+    print("Install httpx: pip install httpx", file=sys.stderr)
+    sys.exit(1)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def timed_posts(
+    client: "httpx.AsyncClient",
+    path: str,
+    payloads: List[Dict[str, Any]],
+    concurrency: int,
+) -> List[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    failures = 0
+
+    async def post(payload: Dict[str, Any]) -> None:
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post(path, json=payload)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 201:
+                failures += 1
+
+    await asyncio.gather(*(post(p) for p in payloads))
+    if failures:
+        print(
+            f"  ! {failures} of {len(payloads)} requests to {path} did not return 201"
+        )
+    return latencies
+
+
+def report(label: str, latencies: List[float]) -> None:
+    print(
+        f"{label:<18} n={len(latencies):<5} p50={percentile(latencies, 50):7.2f} ms  "
+        f"p99={percentile(latencies, 99):7.2f} ms  max={max(latencies):7.2f} ms  "
+        f"mean={statistics.fmean(latencies):7.2f} ms"
+    )
+
+
+async def run(base_url: str, n: int, concurrency: int, start: int) -> None:
+    employee_ids = [f"EMP{start + i}" for i in range(n)]
+    employees = [
+        {
+            "employeeId": code,
+            "fullName": f"Bench User {code}",
+            "email": f"bench.{code.lower()}@company.com",
+            "department": "Benchmark",
+            "position": "Load Test",
+        }
+        for code in employee_ids
+    ]
+    today = date.today().isoformat()
+    attendance = [
+        {"employee_id": code, "date": today, "status": "present"}
+        for code in employee_ids
+    ]
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as client:
+        # Warm the connection pool so the first samples do not include connects
+        await client.get("/health")
+        report(
+            "POST /employees",
+            await timed_posts(client, "/api/v1/employees", employees, concurrency),
+        )
+        report(
+            "POST /attendance",
+            await timed_posts(client, "/api/v1/attendance", attendance, concurrency),
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--n", type=int, default=500, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--start",
+        type=int,
+        default=900000,
+        help="first numeric employee ID; pick an unused range (IDs are EMP + up to 6 digits)",
+    )
+    args = parser.parse_args()
+    if args.start + args.n > 999999:
+        parser.error("--start + --n must stay within 6-digit employee IDs")
+    asyncio.run(run(args.base_url, args.n, args.concurrency, args.start))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Convert attendance between the daily layout (attendance: one document per employee-day)
+and the bucket layout (attendance_buckets: one document per employee-month holding a
+day-indexed map of records plus per-status counters).
+--to bucket: groups attendance by (employee, month) into attendance_buckets.
+--to daily:  unwinds attendance_buckets back into a standard attendance collection.
+Record _ids are kept, so ids handed out by the API stay valid. The source collection is
+left untouched; the target must be empty (or pass --replace to drop it first).
+Stop the API while converting, then set ATTENDANCE_LAYOUT to match and restart.
+Run from backend: python scripts/convert_attendance_layout.py --to bucket|daily [--replace]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv(backend_dir / ".env")
+except ImportError:
+    pass
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "hrms_lite")
+
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient
+except ImportError:
+    print("Install motor: pip install motor", file=sys.stderr)
+    sys.exit(1)
+
+from app.config.database import (
+    create_attendance_bucket_indexes,
+    create_attendance_indexes,
+)
+from app.services.attendance_buckets import (
+    BUCKET_COLLECTION,
+    DAILY_COLLECTION,
+    bucket_from_rows,
+    rows_pipeline,
+)
+from app.services.attendance_monthly import month_start
+
+
+async def to_buckets(db, batch_size: int) -> int:
+    """Stream rows in (employee_id, date) order and emit one bucket per employee-month."""
+    buckets = []
+    written = 0
+    current_key, current_rows = None, []
+
+    async def flush():
+        nonlocal written
+        await db[BUCKET_COLLECTION].insert_many(buckets, ordered=False)
+        written += sum(len(b["days"]) for b in buckets)
+        print(f"  converted {written} record(s)...", end="\r")
+        buckets.clear()
+
+    cursor = (
+        db[DAILY_COLLECTION]
+        .find({})
+        .sort([("employee_id", 1), ("date", 1)])
+        .batch_size(batch_size)
+    )
+    async for row in cursor:
+        key = (row["employee_id"], month_start(row["date"]))
+        if key != current_key and current_rows:
+            buckets.append(bucket_from_rows(*current_key, current_rows))
+            current_rows = []
+            if len(buckets) >= batch_size:
+                await flush()
+        current_key = key
+        current_rows.append(row)
+    if current_rows:
+        buckets.append(bucket_from_rows(*current_key, current_rows))
+    if buckets:
+        await flush()
+    print()
+    return written
+
+
+async def to_daily(db, batch_size: int) -> int:
+    copied = 0
+    batch = []
+
+    async def flush():
+        nonlocal copied
+        await db[DAILY_COLLECTION].insert_many(batch, ordered=False)
+        copied += len(batch)
+        print(f"  converted {copied} record(s)...", end="\r")
+        batch.clear()
+
+    async for row in db[BUCKET_COLLECTION].aggregate(
+        rows_pipeline({}), batchSize=batch_size
+    ):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+    print()
+    return copied
+
+
+async def run(to: str, replace: bool, batch_size: int):
+    print(f"Connecting to MongoDB ({MONGODB_DB_NAME})...")
+    client = AsyncIOMotorClient(
+        MONGODB_URL, serverSelectionTimeoutMS=5000, connectTimeoutMS=5000
+    )
+    await client.admin.command("ping")
+    db = client[MONGODB_DB_NAME]
+    source, target = (
+        (DAILY_COLLECTION, BUCKET_COLLECTION)
+        if to == "bucket"
+        else (BUCKET_COLLECTION, DAILY_COLLECTION)
+    )
+    try:
+        if await db[target].estimated_document_count():
+            if not replace:
+                print(
+                    f"{target} is not empty; pass --replace to drop it first.",
+                    file=sys.stderr,
+                )
+                sys.exit(1)
+            await db[target].drop()
+
+        if to == "bucket":
+            source_count = await db[source].count_documents({})
+            await create_attendance_bucket_indexes(db, target)
+            print(f"Grouping {source_count} record(s) from {source} into {target}...")
+            converted = await to_buckets(db, batch_size)
+        else:
+            totals = (
+                await db[source]
+                .aggregate(
+                    [
+                        {"$project": {"n": {"$size": {"$objectToArray": "$days"}}}},
+                        {"$group": {"_id": None, "n": {"$sum": "$n"}}},
+                    ]
+                )
+                .to_list(length=1)
+            )
+            source_count = totals[0]["n"] if totals else 0
+            await create_attendance_indexes(db, target, timeseries=False)
+            print(f"Unwinding {source_count} record(s) from {source} into {target}...")
+            converted = await to_daily(db, batch_size)
+
+        if converted != source_count:
+            raise RuntimeError(
+                f"converted {converted} of {source_count} record(s); {source} is unchanged"
+            )
+        print(f"\nDone. {target} holds {converted} record(s); {source} was left as is.")
+        print(
+            f"Set ATTENDANCE_LAYOUT={'bucket' if to == 'bucket' else 'daily'} and restart the API."
+        )
+        if to == "daily":
+            print(
+                "Then refresh the rollups: python scripts/rebuild_attendance_monthly.py"
+            )
+        print(f"Drop {source} once everything checks out.")
+    finally:
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert attendance between daily and bucket layouts"
+    )
+    parser.add_argument("--to", choices=["bucket", "daily"], required=True)
+    parser.add_argument(
+        "--replace",
+        action="store_true",
+        help="Drop a non-empty target collection first",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Documents per insert (default 1000)",
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.to, args.replace, args.batch_size))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Convert the attendance collection between standard and time-series storage.
+--to timeseries: renames attendance to a backup, creates attendance as a time-series collection,
+copies every record and fills attendance_keys (which enforces one mark per employee per day).
+--to standard: copies back into a standard collection with the unique (employee_id, date)
+index; the time-series collection is kept as a backup (time-series collections cannot be
+renamed, so the copy is built under a temporary name first).
+Stop the API while migrating, then set ATTENDANCE_TIMESERIES to match. Requires MongoDB 7.0+.
+Run from backend: python scripts/migrate_attendance_timeseries.py [--to timeseries|standard]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv(backend_dir / ".env")
+except ImportError:
+    pass
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "hrms_lite")
+
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from pymongo.errors import BulkWriteError
+except ImportError:
+    print("Install motor: pip install motor", file=sys.stderr)
+    sys.exit(1)
+
+from app.config.database import attendance_timeseries_options, create_attendance_indexes
+from app.services.attendance_keys import KEYS_COLLECTION, day_key
+
+COLLECTION = "attendance"
+
+
+async def collection_type(db, name: str):
+    """ "timeseries", "collection", or None when it does not exist."""
+    found = await db.list_collections(filter={"name": name}).to_list(length=1)
+    return found[0].get("type", "collection") if found else None
+
+
+async def copy_rows(
+    db, source: str, target: str, with_keys: bool, batch_size: int
+) -> int:
+    copied = 0
+    batch = []
+
+    async def flush():
+        nonlocal copied
+        await db[target].insert_many(batch, ordered=False)
+        if with_keys:
+            keys = [{"_id": day_key(doc["employee_id"], doc["date"])} for doc in batch]
+            try:
+                await db[KEYS_COLLECTION].insert_many(keys, ordered=False)
+            except BulkWriteError:
+                pass  # keys left over from an earlier run
+        copied += len(batch)
+        print(f"  copied {copied} record(s)...", end="\r")
+        batch.clear()
+
+    async for doc in db[source].find({}).batch_size(batch_size):
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+    print()
+    return copied
+
+
+async def run(to: str, batch_size: int):
+    print(f"Connecting to MongoDB ({MONGODB_DB_NAME})...")
+    client = AsyncIOMotorClient(
+        MONGODB_URL, serverSelectionTimeoutMS=5000, connectTimeoutMS=5000
+    )
+    await client.admin.command("ping")
+    db = client[MONGODB_DB_NAME]
+    try:
+        current = await collection_type(db, COLLECTION)
+        wanted = "timeseries" if to == "timeseries" else "collection"
+        if current is None:
+            print(f"No {COLLECTION} collection yet; it will be created on API startup.")
+            return
+        if current == wanted:
+            print(f"{COLLECTION} is already {to}; nothing to do.")
+            return
+
+        stamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        source_count = await db[COLLECTION].count_documents({})
+        if to == "timeseries":
+            backup = f"{COLLECTION}_standard_backup_{stamp}"
+            await db[COLLECTION].rename(backup)
+            await db.create_collection(
+                COLLECTION, timeseries=attendance_timeseries_options()
+            )
+            await db[KEYS_COLLECTION].drop()
+            print(
+                f"Copying {source_count} record(s) from {backup} into time-series {COLLECTION}..."
+            )
+            copied = await copy_rows(
+                db, backup, COLLECTION, with_keys=True, batch_size=batch_size
+            )
+            await create_attendance_indexes(db, COLLECTION, timeseries=True)
+        else:
+            staging = f"{COLLECTION}_standard_{stamp}"
+            backup = f"{COLLECTION}_timeseries_backup_{stamp}"
+            print(f"Copying {source_count} record(s) into standard {staging}...")
+            copied = await copy_rows(
+                db, COLLECTION, staging, with_keys=False, batch_size=batch_size
+            )
+            await create_attendance_indexes(db, staging, timeseries=False)
+            # Time-series collections cannot be renamed: copy the original aside, then swap in
+            await db[COLLECTION].aggregate([{"$out": backup}]).to_list(length=None)
+            await db[COLLECTION].drop()
+            await db[staging].rename(COLLECTION)
+            await db[KEYS_COLLECTION].drop()
+
+        if copied != source_count:
+            raise RuntimeError(
+                f"copied {copied} of {source_count} record(s); backup kept in {backup}"
+            )
+        print(
+            f"\nDone. {COLLECTION} is now {to} with {copied} record(s); previous data kept in {backup}."
+        )
+        print(
+            f"Set ATTENDANCE_TIMESERIES={'true' if to == 'timeseries' else 'false'} and restart the API."
+        )
+        print(f"Drop {backup} once everything checks out.")
+    finally:
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Migrate attendance between standard and time-series storage"
+    )
+    parser.add_argument(
+        "--to", choices=["timeseries", "standard"], default="timeseries"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=1000, help="Records per insert (default 1000)"
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.to, args.batch_size))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
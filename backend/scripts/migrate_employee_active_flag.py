@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Move employees to the is_active soft-delete flag and partial indexes.
+1. Backfill is_active on every employee (False where deleted_at is set); the API also does
+   this on startup.
+2. Drop the full-collection indexes being replaced, so IDs and emails of soft-deleted
+   employees can be reused.
+3. Create the partial indexes over {is_active: true} (see create_employee_indexes).
+Safe to re-run. Run from backend: python scripts/migrate_employee_active_flag.py
+Requires: MongoDB running; .env with MONGODB_URL (default: mongodb://localhost:27017).
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv(backend_dir / ".env")
+except ImportError:
+    pass
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "hrms_lite")
+
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient
+except ImportError:
+    print("Install motor: pip install motor", file=sys.stderr)
+    sys.exit(1)
+
+from app.config.database import LEGACY_EMPLOYEE_INDEXES, create_employee_indexes
+from app.services.employee import employee_repository
+
+
+async def run():
+    print(f"Connecting to MongoDB ({MONGODB_DB_NAME})...")
+    client = AsyncIOMotorClient(
+        MONGODB_URL, serverSelectionTimeoutMS=5000, connectTimeoutMS=5000
+    )
+    await client.admin.command("ping")
+    try:
+        db = client[MONGODB_DB_NAME]
+        collection = db[employee_repository.collection_name]
+
+        updated = await employee_repository.backfill_active_flag(db)
+        print(f"Backfilled is_active on {updated} employee(s).")
+
+        # Drop the legacy indexes first: servers before 5.0 refuse a partial index
+        # next to a full one on the same keys. Uniqueness is briefly unenforced until step 3.
+        existing = await collection.index_information()
+        for name in LEGACY_EMPLOYEE_INDEXES:
+            if name in existing:
+                await collection.drop_index(name)
+                print(f"  dropped {name}")
+
+        skipped = await create_employee_indexes(db)
+        if skipped:
+            print(f"  ! not created: {', '.join(skipped)}")
+        print("Partial indexes created:")
+        for name, info in (await collection.index_information()).items():
+            if "partialFilterExpression" in info:
+                print(f"  {name}: {info['key']}")
+        print("Done.")
+    finally:
+        client.close()
+
+
+def main():
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
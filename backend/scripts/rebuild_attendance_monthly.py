@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Rebuild the attendance_monthly rollup collection from raw attendance records.
+Backfills existing data and repairs any drift; safe to re-run (the collection is replaced).
+Run from backend: python scripts/rebuild_attendance_monthly.py
+Requires: MongoDB running; .env with MONGODB_URL (default: mongodb://localhost:27017).
+"""
+
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv(backend_dir / ".env")
+except ImportError:
+    pass
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "hrms_lite")
+
+try:
+    from pymongo import ASCENDING, MongoClient, UpdateOne
+except ImportError:
+    print("Install pymongo: pip install pymongo", file=sys.stderr)
+    sys.exit(1)
+
+from app.services.attendance_archive import attendance_archive
+from app.services.attendance_monthly import (
+    ROLLUP_COLLECTION,
+    ROLLUPS,
+    SEEDED_MARKER,
+    rebuild_pipeline,
+)
+
+
+def main():
+    print(f"Connecting to MongoDB ({MONGODB_DB_NAME})...")
+    client = MongoClient(
+        MONGODB_URL,
+        serverSelectionTimeoutMS=5000,
+        connectTimeoutMS=5000,
+    )
+    client.admin.command("ping")
+    db = client[MONGODB_DB_NAME]
+
+    # $out keeps existing indexes on the target, so create the unique key first
+    db[ROLLUP_COLLECTION].create_index(
+        [("employee_id", ASCENDING), ("month", ASCENDING)],
+        unique=True,
+        name="employee_month_unique_index",
+    )
+    print(
+        f"Rebuilding {ROLLUP_COLLECTION} from {db['attendance'].estimated_document_count()} attendance record(s)..."
+    )
+    db["attendance"].aggregate(rebuild_pipeline(), allowDiskUse=True)
+
+    # Archived months are no longer in `attendance`; set their counts from the segment indexes
+    archived_ops = [
+        UpdateOne(
+            {"employee_id": oid, "month": month},
+            {"$set": {"counts": dict(counts)}},
+            upsert=True,
+        )
+        for oid, month, counts in attendance_archive.iter_month_counts()
+    ]
+    if archived_ops:
+        db[ROLLUP_COLLECTION].bulk_write(archived_ops, ordered=False)
+        print(f"Restored {len(archived_ops)} rollup document(s) from archived months.")
+
+    # Tells API startup the rollups are complete (it rebuilds when the marker is missing)
+    db[ROLLUP_COLLECTION].update_one(
+        SEEDED_MARKER, {"$set": {"seeded_at": datetime.now(timezone.utc)}}, upsert=True
+    )
+    rollups = db[ROLLUP_COLLECTION].count_documents(ROLLUPS)
+    client.close()
+    print(
+        f"\nDone. {ROLLUP_COLLECTION} now holds {rollups} (employee, month) document(s)."
+    )
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
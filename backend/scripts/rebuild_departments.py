@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Rebuild the departments collection (active headcount per department) from employees.
+The API seeds it on first start and keeps it current; run this to repair drift, e.g. after
+editing or inserting employees directly in MongoDB. Safe to re-run (the collection is replaced).
+Run from backend: python scripts/rebuild_departments.py
+Requires: MongoDB running; .env with MONGODB_URL (default: mongodb://localhost:27017).
+"""
+
+import os
+import sys
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv(backend_dir / ".env")
+except ImportError:
+    pass
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "hrms_lite")
+
+try:
+    from pymongo import MongoClient
+except ImportError:
+    print("Install pymongo: pip install pymongo", file=sys.stderr)
+    sys.exit(1)
+
+from app.services.department import DEPARTMENT_COLLECTION, rebuild_pipeline
+
+
+def main():
+    print(f"Connecting to MongoDB ({MONGODB_DB_NAME})...")
+    client = MongoClient(
+        MONGODB_URL,
+        serverSelectionTimeoutMS=5000,
+        connectTimeoutMS=5000,
+    )
+    client.admin.command("ping")
+    db = client[MONGODB_DB_NAME]
+
+    print(
+        f"Rebuilding {DEPARTMENT_COLLECTION} from {db['employees'].estimated_document_count()} employee(s)..."
+    )
+    db["employees"].aggregate(rebuild_pipeline(), allowDiskUse=True)
+
+    for doc in db[DEPARTMENT_COLLECTION].find().sort("_id", 1):
+        print(f"  {doc['_id']}: {doc['active_count']}")
+    departments = db[DEPARTMENT_COLLECTION].count_documents({})
+    client.close()
+    print(f"\nDone. {DEPARTMENT_COLLECTION} now holds {departments} department(s).")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -117,6 +117,9 @@ def main():
 
     client.close()
     print(f"\nDone. Inserted {inserted} attendance records (up to 5 Feb only, weekdays, realistic distribution).")
+    print(
+        "Run python scripts/rebuild_attendance_monthly.py to refresh the monthly rollups."
+    )
 
 
 if __name__ == "__main__":
@@ -1,16 +1,19 @@
 #!/usr/bin/env python3
 """
 Seed 30 realistic employees matching the backend Employee model.
-Fields: employee_id (EMP001–EMP030), full_name, email, department, position, status.
+Fields: employee_id (EMP001–EMP030), full_name, email, department, position, status,
+plus search_keys so the employees are searchable.
 Run from backend: python scripts/seed_employees.py
 Requires: MongoDB running; .env with MONGODB_URL (default: mongodb://localhost:27017).
 """
+
 import os
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
 backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
 try:
     from dotenv import load_dotenv
     load_dotenv(backend_dir / ".env")
@@ -26,6 +29,8 @@ except ImportError:
     print("Install pymongo: pip install pymongo", file=sys.stderr)
     sys.exit(1)
 
+from app.services.employee_search import search_key_fields
+
 # 30 realistic employees: (full_name, email_local, department, position)
 # Email domain must be one of: gmail.com, yahoo.com, outlook.com, hotmail.com, company.com, org.com, net.com
 EMPLOYEES = [
@@ -91,9 +96,11 @@ def main():
             "department": department,
             "position": position,
             "status": "active",
+            "is_active": True,
             "created_at": now,
             "updated_at": now,
         }
+        doc.update(search_key_fields(doc))
         coll.insert_one(doc)
         inserted += 1
         print(f"  + {emp_id} {full_name} ({department})")
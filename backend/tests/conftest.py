@@ -0,0 +1,99 @@
+"""
+Shared fixtures: the API on an in-memory MongoDB (mongomock-motor), one database per test.
+
+The app's lifespan is not run (no real MongoDB connection); the fixtures create the same
+indexes create_indexes does and reset the in-process caches and indexes that would
+otherwise carry state from one test's database into the next.
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from mongomock_motor import AsyncMongoMockClient
+
+from app.api.deps import get_database_dependency
+from app.config.database import (
+    create_attendance_bucket_indexes,
+    create_attendance_indexes,
+    create_employee_indexes,
+)
+from app.config.settings import settings
+from app.core.cache import write_versions
+from app.main import app
+from app.services.attendance import attendance_repository
+from app.services.dashboard import dashboard_service
+from app.services.employee import employee_repository
+from app.services.employee_directory import employee_directory
+from app.services.employee_suggest import employee_suggest_index
+from app.services.holiday import holiday_repository
+from app.services.working_days import working_day_calculator
+
+
+async def _create_indexes(database) -> None:
+    await create_employee_indexes(database)
+    await create_attendance_indexes(database, timeseries=False)
+    await create_attendance_bucket_indexes(database)
+    await database.attendance_monthly.create_index(
+        [("employee_id", 1), ("month", 1)],
+        unique=True,
+        name="employee_month_unique_index",
+    )
+
+
+@pytest.fixture
+def db():
+    database = AsyncMongoMockClient()["hrms_test"]
+    asyncio.run(_create_indexes(database))
+    return database
+
+
+@pytest.fixture(autouse=True)
+def reset_caches(monkeypatch, tmp_path):
+    employee_directory.clear()
+    employee_suggest_index.build([])
+    monkeypatch.setattr(employee_suggest_index, "loaded_at", 0.0)
+    monkeypatch.setattr(write_versions, "_versions", {})
+    monkeypatch.setattr(write_versions, "_pending", {})
+    monkeypatch.setattr(write_versions, "_shared", {})
+    for repository in (employee_repository, attendance_repository, holiday_repository):
+        repository._count_cache.clear()
+    working_day_calculator.invalidate()
+    dashboard_service.invalidate()
+    # No archived months unless a test archives some
+    monkeypatch.setattr(settings, "ATTENDANCE_ARCHIVE_DIR", str(tmp_path / "archive"))
+    yield
+
+
+@pytest.fixture
+def client(db):
+    async def override_database():
+        yield db
+
+    app.dependency_overrides[get_database_dependency] = override_database
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_database_dependency, None)
+
+
+@pytest.fixture
+def employee(client):
+    """Create an employee through the API; returns the response data."""
+
+    def create(
+        employee_id: str,
+        full_name: str = "Test User",
+        department: str = "Engineering",
+        **fields,
+    ):
+        payload = {
+            "employeeId": employee_id,
+            "fullName": full_name,
+            "email": fields.pop("email", f"{employee_id.lower()}@company.com"),
+            "department": department,
+            **fields,
+        }
+        response = client.post("/api/v1/employees", json=payload)
+        assert response.status_code == 201, response.text
+        return response.json()["data"]
+
+    return create
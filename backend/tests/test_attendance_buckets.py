@@ -0,0 +1,149 @@
+"""Bucket layout (ATTENDANCE_LAYOUT=bucket): one upserted document per employee-month."""
+
+import asyncio
+from datetime import date, datetime, timezone
+
+import pytest
+from bson import ObjectId
+
+from app.config.settings import settings
+from app.services.attendance_archive import attendance_archive
+from app.services.attendance_buckets import (
+    attendance_bucket_repository,
+    bucket_from_rows,
+)
+
+
+@pytest.fixture(autouse=True)
+def bucket_layout(monkeypatch):
+    monkeypatch.setattr(settings, "ATTENDANCE_LAYOUT", "bucket")
+
+
+def mark(client, employee_id, day, status="present"):
+    return client.post(
+        "/api/v1/attendance",
+        json={"employee_id": employee_id, "date": day, "status": status},
+    )
+
+
+def buckets(db):
+    return asyncio.run(
+        db.attendance_buckets.find({}).sort("month", 1).to_list(length=None)
+    )
+
+
+def row(employee_oid, day, status="present"):
+    now = datetime.now(timezone.utc)
+    return {
+        "_id": ObjectId(),
+        "employee_id": employee_oid,
+        "date": day,
+        "status": status,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def test_marks_upsert_one_bucket_per_employee_month(client, db, employee):
+    employee("EMP101")
+    for day, status in (
+        ("2026-03-02", "present"),
+        ("2026-03-03", "absent"),
+        ("2026-04-01", "present"),
+    ):
+        assert mark(client, "EMP101", day, status).status_code == 201
+
+    march, april = buckets(db)
+    assert march["month"] == datetime(2026, 3, 1)
+    assert april["month"] == datetime(2026, 4, 1)
+    assert list(march["days"]) == ["02", "03"]
+    assert march["counts"] == {"present": 1, "absent": 1}
+    assert april["counts"] == {"present": 1}
+    assert asyncio.run(db.attendance.count_documents({})) == 0
+
+
+def test_second_mark_of_a_day_conflicts_without_counting(client, db, employee):
+    employee("EMP102")
+    assert mark(client, "EMP102", "2026-03-02").status_code == 201
+
+    response = mark(client, "EMP102", "2026-03-02", "absent")
+
+    assert response.status_code == 409
+    (bucket,) = buckets(db)
+    assert bucket["counts"] == {"present": 1}
+    assert bucket["days"]["02"]["status"] == "present"
+
+
+def test_mark_many_reports_only_duplicate_days(db):
+    oid = ObjectId()
+    first = row(oid, datetime(2026, 3, 2))
+    docs = [
+        first,
+        row(oid, datetime(2026, 3, 3), "leave"),
+        {**first, "_id": ObjectId()},
+    ]
+
+    failed = asyncio.run(attendance_bucket_repository.mark_many(db, docs))
+
+    assert list(failed) == [2]
+    (bucket,) = buckets(db)
+    assert bucket["counts"] == {"present": 1, "leave": 1}
+
+
+def test_list_and_stats_read_rows_back_from_buckets(client, employee):
+    employee("EMP103")
+    for day, status in (
+        ("2026-03-03", "half-day"),
+        ("2026-03-02", "present"),
+        ("2026-04-01", "leave"),
+    ):
+        assert mark(client, "EMP103", day, status).status_code == 201
+
+    listed = client.get("/api/v1/attendance", params={"employee_id": "EMP103"})
+    stats = client.get(
+        "/api/v1/attendance/employee/EMP103/stats",
+        params={"start_date": "2026-03-01", "end_date": "2026-03-31"},
+    )
+
+    assert listed.status_code == 200
+    assert [(item["date"], item["status"]) for item in listed.json()["data"]] == [
+        ("2026-03-02", "present"),
+        ("2026-03-03", "half-day"),
+        ("2026-04-01", "leave"),
+    ]
+    data = stats.json()["data"]
+    assert (data["present_days"], data["half_days"], data["leave_days"]) == (1, 1, 0)
+
+
+def test_converter_builds_the_bucket_a_mark_would():
+    oid = ObjectId()
+    rows = [row(oid, datetime(2026, 3, 10), "absent"), row(oid, datetime(2026, 3, 2))]
+
+    bucket = bucket_from_rows(oid, datetime(2026, 3, 1), rows)
+
+    assert list(bucket["days"]) == ["02", "10"]
+    assert bucket["counts"] == {"absent": 1, "present": 1}
+    assert bucket["days"]["10"] is rows[0]
+
+
+def test_stats_count_archived_months_from_the_archive(client, db, employee):
+    employee("EMP109")
+    for day in ("2024-03-04", "2024-03-05", "2024-03-06", "2024-04-01"):
+        assert mark(client, "EMP109", day).status_code == 201
+
+    def present_days(start, end):
+        response = client.get(
+            "/api/v1/attendance/employee/EMP109/stats",
+            params={"start_date": start, "end_date": end},
+        )
+        assert response.status_code == 200, response.text
+        return response.json()["data"]["present_days"]
+
+    assert present_days("2024-03-01", "2024-03-31") == 3
+
+    asyncio.run(attendance_archive.archive(db, before=date(2024, 4, 1)))
+
+    assert [b["month"] for b in buckets(db)] == [datetime(2024, 4, 1)]
+    assert present_days("2024-03-01", "2024-03-31") == 3
+    assert present_days("2024-03-01", "2024-04-30") == 4
+    assert present_days("2024-03-05", "2024-04-30") == 3
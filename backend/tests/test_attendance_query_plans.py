@@ -0,0 +1,168 @@
+"""
+Every GET /api/v1/attendance filter combination must be index-backed.
+
+For each mix of employee (none/one/many), date bounds (none/start/end/both) and status
+(none/one/many), the list query (filter from build_list_filter, sorted by LIST_SORT both
+ways) is checked against the indexes create_attendance_indexes builds:
+
+- always, that some index is the filter's equality/$in fields followed by the sort keys
+  in a direction the sort can walk, so no in-memory sort is needed;
+- with a real mongod (MONGODB_URL, default mongodb://localhost:27017; skipped when none is
+  reachable), that the explained winning plan uses an IXSCAN with no COLLSCAN or SORT.
+"""
+
+import asyncio
+import itertools
+import os
+from datetime import date
+
+import pytest
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+from app.config.database import create_attendance_indexes
+from app.services.attendance import AttendanceRepository, list_sort
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+TEST_DB_NAME = "hrms_lite_test_query_plans"
+
+EMPLOYEES = {
+    "none": None,
+    "one": [ObjectId()],
+    "many": [ObjectId(), ObjectId(), ObjectId()],
+}
+DATES = {
+    "none": (None, None),
+    "start": (date(2025, 1, 1), None),
+    "end": (None, date(2025, 1, 31)),
+    "both": (date(2025, 1, 1), date(2025, 1, 31)),
+}
+STATUSES = {"none": None, "one": ["present"], "many": ["absent", "leave"]}
+
+
+def plan_stages(plan: dict) -> list:
+    """Flatten stage names from a (possibly nested) winning plan."""
+    stages = [plan["stage"]] if "stage" in plan else []
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            stages += plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        stages += plan_stages(child)
+    return stages
+
+
+def serving_index(filter_query: dict, sort: list, indexes: dict):
+    """
+    Name of an index whose keys are fields the filter pins (equality or $in, in any
+    order; at least one when it pins any) followed by exactly the sort keys, all forward
+    or all reversed; else None.
+    """
+    pinned = {field for field in filter_query if field != "date"}
+    sort_keys = [field for field, _ in sort]
+    for name, info in indexes.items():
+        keys = info["key"]
+        prefix, suffix = keys[: len(keys) - len(sort)], keys[len(keys) - len(sort) :]
+        prefix_fields = {field for field, _ in prefix}
+        if [field for field, _ in suffix] != sort_keys or not prefix_fields <= pinned:
+            continue
+        if pinned and not prefix_fields:
+            continue
+        directions = {
+            index_dir * sort_dir for (_, index_dir), (_, sort_dir) in zip(suffix, sort)
+        }
+        if len(directions) == 1:
+            return name
+    return None
+
+
+@pytest.fixture(scope="module")
+def declared_indexes():
+    database = AsyncMongoMockClient()[TEST_DB_NAME]
+    asyncio.run(create_attendance_indexes(database, timeseries=False))
+    return asyncio.run(database["attendance"].index_information())
+
+
+async def _create_indexes() -> None:
+    client = AsyncIOMotorClient(MONGODB_URL, serverSelectionTimeoutMS=2000)
+    try:
+        await create_attendance_indexes(client[TEST_DB_NAME], timeseries=False)
+    finally:
+        client.close()
+
+
+@pytest.fixture(scope="module")
+def attendance_collection():
+    client = MongoClient(
+        MONGODB_URL, serverSelectionTimeoutMS=2000, connectTimeoutMS=2000
+    )
+    try:
+        client.admin.command("ping")
+    except PyMongoError as e:
+        client.close()
+        pytest.skip(f"MongoDB not reachable at {MONGODB_URL}: {e}")
+    client.drop_database(TEST_DB_NAME)
+    asyncio.run(_create_indexes())
+    yield client[TEST_DB_NAME]["attendance"]
+    client.drop_database(TEST_DB_NAME)
+    client.close()
+
+
+@pytest.mark.parametrize(
+    "employees,dates,statuses,direction",
+    list(itertools.product(EMPLOYEES, DATES, STATUSES, (1, -1))),
+)
+def test_list_query_is_index_backed(
+    attendance_collection, employees, dates, statuses, direction
+):
+    start, end = DATES[dates]
+    filter_query = AttendanceRepository.build_list_filter(
+        EMPLOYEES[employees], start, end, STATUSES[statuses]
+    )
+    explain = (
+        attendance_collection.find(filter_query)
+        .sort(list_sort(direction))
+        .limit(100)
+        .explain()
+    )
+    stages = plan_stages(explain["queryPlanner"]["winningPlan"])
+    assert "IXSCAN" in stages, stages
+    assert "COLLSCAN" not in stages, stages
+    assert "SORT" not in stages, stages
+
+
+@pytest.mark.parametrize(
+    "employees,dates,statuses,direction",
+    list(itertools.product(EMPLOYEES, DATES, STATUSES, (1, -1))),
+)
+def test_list_query_matches_a_declared_index(
+    declared_indexes, employees, dates, statuses, direction
+):
+    start, end = DATES[dates]
+    filter_query = AttendanceRepository.build_list_filter(
+        EMPLOYEES[employees], start, end, STATUSES[statuses]
+    )
+    sort = list_sort(direction)
+    assert serving_index(filter_query, sort, declared_indexes), (filter_query, sort)
+
+
+def test_an_unpinned_prefix_or_wrong_sort_is_not_served():
+    indexes = {
+        "date_id_index": {"key": [("date", 1), ("_id", 1)]},
+        "employee_date_id_index": {
+            "key": [("employee_id", 1), ("date", 1), ("_id", 1)]
+        },
+    }
+
+    assert serving_index({"status": "present"}, list_sort(1), indexes) is None
+    assert (
+        serving_index({"employee_id": ObjectId()}, [("date", 1), ("_id", -1)], indexes)
+        is None
+    )
+    assert (
+        serving_index({"employee_id": ObjectId()}, list_sort(-1), indexes)
+        == "employee_date_id_index"
+    )
+    assert serving_index({}, list_sort(-1), indexes) == "date_id_index"
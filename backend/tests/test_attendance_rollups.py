@@ -0,0 +1,106 @@
+"""attendance_monthly rollups: written only while enabled, rebuilt when switched on."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.config.settings import settings
+from app.services.attendance_monthly import ROLLUPS, attendance_monthly_repository
+
+
+def mark(client, employee_id, day, status="present"):
+    response = client.post(
+        "/api/v1/attendance",
+        json={"employee_id": employee_id, "date": day, "status": status},
+    )
+    assert response.status_code == 201, response.text
+
+
+def february_present_days(client, employee_id):
+    response = client.get(
+        f"/api/v1/attendance/employee/{employee_id}/stats",
+        params={"start_date": "2026-02-01", "end_date": "2026-02-28"},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["data"]["present_days"]
+
+
+def rollups(db):
+    return asyncio.run(
+        db.attendance_monthly.find(ROLLUPS, {"_id": 0}).to_list(length=None)
+    )
+
+
+def startup(db, archived=()):
+    """What the lifespan does for rollups in the daily layout."""
+    if settings.ATTENDANCE_ROLLUPS_ENABLED:
+        return asyncio.run(attendance_monthly_repository.ensure_seeded(db, archived))
+    asyncio.run(attendance_monthly_repository.clear_seeded(db))
+
+
+@pytest.fixture
+def rollups_enabled(monkeypatch):
+    def set_enabled(enabled: bool):
+        monkeypatch.setattr(settings, "ATTENDANCE_ROLLUPS_ENABLED", enabled)
+
+    return set_enabled
+
+
+def test_disabled_rollups_are_not_written(client, db, employee, rollups_enabled):
+    rollups_enabled(False)
+    employee("EMP701")
+
+    mark(client, "EMP701", "2026-02-03")
+
+    assert rollups(db) == []
+    assert february_present_days(client, "EMP701") == 1
+
+
+def test_enabling_rebuilds_months_written_while_disabled(
+    client, db, employee, rollups_enabled
+):
+    rollups_enabled(True)
+    startup(db)
+    employee("EMP702")
+    mark(client, "EMP702", "2026-02-02")
+
+    # Switched off for a while: the February row written meanwhile has no rollup
+    rollups_enabled(False)
+    startup(db)
+    mark(client, "EMP702", "2026-02-03")
+
+    rollups_enabled(True)
+    startup(db)
+
+    assert february_present_days(client, "EMP702") == 2
+    (doc,) = rollups(db)
+    assert doc["counts"] == {"present": 2}
+
+
+def test_seeded_rollups_are_not_rebuilt_again(client, db, employee, rollups_enabled):
+    rollups_enabled(True)
+    assert startup(db) == 0
+    employee("EMP703")
+    mark(client, "EMP703", "2026-02-02")
+
+    assert startup(db) == 0
+    assert rollups(db)[0]["counts"] == {"present": 1}
+
+
+def test_archived_months_are_restored_once(db, rollups_enabled):
+    rollups_enabled(True)
+    oid = ObjectId()
+    archived = [(oid, datetime(2024, 3, 1), {"present": 3, "absent": 1})]
+
+    asyncio.run(attendance_monthly_repository.rebuild(db, archived))
+    asyncio.run(attendance_monthly_repository.rebuild(db, archived))
+
+    assert rollups(db) == [
+        {
+            "employee_id": oid,
+            "month": datetime(2024, 3, 1),
+            "counts": {"present": 3, "absent": 1},
+        }
+    ]
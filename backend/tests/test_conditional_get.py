@@ -0,0 +1,70 @@
+"""Conditional GETs: ETags from in-process write versions, shared through write_versions."""
+
+import asyncio
+
+from app.core.cache import WriteVersions
+
+
+def test_list_revalidation_does_not_read_mongodb(client, db, employee):
+    employee("EMP801")
+    etag = client.get("/api/v1/employees").headers["ETag"]
+
+    # Unrecorded writes are invisible, so a 304 here means nothing was queried
+    asyncio.run(db.employees.drop())
+
+    assert (
+        client.get("/api/v1/employees", headers={"If-None-Match": etag}).status_code
+        == 304
+    )
+    assert (
+        client.get(
+            "/api/v1/employees", headers={"If-None-Match": f"W/{etag}"}
+        ).status_code
+        == 304
+    )
+
+
+def test_a_recorded_write_changes_the_list_etag(client, employee):
+    employee("EMP802")
+    etag = client.get("/api/v1/employees").headers["ETag"]
+
+    employee("EMP803")
+
+    response = client.get("/api/v1/employees", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_detail_revalidation_does_not_read_mongodb(client, db, employee):
+    employee("EMP804")
+    etag = client.get("/api/v1/employees/EMP804").headers["ETag"]
+
+    asyncio.run(db.employees.drop())
+
+    assert (
+        client.get(
+            "/api/v1/employees/EMP804", headers={"If-None-Match": etag}
+        ).status_code
+        == 304
+    )
+    assert client.get("/api/v1/employees/EMP804").status_code == 404
+
+
+def test_workers_agree_on_tags_after_syncing(db):
+    one, two = WriteVersions(), WriteVersions()
+
+    one.record("employees")
+    one.record("employees")
+
+    assert one.tag(["employees"]) == "employees=2"
+    assert two.tag(["employees"]) == "employees=0"
+
+    asyncio.run(one.sync(db))
+    asyncio.run(two.sync(db))
+    two.record("attendance")
+    asyncio.run(two.sync(db))
+
+    assert one.tag(["employees", "attendance"]) == "employees=2:attendance=0"
+    assert two.tag(["employees", "attendance"]) == "employees=2:attendance=1"
+    asyncio.run(one.sync(db))
+    assert one.tag(["employees", "attendance"]) == two.tag(["employees", "attendance"])
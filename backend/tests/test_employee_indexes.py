@@ -0,0 +1,31 @@
+"""create_employee_indexes: one conflicting index does not skip the others."""
+
+import asyncio
+
+from mongomock_motor import AsyncMongoMockClient
+from pymongo.errors import OperationFailure
+
+from app.config.database import EMPLOYEE_INDEXES, create_employee_indexes
+
+
+def test_a_conflicting_index_skips_only_itself(monkeypatch):
+    database = AsyncMongoMockClient()["hrms_indexes"]
+    collection = database.employees
+    create_index = type(collection).create_index
+
+    async def conflicting(self, keys, **options):
+        if options.get("name") == "active_email_unique_index":
+            raise OperationFailure(
+                "Index already exists with a different name: email_unique_index", 85
+            )
+        return await create_index(self, keys, **options)
+
+    monkeypatch.setattr(type(collection), "create_index", conflicting)
+
+    skipped = asyncio.run(create_employee_indexes(database))
+
+    names = set(asyncio.run(collection.index_information()))
+    assert skipped == ["active_email_unique_index"]
+    assert names == {"_id_"} | {
+        options["name"] for _, options in EMPLOYEE_INDEXES
+    } - set(skipped)
@@ -0,0 +1,129 @@
+"""Employee search: search_keys lookup, ranking and truncation reporting."""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from app.config.settings import settings
+from app.services.employee import employee_repository
+from app.services.employee_search import query_keys, query_terms, rank, search_keys
+
+
+def search(client, query, **params):
+    return client.get("/api/v1/employees", params={"search": query, **params})
+
+
+def names(response):
+    return [item["full_name"] for item in response.json()["data"]]
+
+
+def test_query_keys_are_a_subset_of_a_matching_documents_keys():
+    doc = {
+        "employee_id": "EMP7",
+        "full_name": "Zoë Müller",
+        "email": "zoe.mueller@company.com",
+    }
+
+    keys = set(search_keys(doc))
+
+    for query in ("mül", "zoe", "zoe mu", "EMP7", "mueller"):
+        assert set(query_keys(query_terms(query))) <= keys, query
+
+
+def test_rank_prefers_exact_tokens_and_heavier_fields():
+    terms = query_terms("smith")
+    exact_name = {"full_name": "Anna Smith"}
+    prefix_name = {"full_name": "Bo Smithson"}
+    infix_name = {"full_name": "Goldsmith"}
+    exact_position = {"full_name": "Cy Lee", "position": "Smith"}
+
+    scores = [
+        rank(doc, terms)
+        for doc in (exact_name, prefix_name, infix_name, exact_position)
+    ]
+
+    assert scores[0] > scores[1] > scores[2] > 0
+    assert scores[0] > scores[3] > 0
+
+
+def test_rank_rejects_grams_spread_over_different_tokens():
+    # "abcd" has the grams abc and bcd, both present, but no token contains it
+    assert rank({"full_name": "Abc Bcd"}, query_terms("abcd")) == 0
+
+
+def test_search_returns_best_matches_first(client, employee):
+    employee("EMP201", "Amaria Test")
+    employee("EMP202", "Mario Rossi")
+    employee("EMP203", "Maria Lopez")
+    employee("EMP204", "Bob Jones")
+
+    response = search(client, "mari")
+
+    assert response.status_code == 200
+    # Prefix matches (ties by name) before the infix match; non-matches left out
+    assert names(response) == ["Maria Lopez", "Mario Rossi", "Amaria Test"]
+    assert response.json()["total"] == 3
+
+
+def test_search_is_accent_and_case_insensitive(client, employee):
+    employee("EMP211", "José Álvarez")
+
+    assert names(search(client, "ALVAREZ")) == ["José Álvarez"]
+
+
+def test_search_sees_updated_names_only(client, employee):
+    created = employee("EMP221", "Old Name")
+
+    response = client.patch(
+        f"/api/v1/employees/{created['employeeId']}", json={"fullName": "Fresh Label"}
+    )
+
+    assert response.status_code == 200
+    assert names(search(client, "fresh")) == ["Fresh Label"]
+    assert names(search(client, "old name")) == []
+
+
+@pytest.mark.parametrize("query", [".*", "(a+)+$", "ab"])
+def test_short_or_symbol_only_queries_are_rejected(client, query):
+    response = search(client, query)
+
+    assert response.status_code == 400
+    assert str(settings.EMPLOYEE_SEARCH_MIN_LENGTH) in response.text
+
+
+def test_truncated_candidates_report_an_unknown_total(client, employee, monkeypatch):
+    for i, name in enumerate(("Kim One", "Kim Two", "Kim Three")):
+        employee(f"EMP23{i}", name)
+    monkeypatch.setattr(settings, "EMPLOYEE_SEARCH_MAX_CANDIDATES", 2)
+
+    body = search(client, "kim", limit=1).json()
+
+    assert body["total"] is None
+    assert body["total_pages"] is None
+    assert body["has_more"] is True
+    assert len(body["data"]) == 1
+
+
+def test_startup_backfill_makes_keyless_employees_searchable(client, db):
+    now = datetime.now(timezone.utc)
+    asyncio.run(
+        db.employees.insert_one(
+            {
+                "employee_id": "EMP240",
+                "full_name": "Seeded Person",
+                "email": "seeded@company.com",
+                "department": "Sales",
+                "position": "Clerk",
+                "is_active": True,
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+    )
+    assert names(search(client, "seeded")) == []
+
+    assert asyncio.run(employee_repository.backfill_search_keys(db)) == 1
+    assert asyncio.run(employee_repository.backfill_search_keys(db)) == 0
+
+    assert names(search(client, "seeded")) == ["Seeded Person"]
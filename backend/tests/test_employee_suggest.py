@@ -0,0 +1,90 @@
+"""Typeahead suggest: the in-memory prefix index and GET /employees/suggest."""
+
+import asyncio
+
+from app.services.employee_suggest import EmployeeSuggestIndex, suggest_keys
+
+
+def suggest(client, q, **params):
+    response = client.get("/api/v1/employees/suggest", params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return [item["full_name"] for item in response.json()["data"]]
+
+
+def test_keys_cover_name_words_email_local_part_and_code():
+    doc = {
+        "employee_id": "EMP-007",
+        "full_name": "Ana María Ruiz",
+        "email": "ana.ruiz@company.com",
+    }
+
+    keys = suggest_keys(doc)
+
+    assert {"ana", "maria", "ruiz", "anaruiz", "emp", "007", "emp007"} <= keys
+    assert "company" not in keys
+
+
+def test_exact_key_ranks_before_prefix_then_by_name():
+    index = EmployeeSuggestIndex()
+    index.build(
+        [
+            {"_id": "1", "full_name": "Leona Price"},
+            {"_id": "2", "full_name": "Leo Zane"},
+            {"_id": "3", "full_name": "Abel Leopold"},
+        ]
+    )
+
+    assert [s["full_name"] for s in index.suggest("leo")] == [
+        "Leo Zane",
+        "Abel Leopold",
+        "Leona Price",
+    ]
+    assert [s["full_name"] for s in index.suggest("leo", limit=1)] == ["Leo Zane"]
+
+
+def test_every_query_word_must_match():
+    index = EmployeeSuggestIndex()
+    index.build(
+        [{"_id": "1", "full_name": "Sam Reed"}, {"_id": "2", "full_name": "Sam Cole"}]
+    )
+
+    assert [s["full_name"] for s in index.suggest("sam co")] == ["Sam Cole"]
+    assert index.suggest("  ") == []
+
+
+def test_add_replaces_and_remove_drops_keys():
+    index = EmployeeSuggestIndex()
+    index.build([{"_id": "1", "full_name": "Old Name"}])
+
+    index.add({"_id": "1", "full_name": "New Name"})
+    assert index.suggest("old") == []
+    assert [s["full_name"] for s in index.suggest("new")] == ["New Name"]
+
+    index.remove("1")
+    assert index.suggest("new") == [] and len(index) == 0
+
+
+def test_endpoint_serves_from_memory_once_built(client, db, employee):
+    employee("EMP301", "Priya Nair")
+    assert suggest(client, "pri") == ["Priya Nair"]
+
+    # Later lookups never read the employees collection
+    asyncio.run(db.employees.drop())
+
+    assert suggest(client, "nai") == ["Priya Nair"]
+    assert suggest(client, "emp30") == ["Priya Nair"]
+
+
+def test_employee_writes_keep_the_index_current(client, employee):
+    suggest(client, "x")  # build the (empty) index first
+    created = employee("EMP311", "Tomas Berg", email="tberg@company.com")
+    assert suggest(client, "tber") == ["Tomas Berg"]
+
+    client.patch(
+        f"/api/v1/employees/{created['employeeId']}", json={"fullName": "Tomasz Lind"}
+    )
+    assert suggest(client, "lind") == ["Tomasz Lind"]
+    assert suggest(client, "berg") == []
+
+    client.delete(f"/api/v1/employees/{created['employeeId']}")
+    assert suggest(client, "tomasz") == []
@@ -0,0 +1,170 @@
+"""PATCH /employees/{id}: partial updates with If-Match / version preconditions."""
+
+import asyncio
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from app.api.v1.endpoints.employees import _duplicate_detail
+from app.services.department import department_repository
+from app.services.employee_directory import employee_directory
+
+
+def patch(client, employee_id, body, if_match=None):
+    headers = {"If-Match": if_match} if if_match is not None else {}
+    return client.patch(f"/api/v1/employees/{employee_id}", json=body, headers=headers)
+
+
+@pytest.fixture
+def emp(employee):
+    return employee("EMP501", "Etag User")["employeeId"]
+
+
+def test_detail_etag_round_trips_as_if_match(client, emp):
+    etag = client.get(f"/api/v1/employees/{emp}").headers["ETag"]
+
+    response = patch(client, emp, {"position": "Lead"}, if_match=etag)
+
+    assert etag == '"1"'
+    assert response.status_code == 200
+    assert response.json()["data"]["version"] == 2
+    assert response.headers["ETag"] == '"2"'
+    assert client.get(f"/api/v1/employees/{emp}").headers["ETag"] == '"2"'
+
+
+def test_stale_if_match_is_412_and_changes_nothing(client, emp):
+    assert patch(client, emp, {"position": "Lead"}, if_match='"1"').status_code == 200
+
+    response = patch(client, emp, {"position": "Intern"}, if_match='"1"')
+
+    assert response.status_code == 412
+    assert client.get(f"/api/v1/employees/{emp}").json()["data"]["position"] == "Lead"
+
+
+def test_body_version_is_a_precondition_too(client, emp):
+    assert patch(client, emp, {"position": "Lead", "version": 2}).status_code == 412
+    assert patch(client, emp, {"position": "Lead", "version": 1}).status_code == 200
+
+
+@pytest.mark.parametrize("if_match", [None, "*", 'W/"1"'])
+def test_missing_wildcard_or_weak_if_match_updates(client, emp, if_match):
+    assert (
+        patch(client, emp, {"position": "Lead"}, if_match=if_match).status_code == 200
+    )
+
+
+def test_malformed_if_match_is_400(client, emp):
+    response = patch(client, emp, {"position": "Lead"}, if_match='"abc123"')
+
+    assert response.status_code == 400
+    assert "version" in response.json()["detail"]
+
+
+def test_if_none_match_revalidates_until_a_patch(client, emp):
+    etag = client.get(f"/api/v1/employees/{emp}").headers["ETag"]
+    assert (
+        client.get(
+            f"/api/v1/employees/{emp}", headers={"If-None-Match": etag}
+        ).status_code
+        == 304
+    )
+
+    patch(client, emp, {"fullName": "Renamed User"})
+
+    response = client.get(f"/api/v1/employees/{emp}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["data"]["fullName"] == "Renamed User"
+
+
+@pytest.mark.parametrize(
+    "body,code",
+    [
+        ({}, 400),
+        ({"fullName": None}, 422),
+        ({"employeeId": "EMP9"}, 422),
+        ({"fullName": "A"}, 422),
+    ],
+)
+def test_invalid_bodies_are_rejected(client, emp, body, code):
+    assert patch(client, emp, body).status_code == code
+
+
+def test_unknown_or_deleted_employee_is_404(client, emp):
+    assert patch(client, "EMP599", {"position": "Lead"}).status_code == 404
+    client.delete(f"/api/v1/employees/{emp}")
+    assert patch(client, emp, {"position": "Lead"}).status_code == 404
+
+
+def test_email_taken_by_another_employee_is_400(client, emp, employee):
+    employee("EMP502", "Other User", email="taken@company.com")
+
+    response = patch(client, emp, {"email": "taken@company.com"})
+
+    assert response.status_code == 400
+    assert "already exists" in response.json()["detail"]
+
+
+# mongomock_motor blames an update's conflict on the first unique index, so the field named
+# in the detail is checked against the keyPattern/keyValue a server would send
+@pytest.mark.parametrize(
+    "field,value,detail",
+    [
+        ("employee_id", "EMP501", "Employee with ID EMP501 already exists"),
+        (
+            "email",
+            "taken@company.com",
+            "Employee with email taken@company.com already exists",
+        ),
+    ],
+)
+def test_duplicate_detail_names_the_conflicting_field(field, value, detail):
+    error = DuplicateKeyError(
+        "E11000 duplicate key error",
+        11000,
+        {"keyPattern": {field: 1}, "keyValue": {field: value}},
+    )
+
+    assert _duplicate_detail(error, {"email": "sent@company.com"}) == detail
+
+
+def test_patch_is_one_write_that_rebuilds_search_keys(client, db, emp, monkeypatch):
+    employees = type(db.employees)
+    calls = []
+    for method in ("find", "find_one", "find_one_and_update"):
+        original = getattr(employees, method)
+
+        def recording(self, *args, _method=method, _original=original, **kwargs):
+            calls.append(_method)
+            return _original(self, *args, **kwargs)
+
+        monkeypatch.setattr(employees, method, recording)
+
+    response = patch(client, emp, {"fullName": "Renamed Person"})
+
+    assert response.status_code == 200
+    assert calls == ["find_one_and_update"]
+    monkeypatch.undo()
+    found = client.get("/api/v1/employees", params={"search": "renamed"}).json()["data"]
+    assert [e["employee_id"] for e in found] == [emp]
+    # The old name's keys are gone; those of the fields not sent (the email) are kept
+    assert (
+        client.get("/api/v1/employees", params={"search": "etag"}).json()["data"] == []
+    )
+    found = client.get("/api/v1/employees", params={"search": "company"}).json()["data"]
+    assert [e["employee_id"] for e in found] == [emp]
+
+
+def test_department_move_adjusts_headcounts_and_drops_the_directory_entry(
+    client, db, emp
+):
+    assert employee_directory.get(emp) is not None
+
+    response = patch(client, emp, {"department": "Sales", "fullName": "Moved User"})
+
+    assert response.status_code == 200
+    counts = {
+        d["name"]: d["active_count"]
+        for d in asyncio.run(department_repository.get_all(db, True))
+    }
+    assert counts == {"Engineering": 0, "Sales": 1}
+    assert employee_directory.get(emp) is None
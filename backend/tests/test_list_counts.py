@@ -0,0 +1,87 @@
+"""count=exact|estimated|cached|none on the employee and attendance list endpoints."""
+
+import asyncio
+
+import pytest
+
+from app.services.employee import employee_repository
+
+
+def page(client, path="/api/v1/employees", **params):
+    response = client.get(path, params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.fixture
+def three_employees(employee):
+    for i in range(3):
+        employee(f"EMP40{i}", f"Count User {i}", department="Sales")
+
+
+@pytest.mark.parametrize("count", ["exact", "estimated", "cached"])
+def test_counting_modes_agree_on_total_and_has_more(client, three_employees, count):
+    first = page(client, count=count, limit=2)
+    last = page(client, count=count, limit=2, skip=2)
+
+    assert (first["total"], first["total_pages"], first["has_more"]) == (3, 2, True)
+    assert (last["total"], last["has_more"], len(last["data"])) == (3, False, 1)
+
+
+def test_none_reports_has_more_without_a_total(client, three_employees):
+    first = page(client, count="none", limit=2)
+    last = page(client, count="none", limit=2, skip=2)
+
+    assert first["total"] is None and first["total_pages"] is None
+    assert (first["has_more"], len(first["data"])) == (True, 2)
+    assert (last["has_more"], len(last["data"])) == (False, 1)
+
+
+def test_cached_total_is_reused_until_a_write(client, db, three_employees, employee):
+    assert page(client, count="cached")["total"] == 3
+    # A write outside the repositories is not seen while the cached total is valid
+    asyncio.run(db.employees.insert_one({"employee_id": "EMP499", "is_active": True}))
+    assert page(client, count="cached")["total"] == 3
+
+    employee("EMP410", "Count User 4")
+
+    assert page(client, count="cached")["total"] == 5
+
+
+def test_estimated_reads_department_headcounts(client, db, three_employees):
+    asyncio.run(
+        db.departments.update_one({"_id": "Sales"}, {"$set": {"active_count": 7}})
+    )
+
+    assert page(client, count="estimated")["total"] == 7
+    assert page(client, count="estimated", department="Sales")["total"] == 7
+    assert page(client, count="exact", department="Sales")["total"] == 3
+
+
+def test_estimated_recounts_a_lost_headcount(client, db, three_employees):
+    asyncio.run(
+        db.departments.update_one({"_id": "Sales"}, {"$set": {"active_count": 0}})
+    )
+    filter_query = employee_repository.build_list_filter(department="Sales")
+
+    assert asyncio.run(employee_repository.estimated_count(db, filter_query)) == 3
+    assert page(client, "/api/v1/employees/department/Sales")["total"] == 3
+
+
+def test_attendance_list_counts(client, employee):
+    employee("EMP420")
+    for day in ("2026-03-02", "2026-03-03", "2026-03-04"):
+        response = client.post(
+            "/api/v1/attendance",
+            json={"employee_id": "EMP420", "date": day, "status": "present"},
+        )
+        assert response.status_code == 201
+
+    exact = page(client, "/api/v1/attendance", count="exact", limit=2)
+    none = page(client, "/api/v1/attendance", count="none", limit=2)
+
+    assert (exact["total"], exact["has_more"]) == (3, True)
+    assert (none["total"], none["has_more"]) == (None, True)
+    assert [item["date"] for item in exact["data"]] == [
+        item["date"] for item in none["data"]
+    ]
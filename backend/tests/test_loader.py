@@ -0,0 +1,164 @@
+"""DataLoader batching/cancellation and the per-request EmployeeLoader built on it."""
+
+import asyncio
+
+import pytest
+from bson import ObjectId
+
+from app.core.loader import DataLoader
+from app.services.employee import employee_repository
+from app.services.employee_directory import employee_directory
+from app.services.employee_loader import EmployeeLoader
+
+
+class RecordingBatch:
+    """batch_fn returning key * 10 for known keys, recording each call's keys."""
+
+    def __init__(self, missing=(), delay=0.0, fail_times=0):
+        self.calls = []
+        self.missing = set(missing)
+        self.delay = delay
+        self.fail_times = fail_times
+
+    async def __call__(self, keys):
+        self.calls.append(list(keys))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("lookup failed")
+        return {key: key * 10 for key in keys if key not in self.missing}
+
+
+def test_loads_in_one_tick_share_one_batch():
+    batch = RecordingBatch(missing={3})
+
+    async def main():
+        loader = DataLoader(batch)
+        return await asyncio.gather(
+            loader.load(1), loader.load(2), loader.load(1), loader.load(3)
+        )
+
+    assert asyncio.run(main()) == [10, 20, 10, None]
+    assert batch.calls == [[1, 2, 3]]
+
+
+def test_results_are_memoised_and_later_ticks_batch_again():
+    batch = RecordingBatch()
+
+    async def main():
+        loader = DataLoader(batch)
+        await loader.load(1)
+        again = await loader.load(1)
+        more = await loader.load_many([1, 2, 2, 3])
+        return again, more
+
+    again, more = asyncio.run(main())
+
+    assert again == 10
+    assert more == {1: 10, 2: 20, 3: 30}
+    assert batch.calls == [[1], [2, 3]]
+
+
+def test_load_many_leaves_out_missing_keys():
+    async def main():
+        return await DataLoader(RecordingBatch(missing={2})).load_many([1, 2])
+
+    assert asyncio.run(main()) == {1: 10}
+
+
+def test_cancelling_one_caller_does_not_cancel_the_others():
+    batch = RecordingBatch(delay=0.01)
+
+    async def main():
+        loader = DataLoader(batch)
+        cancelled = asyncio.create_task(loader.load(1))
+        waiting = asyncio.create_task(loader.load(1))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        value = await waiting
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        return value, await loader.load(1)
+
+    assert asyncio.run(main()) == (10, 10)
+    assert batch.calls == [[1]]
+
+
+def test_a_batch_outlives_all_its_cancelled_callers():
+    batch = RecordingBatch(delay=0.01)
+
+    async def main():
+        loader = DataLoader(batch)
+        task = asyncio.create_task(loader.load(1))
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.sleep(0.02)
+        return await loader.load(1)
+
+    assert asyncio.run(main()) == 10
+    assert batch.calls == [[1]]
+
+
+def test_failures_reach_every_caller_and_are_not_memoised():
+    batch = RecordingBatch(fail_times=1)
+
+    async def main():
+        loader = DataLoader(batch)
+        results = await asyncio.gather(
+            loader.load(1), loader.load(2), return_exceptions=True
+        )
+        return results, await loader.load(1)
+
+    results, retried = asyncio.run(main())
+
+    assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+    assert retried == 10
+    assert batch.calls == [[1, 2], [1]]
+
+
+def test_employee_loader_batches_concurrent_lookups(db, employee, monkeypatch):
+    employee("EMP601", "Loader One")
+    employee("EMP602", "Loader Two")
+    calls = []
+    get_by_employee_ids = employee_repository.get_by_employee_ids
+
+    async def recording(db, codes):
+        calls.append(sorted(codes))
+        return await get_by_employee_ids(db, codes)
+
+    monkeypatch.setattr(employee_repository, "get_by_employee_ids", recording)
+
+    async def main():
+        loader = EmployeeLoader(db)
+        return await asyncio.gather(
+            loader.employee("EMP601"),
+            loader.employee("emp601"),
+            loader.employee("EMP602"),
+            loader.employee("EMP699"),
+        )
+
+    one, same, two, missing = asyncio.run(main())
+
+    assert calls == [["EMP601", "EMP602", "EMP699"]]
+    assert (one.full_name, same.full_name, two.full_name, missing) == (
+        "Loader One",
+        "Loader One",
+        "Loader Two",
+        None,
+    )
+
+
+def test_active_oid_ignores_a_stale_directory_entry(db, employee):
+    created = employee("EMP611")
+    stale = ObjectId()
+    employee_directory.put({"_id": stale, "employee_id": "EMP611"})
+
+    async def main():
+        loader = EmployeeLoader(db)
+        return await loader.oid("EMP611"), await loader.active_oid("EMP611")
+
+    cached, active = asyncio.run(main())
+
+    assert cached == stale
+    assert active == ObjectId(created["_id"])
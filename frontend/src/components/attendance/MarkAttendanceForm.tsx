@@ -8,7 +8,7 @@ import Select from '@/components/ui/Select';
 import SearchableSelect from '@/components/ui/SearchableSelect';
 import { useDebouncedValue } from '@/hooks/useDebouncedValue';
 import { useMarkAttendance } from '@/hooks/queries/useAttendance';
-import { useEmployees } from '@/hooks/queries/useEmployees';
+import { useEmployeeSuggestions, useEmployees } from '@/hooks/queries/useEmployees';
 import { getApiErrorMessage } from '@/utils/apiErrorHandler';
 import { getTodayDate } from '@/utils/attendanceUtils';
 
@@ -42,11 +42,11 @@ export default function MarkAttendanceForm({ onSuccess }: MarkAttendanceFormProp
   const [employeeSearchQuery, setEmployeeSearchQuery] = useState('');
   const debouncedEmployeeSearch = useDebouncedValue(employeeSearchQuery, EMPLOYEE_SEARCH_DEBOUNCE_MS);
 
-  const { data: employeesData } = useEmployees({
-    search: debouncedEmployeeSearch.trim() || undefined,
-    limit: 50,
-  });
-  const employees = employeesData?.data ?? [];
+  // Typed queries use the suggest endpoint; an empty picker shows the first page
+  const employeeQuery = debouncedEmployeeSearch.trim();
+  const { data: employeesData } = useEmployees({ limit: 50 });
+  const { data: suggestions } = useEmployeeSuggestions(employeeQuery, 20);
+  const employees = employeeQuery ? suggestions ?? [] : employeesData?.data ?? [];
   const employeeOptions = employees.map((emp) => ({
     value: emp.employee_id ?? emp.id ?? '',
     label: emp.full_name ? `${emp.full_name} (${emp.employee_id ?? emp.id ?? 'N/A'})` : emp.email,
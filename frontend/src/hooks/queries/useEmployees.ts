@@ -86,6 +86,9 @@ export const useDeleteEmployee = () => {
   });
 };
 
+// Backend rejects shorter queries (EMPLOYEE_SEARCH_MIN_LENGTH)
+const MIN_SEARCH_LENGTH = 3;
+
 /**
  * Hook to search employees
  */
@@ -93,7 +96,19 @@ export const useSearchEmployees = (searchTerm: string, enabled: boolean = true)
   return useQuery({
     queryKey: [...employeeKeys.lists(), 'search', searchTerm],
     queryFn: () => employeeService.searchEmployees(searchTerm),
-    enabled: enabled && searchTerm.length > 0,
+    enabled: enabled && searchTerm.trim().length >= MIN_SEARCH_LENGTH,
     staleTime: 1000 * 30, // Search results stale after 30 seconds
   });
 };
+
+/**
+ * Hook for employee typeahead suggestions (any non-empty query)
+ */
+export const useEmployeeSuggestions = (query: string, limit: number = 10) => {
+  return useQuery({
+    queryKey: [...employeeKeys.lists(), 'suggest', query, limit],
+    queryFn: () => employeeService.suggestEmployees(query, limit),
+    enabled: query.trim().length > 0,
+    staleTime: 1000 * 30,
+  });
+};
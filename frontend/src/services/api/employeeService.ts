@@ -2,6 +2,7 @@ import apiClient from '@/services/axios';
 import {
   Employee,
   CreateEmployeePayload,
+  UpdateEmployeePayload,
   EmployeeFilterParams,
   APIResponse,
   EmployeeListResponse,
@@ -34,6 +35,23 @@ class EmployeeService {
     return response.data.data;
   }
 
+  /**
+   * Update some fields of an employee. Pass the version last read to fail with 412
+   * instead of overwriting someone else's change.
+   */
+  async updateEmployee(
+    employeeId: string,
+    data: UpdateEmployeePayload,
+    version?: number
+  ): Promise<Employee> {
+    const response = await apiClient.patch<APIResponse<Employee>>(
+      `${this.endpoint}/${employeeId}`,
+      data,
+      version === undefined ? undefined : { headers: { 'If-Match': `"${version}"` } }
+    );
+    return response.data.data;
+  }
+
   /**
    * Delete employee
    */
@@ -69,6 +87,17 @@ class EmployeeService {
     );
     return response.data;
   }
+
+  /**
+   * Typeahead suggestions (prefix of name, email or employee ID) from the in-memory index
+   */
+  async suggestEmployees(query: string, limit: number = 10): Promise<Employee[]> {
+    const response = await apiClient.get<APIResponse<Employee[]>>(
+      `${this.endpoint}/suggest`,
+      { params: { q: query, limit } }
+    );
+    return response.data.data;
+  }
 }
 
 // Export singleton instance
@@ -7,6 +7,7 @@ export interface Employee {
   id?: string;
   _id?: string;
   status?: string;
+  version?: number;
   created_at?: string;
   updated_at?: string;
 }
@@ -20,6 +21,15 @@ export interface CreateEmployeePayload {
   position?: string;
 }
 
+/** Partial update (PATCH); only the fields present are changed. */
+export interface UpdateEmployeePayload {
+  fullName?: string;
+  email?: string;
+  department?: string;
+  position?: string | null;
+  status?: string;
+}
+
 export interface EmployeeFilterParams {
   skip?: number;
   limit?: number;
@@ -51,9 +61,11 @@ export interface APIResponse<T> {
 }
 
 export interface EmployeeListResponse {
-  total: number;
+  // null when not counted (count=none, cursor pages) or a search matched too broadly to rank fully
+  total: number | null;
   page: number;
   page_size: number;
-  total_pages: number;
+  total_pages: number | null;
+  has_more?: boolean;
   data: Employee[];
 }